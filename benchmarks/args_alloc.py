@@ -0,0 +1,73 @@
+"""Allocation benchmark for the low level event args.
+
+Builds event args for a stream of keyboard and mouse hook events and reads the fields a typical
+dispatch touches, reporting the memory blocks and bytes kept alive per event and the time per event.
+
+    python -m benchmarks.args_alloc [--events N]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
+
+
+def event_stream(count):
+    """A stream of raw hook events: typing on the home row mixed with mouse moves and clicks."""
+    keys = (0x41, 0x53, 0x44, 0x46, 0x4A, 0x4B, 0x4C, 0x20)
+    stream = []
+    for i in range(count // 4):
+        key = keys[i % len(keys)]
+        stream.append((LowLevelKeyboardArgs, 0, 0x100, (key, 0x1E, 0, i)))
+        stream.append((LowLevelKeyboardArgs, 0, 0x101, (key, 0x1E, 0x80, i)))
+        stream.append((LowLevelMouseArgs, 0, 0x200, (i % 1920, i % 1080, 0, 0, i)))
+        stream.append((LowLevelMouseArgs, 0, 0x201 + (i % 2), (i % 1920, i % 1080, 0, 0, i)))
+    return stream
+
+
+def touch(args):
+    return args.vkey, args.event, args.flags, args.time
+
+
+def measure(stream):
+    gc.collect()
+    gc.disable()
+    try:
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        kept = [cls(ncode, wparam, lparam) for cls, ncode, wparam, lparam in stream]
+        for args in kept:
+            touch(args)
+        blocks = sys.getallocatedblocks() - blocks
+        size = tracemalloc.get_traced_memory()[0] - start_bytes
+        tracemalloc.stop()
+        del kept
+
+        start = time.perf_counter()
+        for cls, ncode, wparam, lparam in stream:
+            touch(cls(ncode, wparam, lparam))
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    count = len(stream)
+    return {
+        'events': count,
+        'blocks_per_event': blocks / count,
+        'bytes_per_event': size / count,
+        'us_per_event': elapsed / count * 1e6,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=100000)
+    options = parser.parse_args(argv)
+    for name, value in measure(event_stream(options.events)).items():
+        print('{0:>18}: {1:.2f}'.format(name, value))
+
+
+if __name__ == '__main__':
+    main()
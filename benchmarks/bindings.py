@@ -0,0 +1,99 @@
+"""Startup benchmark: building thousands of bindings from a bindings file, with and without its cache.
+
+Each measurement runs in a fresh interpreter and times only the building of the hotkeys:
+``constructors`` makes them with ``Hotkey(...)`` calls one by one, ``cold`` loads the bindings file
+without a cache (parsing, validating and writing the cache) and ``warm`` loads it from the cache.
+
+    python -m benchmarks.bindings [--bindings 5000] [--runs 5]
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+MODIFIERS = ('', 'Ctrl+', 'Shift+', 'Alt+', 'Ctrl+Shift+', 'Ctrl+Alt+', 'Shift+Alt+', 'Win+')
+KEYS = tuple('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789') + tuple('F{}'.format(i) for i in range(1, 25))
+HANDLERS = ('benchmarks.bindings:on_key', 'benchmarks.bindings:on_args', 'benchmarks.bindings:Actions.on_key')
+
+
+def on_key():
+    pass
+
+
+def on_args(args):
+    pass
+
+
+class Actions(object):
+    @staticmethod
+    def on_key():
+        pass
+
+
+def bindings(count):
+    specs = itertools.cycle(modifier + key for modifier in MODIFIERS for key in KEYS)
+    handlers = itertools.cycle(HANDLERS)
+    return [{'keys': spec, 'handler': handler, 'events': ['Down', 'Up'] if i % 10 == 0 else ['Down']}
+            for i, spec, handler in zip(range(count), specs, handlers)]
+
+
+def build(mode, path):
+    """Build the bindings in this interpreter, returns the time it took in seconds."""
+    from hotikeys import Hotkey, NullSource
+    from hotikeys.bindings import load, parse_keys, parse_events, resolve_handler
+    hotkey_class = type('BenchHotkey', (Hotkey,), {'source': NullSource()})
+
+    if mode == 'constructors':
+        with open(path) as file:
+            data = json.load(file)['bindings']
+        start = time.perf_counter()
+        for binding in data:
+            key, modifiers = parse_keys(binding['keys'])
+            hotkey_class(resolve_handler(binding['handler']), key, modifiers, parse_events(binding['events']))
+        elapsed = time.perf_counter() - start
+    else:
+        start = time.perf_counter()
+        load(path, hotkey_class=hotkey_class)
+        elapsed = time.perf_counter() - start
+    assert len(hotkey_class._registry) == len(json.load(open(path))['bindings'])
+    return elapsed
+
+
+def measure(mode, path, runs):
+    times = []
+    for _ in range(runs):
+        if mode != 'warm' and os.path.exists(path + '.cache'):
+            os.remove(path + '.cache')
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.bindings', '--child', mode, path],
+                                stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--bindings', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.child:
+        print(build(*options.child))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bindings.json')
+        with open(path, 'w') as file:
+            json.dump({'bindings': bindings(options.bindings)}, file)
+        measure('cold', path, 1)  # write the cache for the warm runs
+        print('{} bindings, best of {} runs'.format(options.bindings, options.runs))
+        for mode in ('constructors', 'cold', 'warm'):
+            print('{:<14} {:>8.1f} ms'.format(mode, measure(mode, path, options.runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Compare two dispatch benchmark results and report regressions.
+
+Grid points are matched on their parameters. A metric regresses when it grew by more than
+``--threshold`` (relative) in the new results; the exit status is 1 when any metric regressed.
+
+    python -m benchmarks.compare old.json new.json [--threshold 0.1] [--metrics p50_ns p99_ns]
+"""
+import argparse
+import json
+import sys
+
+PARAMETERS = ('hotkeys', 'modifiers', 'keys', 'mice')
+METRICS = ('p50_ns', 'p99_ns', 'peak_alloc_bytes', 'retained_blocks')
+
+
+def load(path):
+    with open(path) as file:
+        data = json.load(file)
+    return data.get('meta', {}), {tuple(result[p] for p in PARAMETERS): result for result in data['results']}
+
+
+def compare(old, new, metrics=METRICS, threshold=0.1):
+    """Yield ``(point, metric, old value, new value, relative change, regressed)`` for the shared grid points."""
+    for point in sorted(set(old) & set(new), key=str):
+        for metric in metrics:
+            before, after = old[point].get(metric), new[point].get(metric)
+            if before is None or after is None:
+                continue
+            if before:
+                change = (after - before) / before
+            else:
+                change = float('inf') if after else 0.0
+            # Allow tiny absolute growth of near-zero metrics such as retained blocks.
+            regressed = change > threshold and after - before > 0.01
+            yield point, metric, before, after, change, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative growth counted as a regression')
+    parser.add_argument('--metrics', nargs='+', default=list(METRICS))
+    options = parser.parse_args(argv)
+
+    old_meta, old = load(options.old)
+    new_meta, new = load(options.new)
+    print('{} ({}) -> {} ({})'.format(options.old, old_meta.get('commit', '?'),
+                                      options.new, new_meta.get('commit', '?')))
+    missing = set(old) ^ set(new)
+    if missing:
+        print('{} grid points only in one of the results are skipped'.format(len(missing)))
+
+    regressions = 0
+    for point, metric, before, after, change, regressed in compare(old, new, options.metrics, options.threshold):
+        regressions += regressed
+        print('{:>6} hotkeys {} mods {:>8} {:>4} mice  {:<17} {:>12.1f} -> {:>12.1f}  {:>+7.1%}{}'.format(
+            *point, metric, before, after, change, '  REGRESSION' if regressed else ''))
+
+    print('{} regression(s) above {:.0%}'.format(regressions, options.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
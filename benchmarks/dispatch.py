@@ -0,0 +1,161 @@
+"""Dispatch benchmark: per-event latency and allocations of the hot path over a parameter grid.
+
+Raw events from a seeded ``SyntheticSource`` workload are fed through ``feed_keyboard`` and
+``feed_mouse`` of a fresh hotkey class per grid point, the same path the hooks take. Every grid
+point reports the p50/p99/mean latency per event in nanoseconds, the mean peak of bytes allocated
+while dispatching an event and the memory blocks still held per event afterwards.
+
+    python -m benchmarks.dispatch [--hotkeys 1 100 10000] [--modifiers 0 4] [--keys specific wildcard]
+                                  [--mice 0 100] [--events N] [--instrument] [--raw] [--output results.json]
+
+Results saved with ``--output`` can be compared with ``python -m benchmarks.compare``. Comparing a run
+with ``--instrument`` to one without shows the overhead of ``HotkeyCore.instrument()``, and one with
+``--raw`` the savings of raw handlers, ``Hotkey(raw=True)``.
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from hotikeys import EventId, Hotkey, Key, NullSource, SyntheticSource
+from hotikeys.enums import InputDevice
+
+MODIFIERS = (Key.LControl, Key.LShift, Key.LAlt, Key.LWin)
+BOUND_KEYS = tuple(range(0x30, 0x3A)) + tuple(range(0x41, 0x5B)) + tuple(range(0x70, 0x88))
+
+
+def build(hotkeys, modifiers, keys, mice, hotkey_class=Hotkey, raw=False, **options):
+    """Return a fresh hotkey class with the bindings of a grid point, key bindings with raw handlers if ``raw``."""
+    # The modifiers are pressed once per grid point, which takes longer than the default purge delay.
+    options.setdefault('purge_delay', float('inf'))
+    cls = type('BenchHotkey', (hotkey_class,), dict(source=NullSource(), **options))
+    for i in range(hotkeys):
+        key = BOUND_KEYS[i % len(BOUND_KEYS)] if keys == 'specific' else None
+        cls(_raw_handler if raw else _handler, key, MODIFIERS[:modifiers], raw=raw)
+    for _ in range(mice):
+        cls(_handler, events=EventId.WM_MOUSEMOVE)
+    return cls
+
+
+def workload(events, seed=0):
+    """Return ``events`` raw events as ``(feed name, ncode, wparam, lparam)`` tuples."""
+    source = SyntheticSource(seed=seed)
+    stream = []
+    for time_ms, (device, wparam, fields) in enumerate(itertools.islice(source.workload(), events)):
+        feed = 'feed_mouse' if device == int(InputDevice.Mouse) else 'feed_keyboard'
+        stream.append((feed, 0, wparam, fields + (time_ms,)))
+    return stream
+
+
+def measure(cls, stream, modifiers=0):
+    feeds = [(getattr(cls, feed), ncode, wparam, lparam) for feed, ncode, wparam, lparam in stream]
+    for modifier in MODIFIERS[:modifiers]:
+        cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), (int(modifier), 0, 0, 0))
+
+    # Warm up the dispatch caches before measuring.
+    for feed, ncode, wparam, lparam in feeds[:1000]:
+        feed(ncode, wparam, lparam)
+
+    latencies = []
+    clock = time.perf_counter_ns
+    gc.collect()
+    gc.disable()
+    try:
+        for feed, ncode, wparam, lparam in feeds:
+            start = clock()
+            feed(ncode, wparam, lparam)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+
+    peaks = 0
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    for feed, ncode, wparam, lparam in feeds:
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        feed(ncode, wparam, lparam)
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    blocks = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+
+    count = len(feeds)
+    return {
+        'events': count,
+        'p50_ns': latencies[count // 2],
+        'p99_ns': latencies[min(count - 1, count * 99 // 100)],
+        'mean_ns': sum(latencies) / count,
+        'peak_alloc_bytes': peaks / count,
+        'retained_blocks': blocks / count,
+    }
+
+
+def run(grid, events, seed=0, instrument=False, raw=False):
+    stream = workload(events, seed)
+    results = []
+    for hotkeys, modifiers, keys, mice in itertools.product(
+            grid['hotkeys'], grid['modifiers'], grid['keys'], grid['mice']):
+        cls = build(hotkeys, modifiers, keys, mice, raw=raw)
+        if instrument:
+            cls.instrument()
+        result = {'hotkeys': hotkeys, 'modifiers': modifiers, 'keys': keys, 'mice': mice}
+        result.update(measure(cls, stream, modifiers))
+        results.append(result)
+        print('{hotkeys:>6} hotkeys {modifiers} mods {keys:>8} {mice:>4} mice | '
+              'p50 {p50_ns:>8} ns  p99 {p99_ns:>9} ns  '
+              'alloc {peak_alloc_bytes:>7.1f} B  retained {retained_blocks:.2f}'.format(**result))
+    return results
+
+
+def metadata(**extra):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **extra
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--hotkeys', type=int, nargs='+', default=[1, 10, 100, 1000, 10000])
+    parser.add_argument('--modifiers', type=int, nargs='+', default=[0, 1, 2, 4])
+    parser.add_argument('--keys', nargs='+', choices=('specific', 'wildcard'), default=['specific', 'wildcard'])
+    parser.add_argument('--mice', type=int, nargs='+', default=[0, 100])
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--instrument', action='store_true', help='measure with the hotkey instrumentation enabled')
+    parser.add_argument('--raw', action='store_true', help='bind the keys with raw handlers')
+    parser.add_argument('--output', help='save the results as JSON to this path')
+    options = parser.parse_args(argv)
+
+    grid = {'hotkeys': options.hotkeys, 'modifiers': options.modifiers,
+            'keys': options.keys, 'mice': options.mice}
+    results = run(grid, options.events, options.seed, options.instrument, options.raw)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump({'meta': metadata(instrumented=options.instrument, raw=options.raw), 'grid': grid, 'results': results}, file, indent=2)
+
+
+def _handler():
+    pass
+
+
+def _raw_handler(vkey, event, flags, time):
+    pass
+
+
+if __name__ == '__main__':
+    main()
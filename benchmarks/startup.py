@@ -0,0 +1,61 @@
+"""Startup benchmark: the cost of importing hotikeys and of enum lookups by name and by value.
+
+Each import is measured in a fresh interpreter with ``-X importtime``, the best of ``--runs`` is
+reported along with the modules that contribute the most.
+
+    python -m benchmarks.startup [--runs N] [--lookups N]
+"""
+import argparse
+import subprocess
+import sys
+import timeit
+
+
+def import_times(module='hotikeys'):
+    """Return the cumulative import time in microseconds of ``module`` and each module it imports."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import {0}'.format(module)],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+    lines = [line.split('|') for line in output.splitlines()
+             if line.startswith('import time:') and 'cumulative' not in line]
+    # Imports are listed after the modules they import, nested ones indented below their parent.
+    end = next(i for i, (_, _, name) in enumerate(lines) if name.strip() == module)
+    start = end
+    while start > 0 and lines[start - 1][2].startswith('  '):
+        start -= 1
+    return {name.strip(): int(cumulative) for _, cumulative, name in lines[start:end + 1]}
+
+
+def lookup_times(count):
+    """Return the time in nanoseconds per lookup for the common enum lookups."""
+    from hotikeys.enums import EventId, Key
+    lookups = {
+        'EventId[wparam]': lambda: EventId[0x101],
+        'Key[vkey]': lambda: Key[0xA2],
+        'Key[alias vkey]': lambda: Key[0x19],
+        'Key[missing vkey]': lambda: Key[0xFFFE],
+        'Key[name]': lambda: Key['LControl'],
+    }
+    return {name: min(timeit.repeat(lookup, number=count, repeat=3)) / count * 1e9
+            for name, lookup in lookups.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--top', type=int, default=8)
+    options = parser.parse_args(argv)
+
+    runs = [import_times() for _ in range(options.runs)]
+    best = min(runs, key=lambda times: times['hotikeys'])
+    print('import hotikeys: {0:.1f} ms (best of {1})'.format(best['hotikeys'] / 1000, options.runs))
+    for name, value in sorted(best.items(), key=lambda item: -item[1])[1:options.top + 1]:
+        print('{0:>32}: {1:.1f} ms'.format(name, value / 1000))
+
+    for name, value in lookup_times(options.lookups).items():
+        print('{0:>32}: {1:.0f} ns'.format(name, value))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,12 @@
-from hotikeys.enums import Key, KeyState, EventId
+from hotikeys.enums import Key, KeyState, EventId, ExecutionMode, RepeatPolicy, WatchdogAction
+from hotikeys.eventsource import EventSource, NullSource, SyntheticSource
+from hotikeys.exceptions import BlockNextHookException
+from hotikeys.filters import Filter, Injected, Extended, Device
 from hotikeys.hotkey import Hotkey, newhotkey
 from hotikeys.keybind import Keybind, Keytoggle
+from hotikeys.layers import Layer, Keymap
+from hotikeys.regions import Region, RegionMap
+from hotikeys.aio import events, EventStream
+from hotikeys.sequence import Sequence
+from hotikeys.gestures import Gesture
+from hotikeys.timed import LongPress, DoubleTap, HoldRelease
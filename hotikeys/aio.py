@@ -0,0 +1,91 @@
+from collections import deque
+from typing import Deque
+from typing import Iterable
+from typing import Type
+from typing import Union
+
+from hotikeys.enums import ExecutionMode
+from hotikeys.hotkey import Hotkey, EventArgs, _KeyArg, _EventArg, _default_loop
+
+
+class EventStream(object):
+    """An async iterator over the events matched by a hotkey.
+
+    Events are buffered per stream in a deque of at most ``buffer`` events; when the consumer falls
+    behind the oldest events are dropped and counted in ``dropped``. The event loop is only woken up
+    when the consumer is actually waiting for an event.
+    """
+
+    def __init__(self, loop=None, buffer=256):
+        self.loop = loop or _default_loop()  # type: asyncio.AbstractEventLoop
+        self.hotkey = None  # type: Hotkey
+        self.dropped = 0  # type: int
+        self._buffer = deque(maxlen=buffer)  # type: Deque[EventArgs]
+        self._waiter = None  # type: asyncio.Future
+        self._closed = False  # type: bool
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> EventArgs:
+        while not self._buffer:
+            if self._closed:
+                raise StopAsyncIteration
+            waiter = self._waiter = self.loop.create_future()
+            if self._buffer:
+                self._waiter = None
+                break
+            await waiter
+        return self._buffer.popleft()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def push(self, args: EventArgs):
+        """Add an event to the stream, safe to call from any thread.
+
+        The args hold their own copy of the hook data, so they can be consumed after the hook returned.
+        """
+        if self._closed:
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(args)
+        self._wakeup()
+
+    def close(self):
+        """End the stream once the buffered events are consumed, and unregister its hotkey."""
+        self._closed = True
+        if self.hotkey is not None:
+            self.hotkey.unregister()
+        self._wakeup()
+
+    def _wakeup(self):
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            self.loop.call_soon_threadsafe(self._set_waiter, waiter)
+
+    @staticmethod
+    def _set_waiter(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+
+def events(key: _KeyArg = None,
+           modifiers: Union[_KeyArg, Iterable[_KeyArg], None] = None,
+           events: Union[_EventArg, Iterable[_EventArg], None] = (),
+           *,
+           buffer: int = 256,
+           loop: 'asyncio.AbstractEventLoop' = None,
+           hotkey_class: Type[Hotkey] = Hotkey) -> EventStream:
+    """Stream the events matching ``key``, ``modifiers`` and ``events``, for use with ``async for``."""
+    stream = EventStream(loop, buffer)
+    stream.hotkey = hotkey_class(stream.push, key, modifiers, events, execution=ExecutionMode.Inline)
+    return stream
@@ -0,0 +1,240 @@
+"""Bindings declared in JSON or TOML files, compiled once and cached by the hash of the file.
+
+A bindings file maps key specs to importable handlers, either as a table keyed by spec or as a list
+of bindings when a spec is bound more than once::
+
+    {"bindings": {
+        "Ctrl+Shift+A": "myapp.actions:select_all",
+        "F5": {"handler": "myapp.actions:refresh", "events": ["Down", "Up"], "execution": "thread_pool"}
+    }}
+
+    [[bindings]]
+    keys = "Ctrl+K"
+    handler = "myapp.actions:kill_line"
+    layer = "edit"
+
+Compiling validates every spec against ``Key`` and ``EventId`` and reduces the bindings to plain
+records of ints and strings, which are cached next to the file. Later loads of an unchanged file
+read the records back and only resolve the handlers and build the hotkeys.
+"""
+import hashlib
+import importlib
+import json
+import marshal
+import os
+import sys
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+from hotikeys.enums import Key, KeyState, EventId, ExecutionMode
+from hotikeys.hotkey import Hotkey
+
+CACHE_MAGIC = b'HKBIND1'
+CACHE_SUFFIX = '.cache'
+OPTIONS = ('events', 'execution', 'coalesce', 'weak', 'layer')
+
+# Modifier names resolve to the left hand keys, which is what the modifiers of a Hotkey match.
+KEY_ALIASES = {
+    'ctrl': Key.LControl, 'control': Key.LControl, 'shift': Key.LShift, 'alt': Key.LAlt,
+    'win': Key.LWin, 'super': Key.LWin, 'meta': Key.LWin, 'cmd': Key.LWin,
+    'esc': Key.Escape, 'del': Key.Delete, 'ins': Key.Insert, 'return': Key.Enter, 'backspace': Key.Back,
+    'pgup': Key.Pageup, 'pgdn': Key.Pagedown, 'capslock': Key.CapsLock,
+}
+
+# A compiled binding: (vkey, modifiers, events, handler path, options)
+_Record = Tuple[Optional[int], Tuple[int, ...], Tuple[int, ...], str, Tuple[Tuple[str, Any], ...]]
+
+_key_names = {}  # type: Dict[str, Key]
+
+
+class BindingError(ValueError):
+    pass
+
+
+def parse_keys(spec: str) -> Tuple[int, Tuple[int, ...]]:
+    """Parse a spec such as ``'Ctrl+Shift+A'`` into its virtual key and modifier keys."""
+    names = [name.strip() for name in spec.split('+')]
+    if not all(names):
+        raise BindingError('invalid key spec {!r}'.format(spec))
+    keys = tuple(int(_key(name, spec)) for name in names)
+    return keys[-1], keys[:-1]
+
+
+def parse_events(events) -> Tuple[int, ...]:
+    """Validate events given as ``KeyState``/``EventId`` names or codes."""
+    if isinstance(events, (str, int)):
+        events = (events,)
+    codes = []
+    for event in events:
+        member = EventId[event]
+        if member is None:
+            member = KeyState[event]
+        if member is None or isinstance(event, bool):
+            raise BindingError('unknown event {!r}, expected a KeyState or EventId'.format(event))
+        codes.append(int(member))
+    return tuple(codes)
+
+
+def compile_bindings(data: Dict[str, Any]) -> List[_Record]:
+    """Validate the parsed contents of a bindings file and compile them to records."""
+    bindings = data.get('bindings')
+    if isinstance(bindings, dict):
+        bindings = [_binding(spec, value) for spec, value in bindings.items()]
+    elif isinstance(bindings, list):
+        bindings = [dict(binding) for binding in bindings]
+    else:
+        raise BindingError("expected a table or list of 'bindings'")
+
+    records = []
+    for binding in bindings:
+        spec = binding.pop('keys', None)
+        handler = binding.pop('handler', None)
+        if not isinstance(spec, str) or not isinstance(handler, str):
+            raise BindingError('expected a keys spec and a handler path in {!r}'.format(binding))
+        _check_handler_path(handler)
+        unknown = set(binding) - set(OPTIONS)
+        if unknown:
+            raise BindingError('unknown options {} for {!r}'.format(sorted(unknown), spec))
+
+        vkey, modifiers = parse_keys(spec)
+        events = parse_events(binding.pop('events', ('Down',)))
+        execution = binding.get('execution')
+        if execution is not None and ExecutionMode[execution] is None:
+            raise BindingError('unknown execution {!r} for {!r}'.format(execution, spec))
+        records.append((vkey, modifiers, events, handler, tuple(sorted(binding.items()))))
+    return records
+
+
+def read_bindings(path: str) -> List[_Record]:
+    """Return the compiled records of a bindings file, from its cache when the file is unchanged."""
+    with open(path, 'rb') as file:
+        content = file.read()
+    digest = hashlib.sha256(content).digest()
+    cache = path + CACHE_SUFFIX
+    records = _read_cache(cache, digest)
+    if records is None:
+        try:
+            records = compile_bindings(_parse(path, content))
+        except BindingError as e:
+            raise BindingError('{}: {}'.format(path, e)) from None
+        _write_cache(cache, digest, records)
+    return records
+
+
+def load(path: str, *, hotkey_class: Type[Hotkey] = Hotkey, keymap=None) -> List[Hotkey]:
+    """Make the hotkeys of a bindings file and register them at once.
+
+    Bindings with a ``layer`` are bound in that layer of ``keymap``.
+    """
+    handlers = {}  # type: Dict[str, Any]
+    hotkeys = []  # type: List[Hotkey]
+    layers = {}  # type: Dict[str, List[Hotkey]]
+    for vkey, modifiers, events, path_, options in read_bindings(path):
+        handler = handlers.get(path_)
+        if handler is None:
+            handler = handlers[path_] = resolve_handler(path_)
+        options = dict(options)
+        layer = options.pop('layer', None)
+        hotkey = hotkey_class(handler, vkey, modifiers, events, register=False, **options)
+        if layer is None:
+            hotkeys.append(hotkey)
+        elif keymap is None:
+            raise BindingError('binding {!r} needs a keymap for layer {!r}'.format(path_, layer))
+        else:
+            layers.setdefault(layer, []).append(hotkey)
+    hotkey_class.register_many(hotkeys)
+    for name, layer_hotkeys in layers.items():
+        keymap.layer(name).add(*layer_hotkeys)
+        hotkeys.extend(layer_hotkeys)
+    return hotkeys
+
+
+def resolve_handler(path: str):
+    """Import a handler from ``'package.module:attribute'`` or ``'package.module.attribute'``."""
+    module, _, attributes = path.partition(':') if ':' in path else path.rpartition('.')
+    try:
+        obj = importlib.import_module(module)
+        for attribute in attributes.split('.'):
+            obj = getattr(obj, attribute)
+    except (ImportError, AttributeError) as e:
+        raise BindingError('cannot import handler {!r}: {}'.format(path, e)) from e
+    if not callable(obj):
+        raise BindingError('handler {!r} is not callable'.format(path))
+    return obj
+
+
+def _binding(spec, value) -> Dict[str, Any]:
+    if isinstance(value, str):
+        return {'keys': spec, 'handler': value}
+    if isinstance(value, dict):
+        return dict(value, keys=spec)
+    raise BindingError('expected a handler path or a table for {!r}'.format(spec))
+
+
+def _key(name, spec) -> Key:
+    if not _key_names:
+        _key_names.update((member_name.lower(), member) for member_name, member in Key.__members__.items())
+        _key_names.update((str(digit), Key['D{}'.format(digit)]) for digit in range(10))
+        _key_names.update(KEY_ALIASES)
+    key = _key_names.get(name.lower())
+    if key is None:
+        raise BindingError('unknown key {!r} in {!r}'.format(name, spec))
+    return key
+
+
+def _check_handler_path(path):
+    module, _, attributes = path.partition(':') if ':' in path else path.rpartition('.')
+    if not module or not attributes:
+        raise BindingError("expected 'module:attribute' for handler, received {!r}".format(path))
+
+
+def _parse(path, content) -> Dict[str, Any]:
+    text = content.decode('utf-8')
+    if path.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise BindingError('reading TOML bindings needs tomllib (Python 3.11+), use JSON instead') from None
+        try:
+            return tomllib.loads(text)
+        except tomllib.TOMLDecodeError as e:
+            raise BindingError('invalid TOML: {}'.format(e)) from e
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise BindingError('invalid JSON: {}'.format(e)) from e
+
+
+def _cache_key(digest) -> bytes:
+    # marshal's format is tied to the interpreter, so the version is part of the key.
+    return CACHE_MAGIC + digest + sys.version.encode()
+
+
+def _read_cache(cache, digest) -> Optional[List[_Record]]:
+    try:
+        with open(cache, 'rb') as file:
+            key = _cache_key(digest)
+            if file.read(len(key)) != key:
+                return None
+            return marshal.loads(file.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cache(cache, digest, records):
+    temp = '{}.{}.tmp'.format(cache, os.getpid())
+    try:
+        with open(temp, 'wb') as file:
+            file.write(_cache_key(digest))
+            marshal.dump(records, file)
+        os.replace(temp, cache)
+    except OSError:
+        # A read-only location only costs the compile on the next start.
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
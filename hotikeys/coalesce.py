@@ -0,0 +1,108 @@
+import threading
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from hotikeys.lleventargs import LowLevelMouseArgs, CoalescedMouseArgs
+
+
+class MouseCoalescer(object):
+    """Merges mouse move and wheel events so at most one is delivered per ``interval`` seconds.
+
+    Intervals are measured with the events' own timestamps. The first event after an interval has
+    passed is delivered right away, carrying everything merged since the previous delivery. Events
+    merged after that are delivered with the next one, or when ``flush()`` is called.
+
+    With ``deliver``, events still merged at the end of their interval are passed to it from the
+    thread of ``scheduler``, a ``TimerScheduler``, so the last position isn't held back once the
+    mouse stops.
+    """
+
+    def __init__(self, interval: float, deliver: Callable[[CoalescedMouseArgs], None] = None,
+                 scheduler: 'TimerScheduler' = None):
+        self.interval = interval  # type: float
+        self.deliver = deliver  # type: Callable[[CoalescedMouseArgs], None]
+        self._interval_ms = int(interval * 1000)  # type: int
+        self._position = None  # type: Optional[Tuple[int, int]]
+        self._delivered = {}  # type: Dict[int, int]
+        self._started = {}  # type: Dict[int, float]
+        self._pending = {}  # type: Dict[int, list]
+        self._scheduler = scheduler  # type: TimerScheduler
+        self._timer = None  # type: Timer
+        self._lock = threading.Lock()
+
+    def add(self, args: LowLevelMouseArgs) -> Optional[CoalescedMouseArgs]:
+        code = args.wparam
+        time = args.time or 0
+        # Only the decoded fields are kept, the trailing event may be delivered from another thread.
+        fields = (args.x or 0, args.y or 0, args.mouse_data or 0, args.lparam[3] or 0, time)
+        with self._lock:
+            dx, dy = self._move(fields[0], fields[1])
+            pending = self._pending.get(code)
+            if pending is None:
+                pending = self._pending[code] = [args.ncode, fields, dx, dy, args.wheel_delta, 1]
+            else:
+                pending[1] = fields
+                pending[2] += dx
+                pending[3] += dy
+                pending[4] += args.wheel_delta
+                pending[5] += 1
+
+            delivered = self._delivered.get(code)
+            if delivered is not None and (time - delivered) & 0xFFFFFFFF < self._interval_ms:
+                if self.deliver is not None and self._timer is None:
+                    self._arm(self.interval)
+                return None
+            self._delivered[code] = time
+            if self.deliver is not None:
+                self._started[code] = self._get_scheduler().clock()
+            return self._pop(code)
+
+    def flush(self) -> List[CoalescedMouseArgs]:
+        """Return the events that are still being merged, if any."""
+        with self._lock:
+            return [self._pop(code) for code in list(self._pending)]
+
+    def _get_scheduler(self):
+        if self._scheduler is None:
+            # Imported here as hotikeys.timed imports the hotkeys using this module.
+            from hotikeys.timed import TimerScheduler
+            self._scheduler = TimerScheduler.default()
+        return self._scheduler
+
+    def _arm(self, delay):
+        self._timer = self._get_scheduler().call_later(delay, self._expire)
+
+    def _expire(self):
+        """Deliver the events whose interval ended without a new event to carry them."""
+        with self._lock:
+            self._timer = None
+            now = self._get_scheduler().clock()
+            due = []
+            wait = None
+            for code in list(self._pending):
+                remaining = self._started.get(code, now) + self.interval - now
+                if remaining > 0:
+                    wait = remaining if wait is None else min(wait, remaining)
+                    continue
+                # The trailing event takes the place of the first one of the next interval.
+                self._delivered[code] = (self._delivered[code] + self._interval_ms) & 0xFFFFFFFF
+                self._started[code] = now
+                due.append(self._pop(code))
+            if wait is not None:
+                self._arm(wait)
+        for args in due:
+            self.deliver(args)
+
+    def _move(self, x, y):
+        position = self._position
+        self._position = x, y
+        if position is None:
+            return 0, 0
+        return x - position[0], y - position[1]
+
+    def _pop(self, code) -> CoalescedMouseArgs:
+        ncode, fields, dx, dy, wheel_delta, samples = self._pending.pop(code)
+        return CoalescedMouseArgs(ncode, code, fields, dx, dy, wheel_delta, samples)
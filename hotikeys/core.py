@@ -1,16 +1,21 @@
 import time
-from _ctypes import POINTER
 from abc import abstractmethod
-from ctypes import c_int, c_void_p
+from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
-
-from hotikeys.enums import KeyState, EventId
+from typing import Optional
+from hotikeys.customtypes import KeyMask
+from hotikeys.dispatch import DispatchTable, MOVE_EVENTS
+from hotikeys.enums import KeyState, ExecutionMode, InputDevice, EventId
+from hotikeys.eventsource import EventSource
+from hotikeys.executor import HandlerPool
+from hotikeys.filters import ALL, MOUSE, keyboard_features, mouse_features, features_of
+from hotikeys.keystate import KeyStateTable
 from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
-from hotikeys.windowshook import WindowsHook
-
-_WH_KEYBOARD_LL = 0x0D
-_WH_MOUSE_LL = 0x0E
+from hotikeys.regions import Region, RegionMap
+from hotikeys.stats import Instrumentation
+from hotikeys.watchdog import Watchdog
 
 
 class HotkeyCoreMeta(type):
@@ -18,27 +23,44 @@ class HotkeyCoreMeta(type):
         super().__init__(name, bases, variables)
         for base in bases:
             for k, v in vars(base).items():
-                if isinstance(v, (list, dict)):
+                if isinstance(v, (list, dict, DispatchTable, KeyStateTable, RegionMap, Instrumentation)):
                     new = type(v)()
                     setattr(cls, k, new)
 
 
 class HotkeyCore(metaclass=HotkeyCoreMeta):
     purge_delay = 10.000
+    clock = time.monotonic
     threaded = True
     no_repeat = True
+    mouse_debounce = 0.0
     keyboard = True
     mouse = True
+    source = None  # type: EventSource
+    default_execution = ExecutionMode.Inline
+    pool_size = 4
+    max_queued = 1024
+    instrumentation = None  # type: Instrumentation
+    watchdog = None  # type: Watchdog
 
-    _pressed = {}  # type: Dict[int, float]
+    _pressed = KeyStateTable()  # type: KeyStateTable
+    _executors = {}  # type: Dict[str, HandlerPool]
+    _registry = DispatchTable()  # type: DispatchTable
+    _regions = RegionMap()  # type: RegionMap
+    _taps = []  # type: List[Any]
+    _table = None  # type: DispatchTable
+    _filter = ALL  # type: int
+    _raw = False  # type: bool
+    _region = None  # type: Region
+    _filed_region = None  # type: Region
 
     __hooked = False
-    __hotkeys = []  # type: List[HotkeyCore]
-    __last_key = None
 
     def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
-        cls.__hotkeys.append(obj)
+        obj._table = cls._registry
+        if kwargs.get('register', True):
+            cls._registry.add(obj)
         if not cls.__hooked:
             cls.__hooked = True
             cls.__install_hooks()
@@ -46,66 +68,257 @@ class HotkeyCore(metaclass=HotkeyCoreMeta):
 
     @classmethod
     def __install_hooks(cls):
-        signature = c_int, c_int, POINTER(c_void_p)
-
-        if cls.keyboard:
-            keyboard_hook = WindowsHook(_WH_KEYBOARD_LL, signature, cls.__on_keyboard)
-            keyboard_hook.register(cls.threaded)
-
-        if cls.mouse:
-            mouse_hook = WindowsHook(_WH_MOUSE_LL, signature, cls.__on_mouse)
-            mouse_hook.register(cls.threaded)
+        if cls.source is None:
+            # Imported here as the Windows hooks can't be loaded on other platforms.
+            from hotikeys.windowshook import WindowsHookSource
+            cls.source = WindowsHookSource()
+        cls.source.install(cls.__on_keyboard if cls.keyboard else None,
+                           cls.__on_mouse if cls.mouse else None,
+                           cls.threaded)
 
     @classmethod
     def __on_keyboard(cls, ncode, wparam, lparam):
-        cls.__on_event(LowLevelKeyboardArgs(ncode, wparam, lparam))
+        instrumentation = cls.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        try:
+            for tap in cls._taps:
+                tap.on_raw(InputDevice.Keyboard, ncode, wparam, lparam)
+            cls.__on_event(keyboard_features(lparam[2] or 0), ncode, wparam, lparam, 0xFFFF & lparam[0])
+        finally:
+            if instrumentation is not None:
+                instrumentation.keyboard_hook.add((time.perf_counter() - start) * 1e6)
 
     @classmethod
     def __on_mouse(cls, ncode, wparam, lparam):
-        cls.__on_event(LowLevelMouseArgs(ncode, wparam, lparam))
+        instrumentation = cls.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        try:
+            for tap in cls._taps:
+                tap.on_raw(InputDevice.Mouse, ncode, wparam, lparam)
+            features = mouse_features(lparam[3] or 0)
+            if wparam in MOVE_EVENTS:
+                if cls._registry.lookup(None, wparam, None, features):
+                    cls.__on_event(features, ncode, wparam, lparam, None)
+                return
+            cls.__on_event(features, ncode, wparam, lparam, LowLevelMouseArgs.get_vkey(wparam, lparam))
+        finally:
+            if instrumentation is not None:
+                instrumentation.mouse_hook.add((time.perf_counter() - start) * 1e6)
 
     @classmethod
-    def __on_event(cls, args):
-        if args.event is EventId.WM_MOUSEMOVE or args.event is EventId.WM_MOUSEWHEEL:
-            for hotkey in cls.__hotkeys:
-                hotkey.on_mouse(args)
-            return
+    def __on_event(cls, features, ncode, wparam, lparam, vkey, args=None):
+        """Dispatch an event, its ``args`` are only built once a hotkey that isn't raw needs them."""
+        instrumentation = cls.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        try:
+            mouse = features & MOUSE
+            # The regions under the pointer, hotkeys with a region only receive the mouse events inside it.
+            hits = cls._regions.at(lparam[0] or 0, lparam[1] or 0) if mouse and cls._regions else None
+            if wparam in MOVE_EVENTS:
+                if args is None:
+                    args = LowLevelMouseArgs(ncode, wparam, lparam)
+                for hotkey in cls._registry.lookup(None, wparam, None, features):
+                    if hits is not None and hotkey._region is not None and hotkey._region not in hits:
+                        continue
+                    hotkey.on_mouse(args)
+                return
+            cls.__purge_keys()
+            event = EventId[wparam]
+            state = None if event is None else event.state
+            if mouse:
+                cls.__flush_mouse()
+                if cls.mouse_debounce and cls._pressed.bounced(vkey, cls.clock(), cls.mouse_debounce,
+                                                               state is KeyState.Down):
+                    return
+                repeat = False
+            else:
+                repeat = state is KeyState.Down and vkey in cls._pressed
 
-        cls.__purge_keys()
-        cls.__set_key_state(args)
-        if not cls.__prevent_repeat(args):
-            for hotkey in cls.__hotkeys:
-                hotkey.on_event(args)
+            cls.__set_key_state(vkey, state)
+            for hotkey in cls._registry.lookup(vkey, wparam, None if state is None else int(state), features):
+                if hits is not None and hotkey._region is not None and hotkey._region not in hits:
+                    continue
+                if hotkey._raw:
+                    hotkey._dispatch_raw(vkey, wparam, lparam, mouse, repeat)
+                    continue
+                if args is None:
+                    args = (LowLevelMouseArgs if mouse else LowLevelKeyboardArgs)(ncode, wparam, lparam)
+                hotkey._dispatch(args, repeat)
+        finally:
+            if instrumentation is not None:
+                histogram = instrumentation.mouse_dispatch if features & MOUSE else instrumentation.keyboard_dispatch
+                histogram.add((time.perf_counter() - start) * 1e6)
 
     @classmethod
-    def __purge_keys(cls):
-        now = time.time()
-        for key, purge_time in list(cls._pressed.items()):
-            if purge_time < now:
-                cls._pressed.pop(key)
+    def feed_keyboard(cls, ncode, wparam, lparam):
+        """Feed a raw keyboard hook event through the same path as the keyboard hook."""
+        cls.__on_keyboard(ncode, wparam, lparam)
 
     @classmethod
-    def __set_key_state(cls, args):
-        if args.event.state == KeyState.Down:
-            cls._pressed[args.vkey] = time.time() + cls.purge_delay
-        elif args.vkey in cls._pressed:
-            cls._pressed.pop(args.vkey)
+    def feed_mouse(cls, ncode, wparam, lparam):
+        """Feed a raw mouse hook event through the same path as the mouse hook."""
+        cls.__on_mouse(ncode, wparam, lparam)
 
     @classmethod
-    def __prevent_repeat(cls, args):
-        if not cls.no_repeat:
-            return False
-        if args.event.state == KeyState.Up:
-            cls.__last_key = None
-            return False
-        if args.vkey == cls.__last_key:
-            return True
-        cls.__last_key = args.vkey
+    def add_tap(cls, tap):
+        """Subscribe to the raw hook events, ``tap.on_raw(device, ncode, wparam, lparam)`` is called for each."""
+        if tap not in cls._taps:
+            cls._taps = cls._taps + [tap]
+
+    @classmethod
+    def remove_tap(cls, tap):
+        cls._taps = [other for other in cls._taps if other is not tap]
+
+    @classmethod
+    def dispatch(cls, args):
+        """Feed event args through the dispatcher as if they were received from the hooks."""
+        cls.__on_event(features_of(args), args.ncode, args.wparam, args.lparam,
+                       None if args.wparam in MOVE_EVENTS else args.vkey, args)
+
+    @classmethod
+    def __flush_mouse(cls):
+        for code in MOVE_EVENTS:
+            for hotkey in cls._registry.lookup(None, code):
+                hotkey._flush_mouse()
+
+    @classmethod
+    def __purge_keys(cls):
+        cls._pressed.purge(cls.clock())
+
+    @classmethod
+    def __set_key_state(cls, vkey, state):
+        if state is KeyState.Down:
+            cls._pressed.press(vkey, cls.clock() + cls.purge_delay)
+        else:
+            cls._pressed.release(vkey)
 
     @classmethod
     def is_pressed(cls, key) -> bool:
         return int(key) in cls._pressed
 
+    @classmethod
+    def handler_pool(cls) -> HandlerPool:
+        """Return the pool shared by this class' hotkeys with ``ExecutionMode.ThreadPool``."""
+        pool = cls._executors.get('pool')
+        if pool is None:
+            pool = cls._executors.setdefault('pool', HandlerPool(cls.pool_size, cls.max_queued))
+        return pool
+
+    @classmethod
+    def batch(cls):
+        """Group registrations and changes to hotkeys, the dispatcher sees them all at once when the block exits."""
+        return cls._registry.batch()
+
+    @classmethod
+    def register_many(cls, hotkeys: Iterable['HotkeyCore']):
+        """Register hotkeys made with ``register=False`` at once, updating the dispatch index once."""
+        for table, group in _group_by_table(hotkeys).items():
+            table.add_many(group)
+            for hotkey in group:
+                hotkey._file_region()
+
+    @classmethod
+    def unregister_many(cls, hotkeys: Iterable['HotkeyCore']):
+        """Unregister hotkeys at once, updating the dispatch index once."""
+        for table, group in _group_by_table(hotkeys).items():
+            table.remove_many(group)
+            for hotkey in group:
+                hotkey._unregistered()
+
+    @classmethod
+    def instrument(cls, enabled=True) -> Optional[Instrumentation]:
+        """Start recording hook, dispatch and handler timings for this class, or stop and discard them."""
+        cls.instrumentation = Instrumentation() if enabled else None
+        return cls.instrumentation
+
+    @classmethod
+    def watch(cls, enabled=True, **options) -> Optional[Watchdog]:
+        """Start watching the runtime and errors of this class' handlers, or stop, see ``Watchdog``.
+
+        ``options`` are passed to the ``Watchdog``.
+        """
+        cls.watchdog = Watchdog(**options) if enabled else None
+        return cls.watchdog
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """Return a snapshot of the executor counters and, while enabled, the timing histograms and watchdog."""
+        stats = {'executors': {name: executor.stats() for name, executor in list(cls._executors.items())}}
+        if cls.instrumentation is not None:
+            stats.update(cls.instrumentation.snapshot())
+        if cls.watchdog is not None:
+            stats['watchdog'] = cls.watchdog.snapshot()
+        return stats
+
+    @classmethod
+    def pressed_snapshot(cls) -> KeyMask:
+        """Return an immutable copy of the currently pressed keys, see ``KeyMask``."""
+        return cls._pressed.snapshot()
+
+    def __enter__(self):
+        return self.register()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unregister()
+
+    @property
+    def registered(self) -> bool:
+        return self in self._table
+
+    def register(self) -> 'HotkeyCore':
+        """Add the hotkey to the dispatcher, after ``unregister`` or when it was made with ``register=False``."""
+        self._table.add(self)
+        self._file_region()
+        return self
+
+    def unregister(self):
+        """Remove the hotkey from the dispatcher, it can be registered again later."""
+        self._table.remove(self)
+        self._unregistered()
+
+    def _unregistered(self):
+        """Release what the hotkey holds on to while registered."""
+        if self.instrumentation is not None:
+            self.instrumentation.handlers.pop(self, None)
+        if self.watchdog is not None:
+            self.watchdog.forget(self)
+        self._file_region()
+
+    def _file_region(self):
+        """Keep the region of the hotkey in the class' region map while, and only while, it's registered."""
+        region = self._region if self.registered else None
+        filed = self._filed_region
+        if region is not filed:
+            if region is not None:
+                self._regions.add(region)
+            if filed is not None:
+                self._regions.remove(filed)
+            self._filed_region = region
+
+    def _dispatch_keys(self):
+        """The (vkey, event) keys this hotkey is indexed under, see ``DispatchTable``."""
+        return (None, None), (None, MOVE_EVENTS[0]), (None, MOVE_EVENTS[1])
+
+    def _dispatch(self, args, repeat=False) -> bool:
+        """Called by the dispatcher for events that passed the dispatch index, returns whether it matched.
+
+        ``repeat`` is set for key down events of a key that is already held down.
+        """
+        if repeat and self.no_repeat:
+            return False
+        return bool(self.on_event(args))
+
+    def _dispatch_raw(self, vkey, code, lparam, mouse, repeat=False) -> bool:
+        """Called instead of ``_dispatch`` for hotkeys with ``_raw`` set, with the undecoded ``lparam``."""
+        return False
+
+    def _flush_mouse(self):
+        """Deliver mouse move events held back by coalescing, called before mouse button events."""
+        pass
+
     @abstractmethod
     def on_event(self, args):
         pass
@@ -113,3 +326,11 @@ class HotkeyCore(metaclass=HotkeyCoreMeta):
     @abstractmethod
     def on_mouse(self, args):
         pass
+
+
+def _group_by_table(hotkeys) -> Dict[DispatchTable, List[HotkeyCore]]:
+    """Group hotkeys by the dispatch table they're registered in, the class registry or a layer."""
+    tables = {}  # type: Dict[DispatchTable, List[HotkeyCore]]
+    for hotkey in hotkeys:
+        tables.setdefault(hotkey._table, []).append(hotkey)
+    return tables
@@ -2,6 +2,21 @@ from enum import EnumMeta, Enum
 
 
 class FlagsDword(int):
+    _max_interned = 256
+
+    @classmethod
+    def of(cls, value) -> 'FlagsDword':
+        """Return a shared instance for a value, flags only ever take a handful of distinct values.
+
+        Subclasses that use this declare their own ``_interned = {}``.
+        """
+        flags = cls._interned.get(value)
+        if flags is None:
+            flags = cls(value)
+            if len(cls._interned) < cls._max_interned:
+                cls._interned[value] = flags
+        return flags
+
     def __iter__(self):
         for k, v in vars(self.__class__).items():
             if isinstance(v, property):
@@ -28,9 +43,28 @@ class FlagsDword(int):
 
 
 class IEnumMeta(EnumMeta):
+    """Enum meta that looks up members by name or by value, returning ``None`` for unknown items.
+
+    Lookups go through a table built once per class, names take precedence over values and aliases
+    resolve to their canonical member.
+    """
+
+    def __init__(cls, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        table = {}
+        for member in cls:
+            try:
+                table[member.value] = member
+            except TypeError:
+                pass
+        table.update(cls.__members__)
+        type.__setattr__(cls, '_lookup_table_', table)
+
     def __getitem__(cls, item) -> 'IEnumMeta':
-        if item in cls.__members__:
-            return super().__getitem__(item)
+        try:
+            return cls._lookup_table_.get(item)
+        except TypeError:
+            pass
         for enum in cls:
             if enum.value == item:
                 return enum
@@ -45,3 +79,40 @@ class IEnum(Enum, metaclass=IEnumMeta):
 
     def __bool__(self):
         return bool(self.value)
+
+
+class KeyMask(int):
+    """An immutable set of virtual key codes, stored as a bitmask.
+
+    Key codes outside of the mask range map onto a single bit that is never set in a key state table,
+    so masks built with them can never be matched.
+    """
+    size = 256
+
+    @classmethod
+    def of(cls, keys) -> 'KeyMask':
+        mask = 0
+        for key in keys:
+            key = int(key)
+            mask |= 1 << (key if 0 <= key < cls.size else cls.size)
+        return cls(mask)
+
+    def __contains__(self, key):
+        key = int(key)
+        return 0 <= key < self.size and bool(self >> key & 1)
+
+    def __iter__(self):
+        mask = int(self)
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __len__(self):
+        return bin(self).count('1')
+
+    def issuperset(self, other) -> bool:
+        return self & other == other
+
+    def __repr__(self):
+        return '<{cls}: {keys}>'.format(cls=self.__class__.__name__, keys=list(self))
@@ -0,0 +1,240 @@
+import threading
+from contextlib import contextmanager
+from operator import itemgetter
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from hotikeys.enums import EventId
+from hotikeys.filters import ALL
+
+MOVE_EVENTS = (int(EventId.WM_MOUSEMOVE), int(EventId.WM_MOUSEWHEEL))
+
+_DispatchKey = Tuple[Optional[int], Optional[int]]
+
+
+class _Snapshot(object):
+    """An immutable view of the dispatch index, with its own lookup cache.
+
+    ``dead`` holds the hotkeys removed since the buckets were last compacted. It is only ever added to
+    while the snapshot is current, as a removed hotkey must not be seen by any lookup from then on.
+    """
+    __slots__ = ('buckets', 'dead', 'keys', 'cache')
+
+    def __init__(self, buckets, dead, keys):
+        self.buckets = buckets  # type: Dict[_DispatchKey, Dict[Any, int]]
+        self.dead = dead  # type: Set[Any]
+        self.keys = keys  # type: Tuple[_DispatchKey, ...]
+        self.cache = {}  # type: Dict[Tuple[Optional[int], int, Optional[int]], Tuple[Any, ...]]
+
+
+class DispatchTable(object):
+    """Indexes hotkeys by the (vkey, event) pairs they can match.
+
+    Each hotkey files itself under one or more dispatch keys through ``_dispatch_keys()``. A dispatch
+    key is a ``(vkey, selector)`` tuple where ``vkey`` is ``None`` to match any key and ``selector`` is
+    an event code, a ``KeyState`` value or ``None`` to match any event. Mouse move and wheel events
+    only reach hotkeys filed under ``(None, code)`` for their exact code.
+
+    The index is published as immutable snapshots. ``lookup`` reads the current snapshot once and never
+    takes a lock, so the hook threads always see a consistent index while other threads register
+    hotkeys. Writers serialize on a lock and copy only the buckets they add to; all changes made inside
+    ``batch()`` are published as one snapshot. Lookups are cached per snapshot and event features, so
+    filters of hotkeys are evaluated once per distinct kind of event rather than on every event.
+
+    Removed hotkeys are left in their buckets as tombstones that lookups skip, so a removal doesn't
+    copy buckets that may hold thousands of wildcard hotkeys. Once there are more tombstones than
+    live hotkeys, the buckets holding them are compacted, which keeps removal O(1) amortised.
+    """
+    #: Tombstones are compacted once there are more of them than live hotkeys, and at least this many.
+    compact_min = 64
+
+    def __init__(self):
+        self._counter = 0  # type: int
+        self._order = {}  # type: Dict[Any, int]
+        self._keys = {}  # type: Dict[Any, Tuple[_DispatchKey, ...]]
+        self._live = {}  # type: Dict[_DispatchKey, int]
+        self._dead = set()  # type: Set[Any]
+        self._snapshot = _Snapshot({}, self._dead, ())  # type: _Snapshot
+        self._lock = threading.RLock()
+        self._depth = 0  # type: int
+        self._working = None  # type: Dict[_DispatchKey, Dict[Any, int]]
+        self._copied = None  # type: Set[_DispatchKey]
+        self._changed = False  # type: bool
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, hotkey):
+        return hotkey in self._order
+
+    def __iter__(self):
+        with self._lock:
+            order = list(self._order.items())
+        return iter(hotkey for hotkey, _ in sorted(order, key=itemgetter(1)))
+
+    @contextmanager
+    def batch(self):
+        """Group changes, which are published as one snapshot when the outermost batch exits."""
+        with self._lock:
+            if not self._depth:
+                self._working = dict(self._snapshot.buckets)
+                self._copied = set()
+                self._changed = False
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    if len(self._dead) > max(self.compact_min, len(self._order)):
+                        self._compact()
+                    self._working, working = None, self._working
+                    self._copied = None
+                    if self._changed:
+                        buckets = {key: bucket for key, bucket in working.items() if bucket}
+                        self._snapshot = _Snapshot(buckets, self._dead, tuple(self._live))
+                        self._published()
+
+    def add(self, hotkey):
+        self.add_many((hotkey,))
+
+    def add_many(self, hotkeys: Iterable[Any]):
+        """Add hotkeys in order, publishing them in one snapshot."""
+        with self.batch():
+            for hotkey in hotkeys:
+                if hotkey in self._order:
+                    continue
+                if hotkey in self._dead:
+                    self._unfile(hotkey)
+                    # A new set, the current snapshot still has the hotkey's old filings to skip.
+                    self._dead = self._dead - {hotkey}
+                self._order[hotkey] = self._counter
+                self._counter += 1
+                self._file(hotkey, self._dispatch_keys(hotkey))
+
+    def remove(self, hotkey):
+        self.remove_many((hotkey,))
+
+    def remove_many(self, hotkeys: Iterable[Any]):
+        """Remove hotkeys, publishing the change in one snapshot. Unknown hotkeys are ignored."""
+        with self.batch():
+            for hotkey in hotkeys:
+                if hotkey not in self._order:
+                    continue
+                del self._order[hotkey]
+                keys = self._keys[hotkey]
+                if not keys:
+                    del self._keys[hotkey]
+                    continue
+                # Lookups skip the hotkey from now on, also those still reading the current snapshot.
+                self._dead.add(hotkey)
+                self._count(keys, -1)
+                self._changed = True
+
+    def update(self, hotkey):
+        """Refile a hotkey after its key or events have changed."""
+        if hotkey not in self._order:
+            return
+        with self.batch():
+            if hotkey not in self._order:
+                return
+            keys = self._dispatch_keys(hotkey)
+            if keys == self._keys[hotkey]:
+                return
+            self._unfile(hotkey)
+            self._file(hotkey, keys)
+
+    def dispatch_keys(self) -> Tuple[_DispatchKey, ...]:
+        """The dispatch keys that have at least one hotkey filed under them."""
+        return self._snapshot.keys
+
+    def invalidate(self):
+        """Publish the index again with an empty lookup cache, after a filter of a hotkey changed."""
+        with self.batch():
+            self._changed = True
+
+    def lookup(self, vkey, code, state=None, features=None) -> Tuple[Any, ...]:
+        """Return the hotkeys that may match an event, in registration order.
+
+        With the ``features`` of the event, see ``hotikeys.filters``, hotkeys whose filter rejects
+        them are left out.
+        """
+        snapshot = self._snapshot
+        try:
+            return snapshot.cache[vkey, code, features]
+        except KeyError:
+            pass
+        if code in MOVE_EVENTS:
+            keys = ((None, code),)
+        else:
+            keys = ((vkey, code), (vkey, state), (vkey, None),
+                    (None, code), (None, state), (None, None))
+        candidates = {}
+        for key in keys:
+            candidates.update(snapshot.buckets.get(key, ()))
+        dead = snapshot.dead
+        if features is not None:
+            candidates = {hotkey: order for hotkey, order in candidates.items()
+                          if getattr(hotkey, '_filter', ALL) >> features & 1 and hotkey not in dead}
+        elif dead:
+            candidates = {hotkey: order for hotkey, order in candidates.items() if hotkey not in dead}
+        entry = tuple(sorted(candidates, key=candidates.__getitem__))
+        snapshot.cache[vkey, code, features] = entry
+        return entry
+
+    def _published(self):
+        """Called with the lock held after a new snapshot was published."""
+        pass
+
+    def _bucket(self, key) -> Dict[Any, int]:
+        """Return the writable copy of a bucket in the current batch."""
+        if key not in self._copied:
+            self._copied.add(key)
+            self._working[key] = dict(self._working.get(key, ()))
+        return self._working[key]
+
+    def _file(self, hotkey, keys):
+        self._keys[hotkey] = keys
+        order = self._order[hotkey]
+        for key in keys:
+            self._bucket(key)[hotkey] = order
+        self._count(keys, 1)
+        self._changed = self._changed or bool(keys)
+
+    def _unfile(self, hotkey):
+        keys = self._keys.pop(hotkey, ())
+        for key in keys:
+            self._bucket(key).pop(hotkey, None)
+        if hotkey not in self._dead:
+            self._count(keys, -1)
+        self._changed = self._changed or bool(keys)
+
+    def _count(self, keys, delta):
+        """Count the live hotkeys filed under each key, as buckets may only hold tombstones."""
+        live = self._live
+        for key in keys:
+            count = live.get(key, 0) + delta
+            if count:
+                live[key] = count
+            else:
+                del live[key]
+
+    def _compact(self):
+        """Drop the tombstones from their buckets, starting a new set for the snapshots to come."""
+        dead, self._dead = self._dead, set()
+        for hotkey in dead:
+            for key in self._keys.pop(hotkey):
+                self._bucket(key).pop(hotkey, None)
+        self._changed = True
+
+    @staticmethod
+    def _dispatch_keys(hotkey) -> Tuple[_DispatchKey, ...]:
+        keys = []
+        for key in hotkey._dispatch_keys():
+            if key not in keys:
+                keys.append(key)
+        return tuple(keys)
@@ -255,3 +255,21 @@ class Key(IEnum):
     Control = 0x20000
     Alt = 0x40000
     Modifiers = -0x10000
+
+
+class ExecutionMode(IEnum):
+    Inline = 'inline'
+    ThreadPool = 'thread_pool'
+    DedicatedThread = 'dedicated_thread'
+
+
+class RepeatPolicy(IEnum):
+    Suppress = 'suppress'
+    Pass = 'pass'
+    Throttle = 'throttle'
+
+
+class WatchdogAction(IEnum):
+    Ignore = 'ignore'
+    Offload = 'offload'
+    Quarantine = 'quarantine'
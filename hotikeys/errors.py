@@ -0,0 +1,84 @@
+import logging
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Tuple
+
+log = logging.getLogger(__name__)
+
+
+class ErrorReporter(object):
+    """Logs exceptions raised on the hook and handler threads, rate limited and aggregated.
+
+    The first exception of each kind, the context it was reported from, its type and the line that
+    raised it, is logged with its traceback once per ``interval`` seconds. Repeats are only counted
+    and logged as one summary line per kind when the interval is over, so a handler that fails on
+    every event doesn't format and print a traceback on every event. At most ``max_kinds`` kinds are
+    logged per interval, the rest are only counted.
+    """
+
+    def __init__(self, interval: float = 10.0, max_kinds: int = 10, logger: logging.Logger = log):
+        self.interval = interval  # type: float
+        self.max_kinds = max_kinds  # type: int
+        self.logger = logger  # type: logging.Logger
+        self.clock = time.monotonic
+        self.reported = 0  # type: int
+        self._counts = {}  # type: Dict[Tuple[Any, ...], int]
+        self._names = {}  # type: Dict[Tuple[Any, ...], str]
+        self._window = None  # type: float
+        self._lock = threading.Lock()
+
+    def report(self, exc: BaseException, context: str = 'handler'):
+        now = self.clock()
+        key = (context, type(exc)) + _origin(exc)
+        with self._lock:
+            self.reported += 1
+            if self._window is None or now - self._window >= self.interval:
+                summary = self._reset(now)
+            else:
+                summary = ()
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts[key] = count + 1
+            elif len(self._counts) >= self.max_kinds:
+                key = (context, None)
+                self._counts[key] = self._counts.get(key, 0) + 1
+                self._names[key] = 'other exceptions'
+            else:
+                self._counts[key] = 0
+                self._names[key] = type(exc).__name__
+        self._log_summary(summary)
+        if count is None and key[1] is not None:
+            self.logger.error('%s in %s', type(exc).__name__, context, exc_info=exc)
+
+    def flush(self):
+        """Log the counts of the exceptions that were suppressed since they were last logged."""
+        with self._lock:
+            summary = self._reset(self.clock())
+        self._log_summary(summary)
+
+    def _reset(self, now):
+        summary = [(self._names[key], key[0], count, now - self._window)
+                   for key, count in self._counts.items() if count]
+        self._counts = {}
+        self._names = {}
+        self._window = now
+        return summary
+
+    def _log_summary(self, summary):
+        for name, context, count, elapsed in summary:
+            self.logger.error('%s in %s: %d more suppressed in the last %.1f seconds', name, context, count, elapsed)
+
+
+def _origin(exc) -> Tuple[Any, ...]:
+    """The code and line that raised an exception."""
+    tb = exc.__traceback__
+    if tb is None:
+        return ()
+    while tb.tb_next is not None:
+        tb = tb.tb_next
+    return tb.tb_frame.f_code, tb.tb_lineno
+
+
+reporter = ErrorReporter()
@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+from abc import abstractmethod
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from hotikeys.enums import EventId, InputDevice, Key
+from hotikeys.exceptions import BlockNextHookException
+
+_RawHandler = Callable[[int, int, Any], None]
+
+DEFAULT_KEYS = tuple(int(key) for key in (
+    Key.A, Key.S, Key.D, Key.F, Key.G, Key.H, Key.J, Key.K, Key.L,
+    Key.E, Key.R, Key.T, Key.I, Key.O, Key.N, Key.Space, Key.Back, Key.Enter))
+
+
+class EventSource(object):
+    """Delivers raw keyboard and mouse events to a hotkey class.
+
+    ``install`` receives the raw handlers of the hotkey class, which take ``(ncode, wparam, lparam)``
+    and raise ``BlockNextHookException`` to block an event. Either handler may be ``None`` when the
+    hotkey class doesn't want those events.
+    """
+
+    @abstractmethod
+    def install(self, on_keyboard: Optional[_RawHandler], on_mouse: Optional[_RawHandler], threaded=True):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def time_ms(self) -> int:
+        """The current time in the timebase of the event timestamps, in milliseconds."""
+        return int(time.monotonic() * 1000) & 0xFFFFFFFF
+
+
+class NullSource(EventSource):
+    """Delivers no events, for hotkey classes that are only fed manually or by a ``Replayer``."""
+
+    def install(self, on_keyboard, on_mouse, threaded=True):
+        pass
+
+
+class SyntheticSource(EventSource):
+    """Generates a typing and mouse workload in process, at a target rate of events per second.
+
+    Each step is either a key press (a key down and up), or with probability ``mouse_ratio`` a mouse
+    move, of which ``click_ratio`` are followed by a left button click. The workload is seeded, so the
+    same settings generate the same events. Generation stops after ``count`` events, ``duration``
+    seconds or ``stop()``, whichever comes first.
+    """
+
+    def __init__(self,
+                 rate: float = 1000.0,
+                 *,
+                 count: int = None,
+                 duration: float = None,
+                 keys: Sequence[int] = DEFAULT_KEYS,
+                 mouse_ratio: float = 0.5,
+                 click_ratio: float = 0.05,
+                 seed: int = 0):
+        self.rate = rate  # type: float
+        self.count = count  # type: int
+        self.duration = duration  # type: float
+        self.keys = tuple(int(key) for key in keys)  # type: Tuple[int, ...]
+        self.mouse_ratio = mouse_ratio  # type: float
+        self.click_ratio = click_ratio  # type: float
+        self.seed = seed  # type: int
+        self.generated = 0  # type: int
+        self.blocked = 0  # type: int
+        self.thread = None  # type: threading.Thread
+        self._stopped = threading.Event()
+        self._handlers = {}  # type: dict
+
+    def install(self, on_keyboard, on_mouse, threaded=True):
+        self._handlers = {int(InputDevice.Keyboard): on_keyboard, int(InputDevice.Mouse): on_mouse}
+        self._stopped.clear()
+        if threaded:
+            self.thread = threading.Thread(target=self.run)
+            self.thread.daemon = True
+            self.thread.start()
+        else:
+            self.run()
+
+    def uninstall(self):
+        self.stop()
+
+    def stop(self):
+        self._stopped.set()
+
+    def join(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def run(self):
+        interval = 1 / self.rate
+        start = time.perf_counter()
+        end = start + self.duration if self.duration is not None else float('inf')
+        for device, wparam, fields in self.workload():
+            if self._stopped.is_set() or (self.count is not None and self.generated >= self.count):
+                break
+            due = start + self.generated * interval
+            now = time.perf_counter()
+            if now >= end:
+                break
+            if due - now > 0.001:
+                time.sleep(due - now)
+            self.generated += 1
+            handler = self._handlers.get(device)
+            if handler is None:
+                continue
+            try:
+                handler(0, wparam, fields + (self.time_ms(),))
+            except BlockNextHookException:
+                self.blocked += 1
+
+    def workload(self) -> Iterator[Tuple[int, int, Tuple[int, ...]]]:
+        """Yield ``(device, wparam, lparam)`` for an endless workload, without the trailing timestamp."""
+        rng = random.Random(self.seed)
+        keyboard, mouse = int(InputDevice.Keyboard), int(InputDevice.Mouse)
+        x, y = 960, 540
+        while True:
+            if rng.random() >= self.mouse_ratio:
+                key = rng.choice(self.keys)
+                yield keyboard, int(EventId.WM_KEYDOWN), (key, 0, 0)
+                yield keyboard, int(EventId.WM_KEYUP), (key, 0, 0x80)
+                continue
+            x = min(max(x + rng.randint(-8, 8), 0), 1919)
+            y = min(max(y + rng.randint(-8, 8), 0), 1079)
+            yield mouse, int(EventId.WM_MOUSEMOVE), (x, y, 0, 0)
+            if rng.random() < self.click_ratio:
+                yield mouse, int(EventId.WM_LBUTTONDOWN), (x, y, 0, 0)
+                yield mouse, int(EventId.WM_LBUTTONUP), (x, y, 0, 0)
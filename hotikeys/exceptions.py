@@ -0,0 +1,2 @@
+class BlockNextHookException(Exception):
+    """Block CallNextHookEx from being called during an event"""
@@ -0,0 +1,190 @@
+import logging
+import sys
+import threading
+from abc import abstractmethod
+from collections import deque
+from queue import Queue, Full
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from hotikeys.errors import reporter
+from hotikeys.exceptions import BlockNextHookException
+
+log = logging.getLogger(__name__)
+
+_Call = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+class HandlerExecutor(object):
+    """Base class for bounded executors that run handlers off the hook thread.
+
+    ``submit`` never blocks: once ``max_queued`` calls are waiting, new calls are dropped and counted.
+    """
+
+    def __init__(self, max_queued=1024):
+        self.max_queued = max_queued  # type: int
+        self.submitted = 0  # type: int
+        self.completed = 0  # type: int
+        self.dropped = 0  # type: int
+
+    @abstractmethod
+    def submit(self, key, func, args=()) -> bool:
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued': self.queued,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'dropped': self.dropped,
+        }
+
+    @staticmethod
+    def _run(func, args):
+        # noinspection PyBroadException
+        try:
+            func(*args)
+        except BlockNextHookException:
+            log.warning('%r raised BlockNextHookException outside of the hook thread, '
+                        'the event was not blocked', func)
+        except:
+            reporter.report(sys.exc_info()[1], 'executor')
+
+
+class HandlerPool(HandlerExecutor):
+    """A pool of worker threads shared by many hotkeys.
+
+    Calls are queued per key (usually the hotkey) and a key is only ever run by one worker at a time,
+    so calls for the same key keep their order while different keys run concurrently.
+    """
+
+    def __init__(self, workers=4, max_queued=1024):
+        super().__init__(max_queued)
+        self.workers = workers  # type: int
+        self.queued = 0  # type: int
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._ready = deque()  # type: Deque[Any]
+        self._strands = {}  # type: Dict[Any, Deque[_Call]]
+        self._threads = []  # type: List[threading.Thread]
+
+    def submit(self, key, func, args=()) -> bool:
+        with self._lock:
+            if self.queued >= self.max_queued:
+                self.dropped += 1
+                return False
+            self.queued += 1
+            self.submitted += 1
+            strand = self._strands.get(key)
+            if strand is None:
+                self._strands[key] = deque(((func, args),))
+                self._ready.append(key)
+                self._wakeup.notify()
+                if len(self._threads) < self.workers:
+                    self._start_worker()
+            else:
+                strand.append((func, args))
+        return True
+
+    def _start_worker(self):
+        thread = threading.Thread(target=self._work)
+        thread.daemon = True
+        thread.start()
+        self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while not self._ready:
+                    self._wakeup.wait()
+                key = self._ready.popleft()
+                func, args = self._strands[key].popleft()
+            self._run(func, args)
+            with self._lock:
+                self.queued -= 1
+                self.completed += 1
+                if self._strands[key]:
+                    self._ready.append(key)
+                    self._wakeup.notify()
+                else:
+                    del self._strands[key]
+
+
+class HandlerThread(HandlerExecutor):
+    """A single worker thread with its own queue, for handlers that shouldn't share a pool."""
+
+    def __init__(self, max_queued=1024):
+        super().__init__(max_queued)
+        self._queue = Queue(max_queued)  # type: Queue
+        self._thread = None  # type: threading.Thread
+        self._stop = None  # type: threading.Event
+        self._previous = None  # type: threading.Thread
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, args=()) -> bool:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait((func, args))
+        except Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        """Stop the worker thread after the queued calls, the next ``submit`` starts a new one.
+
+        Never blocks, so it's safe to call from the hook thread and from the worker itself.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            stop, self._stop = self._stop, None
+            if thread is not None:
+                self._previous = thread
+        if thread is not None:
+            stop.set()
+            try:
+                self._queue.put_nowait((None, stop))
+            except Full:
+                # The worker sees the flag once it has worked through the queue.
+                pass
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stop = threading.Event()
+                previous, self._previous = self._previous, None
+                self._thread = threading.Thread(target=self._work, args=(self._stop, previous))
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _work(self, stop, previous):
+        if previous is not None:
+            # The closed worker may still be running a call, the queue is only taken over once it
+            # has returned so calls keep their order.
+            previous.join()
+            previous = None
+        while True:
+            func, args = self._queue.get()
+            if func is None:
+                if args is stop:
+                    return
+                # The stop sentinel of a previous worker, which already exited on its flag.
+                continue
+            self._run(func, args)
+            with self._lock:
+                self.completed += 1
+            # Leave the rest of the queue to the worker that replaced this one, if any.
+            if stop.is_set() and (self._thread is not None or self._queue.empty()):
+                return
@@ -0,0 +1,207 @@
+"""Fan-out of raw hook events to other processes over a shared memory ring buffer.
+
+A ``Publisher`` taps the raw events of a hotkey class and writes them as ``RECORD`` records into a
+ring of fixed-width slots in ``multiprocessing.shared_memory``. ``Subscriber`` processes attach to the
+ring by name and read it with their own cursors, so heavy consumers run outside the hook process and
+don't contend for its GIL. The publisher never waits for subscribers: once the ring wraps around,
+the oldest records are overwritten and a subscriber that fell behind skips them, counting them as
+``lost``.
+
+Layout: a 64 byte header (``MAGIC``, capacity, slot size and the number of records published at
+``PUBLISHED_OFFSET``) followed by ``capacity`` slots. A slot is an 8 byte sequence word followed by
+a ``RECORD``. While record ``n`` is written to its slot the word is ``2n + 1`` and ``2n + 2`` once it
+is complete, so a reader knows a record was overwritten or torn when the word isn't ``2n + 2``
+before and after copying it.
+"""
+import os
+import struct
+import threading
+import time
+from typing import Iterator
+from typing import List
+from typing import Type
+
+from hotikeys.core import HotkeyCore
+from hotikeys.enums import InputDevice
+from hotikeys.recording import RECORD, _RawEvent, _MOUSE
+
+MAGIC = b'HKRING01'
+HEADER = struct.Struct('<8sII')
+PUBLISHED_OFFSET = 16
+SLOTS_OFFSET = 64
+SEQUENCE = struct.Struct('<Q')
+SLOT_SIZE = SEQUENCE.size + RECORD.size
+
+_created = set()  # the names of the blocks created by publishers in this process
+
+
+def _shared_memory():
+    # Imported on first use, shared_memory needs Python 3.8+ and isn't needed by the rest of hotikeys.
+    from multiprocessing import shared_memory
+    return shared_memory
+
+
+class Publisher(object):
+    """Publishes the raw hook events of a hotkey class into a shared memory ring of ``capacity`` records.
+
+    ``name`` is the name of the shared memory block subscribers attach to, a random one is chosen
+    when it's not given. The block is removed when the publisher is closed.
+    """
+
+    def __init__(self, name: str = None, capacity: int = 65536):
+        if capacity < 1:
+            raise ValueError('expected a positive capacity, received: {0!r}'.format(capacity))
+        self.capacity = capacity  # type: int
+        self.hotkey_class = None  # type: Type[HotkeyCore]
+        self.published = 0  # type: int
+        self._memory = _shared_memory().SharedMemory(name, create=True, size=SLOTS_OFFSET + SLOT_SIZE * capacity)
+        self._buffer = self._memory.buf  # type: memoryview
+        self._lock = threading.Lock()
+        _created.add(self._memory.name)
+        HEADER.pack_into(self._buffer, 0, MAGIC, capacity, SLOT_SIZE)
+        SEQUENCE.pack_into(self._buffer, PUBLISHED_OFFSET, 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def attach(self, hotkey_class: Type[HotkeyCore]):
+        self.detach()
+        self.hotkey_class = hotkey_class
+        hotkey_class.add_tap(self)
+
+    def detach(self):
+        if self.hotkey_class is not None:
+            self.hotkey_class.remove_tap(self)
+            self.hotkey_class = None
+
+    def on_raw(self, device, ncode, wparam, lparam):
+        last = (lparam[4] or 0) if device is InputDevice.Mouse else 0
+        buffer = self._buffer
+        # The keyboard and mouse hooks can run on different threads, the lock only orders them.
+        with self._lock:
+            sequence = self.published
+            offset = SLOTS_OFFSET + sequence % self.capacity * SLOT_SIZE
+            SEQUENCE.pack_into(buffer, offset, 2 * sequence + 1)
+            RECORD.pack_into(buffer, offset + SEQUENCE.size, int(device), ncode, wparam,
+                             lparam[0] or 0, lparam[1] or 0, lparam[2] or 0, lparam[3] or 0, last)
+            SEQUENCE.pack_into(buffer, offset, 2 * sequence + 2)
+            self.published = sequence + 1
+            SEQUENCE.pack_into(buffer, PUBLISHED_OFFSET, sequence + 1)
+
+    def close(self):
+        self.detach()
+        if self._buffer is not None:
+            self._buffer = None
+            self._memory.close()
+            self._memory.unlink()
+            _created.discard(self._memory.name)
+
+
+class Subscriber(object):
+    """Reads the events of a ``Publisher`` from another process, by the name of its shared memory block.
+
+    The cursor starts at the records published after the subscriber attached, or at the oldest
+    record still in the ring with ``from_start``. Records that were overwritten before they were read
+    are skipped and counted in ``lost``.
+    """
+
+    def __init__(self, name: str, from_start: bool = False):
+        shared_memory = _shared_memory()
+        try:
+            # Only the publisher owns the block, a subscriber mustn't remove it when it exits.
+            self._memory = shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            self._memory = shared_memory.SharedMemory(name)
+            if os.name == 'posix' and self._memory.name not in _created:
+                # Before Python 3.13 attaching registers the block with the resource tracker, which
+                # would remove it when this process exits.
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self._memory._name, 'shared_memory')
+        self._buffer = self._memory.buf  # type: memoryview
+        magic, self.capacity, slot_size = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or slot_size != SLOT_SIZE:
+            self.close()
+            raise ValueError('{0} is not a hotikeys event ring'.format(name))
+        published = self._published()
+        self.cursor = max(0, published - self.capacity) if from_start else published  # type: int
+        self.lost = 0  # type: int
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self) -> Iterator[_RawEvent]:
+        """Yield events as they're published, waiting for new ones indefinitely."""
+        while True:
+            for event in self.read():
+                yield event
+            self.wait()
+
+    @property
+    def pending(self) -> int:
+        """The number of published records the cursor hasn't reached, including ones already overwritten."""
+        return self._published() - self.cursor
+
+    def read(self, max_records: int = None) -> List[_RawEvent]:
+        """Return the records published since the last read, without waiting."""
+        buffer, capacity = self._buffer, self.capacity
+        published = self._published()
+        if published - self.cursor > capacity:
+            self._skip(published - capacity)
+        end = published if max_records is None else min(published, self.cursor + max_records)
+        events = []
+        while self.cursor < end:
+            sequence = self.cursor
+            offset = SLOTS_OFFSET + sequence % capacity * SLOT_SIZE
+            expected = 2 * sequence + 2
+            if SEQUENCE.unpack_from(buffer, offset)[0] == expected:
+                device, ncode, wparam, *lparam = RECORD.unpack_from(buffer, offset + SEQUENCE.size)
+                if SEQUENCE.unpack_from(buffer, offset)[0] == expected:
+                    events.append((device, ncode, wparam, tuple(lparam) if device == _MOUSE else tuple(lparam[:4])))
+                    self.cursor = sequence + 1
+                    continue
+            # Overwritten while we got here, catch up with the oldest record that's still in the ring.
+            self._skip(max(sequence + 1, self._published() - capacity))
+        return events
+
+    def wait(self, timeout: float = None, spin: int = 100, max_sleep: float = 0.005) -> bool:
+        """Wait until new records are published, returns False when ``timeout`` passed first.
+
+        Polls the published count, spinning briefly before backing off to sleeps of up to ``max_sleep``
+        seconds, so an idle subscriber costs next to nothing and a busy one reacts quickly.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = 0.00005
+        for _ in range(spin):
+            if self._published() != self.cursor:
+                return True
+        while self._published() == self.cursor:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                sleep = min(sleep, remaining)
+            time.sleep(sleep)
+            sleep = min(sleep * 2, max_sleep)
+        return True
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer = None
+            self._memory.close()
+
+    def _published(self) -> int:
+        return SEQUENCE.unpack_from(self._buffer, PUBLISHED_OFFSET)[0]
+
+    def _skip(self, cursor: int):
+        self.lost += cursor - self.cursor
+        self.cursor = cursor
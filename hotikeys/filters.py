@@ -0,0 +1,109 @@
+"""Declarative event filters for ``Hotkey(where=...)``.
+
+A filter is a predicate over a handful of features of an event: its device and the injected,
+extended and alt flags. The dispatcher computes the features of an event once, from the raw hook
+flags, as a small int. Each filter is compiled to a truth table over all feature values, so
+combining filters with ``&``, ``|`` and ``~`` combines their tables and testing an event is a bit
+lookup::
+
+    Hotkey(on_key, Key.A, where=Injected(False) & Device.Keyboard)
+
+Lookups in the dispatch index are cached per feature value, so hotkeys that a filter rejects are
+dropped from the candidates once, not tested on every event.
+"""
+from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
+
+KEYBOARD = 0x01
+MOUSE = 0x02
+INJECTED = 0x04
+LOWER_IL_INJECTED = 0x08
+EXTENDED = 0x10
+ALTDOWN = 0x20
+
+FEATURES = 0x40
+ALL = (1 << FEATURES) - 1
+
+
+class Filter(object):
+    """A predicate over event features, stored as a truth table with a bit per feature value."""
+    __slots__ = ('table', 'name')
+
+    def __init__(self, table: int, name: str):
+        self.table = table  # type: int
+        self.name = name  # type: str
+
+    @classmethod
+    def of(cls, feature: int, name: str, value: bool = True) -> 'Filter':
+        """The filter that passes events with a feature bit set, or cleared when ``value`` is false."""
+        table = sum(1 << features for features in range(FEATURES) if features & feature)
+        if not value:
+            return cls(ALL & ~table, '{}(False)'.format(name))
+        return cls(table, name)
+
+    def __and__(self, other: 'Filter') -> 'Filter':
+        return Filter(self.table & other.table, '({} & {})'.format(self.name, other.name))
+
+    def __or__(self, other: 'Filter') -> 'Filter':
+        return Filter(self.table | other.table, '({} | {})'.format(self.name, other.name))
+
+    def __invert__(self) -> 'Filter':
+        return Filter(ALL & ~self.table, '~{}'.format(self.name))
+
+    def __eq__(self, other):
+        return isinstance(other, Filter) and self.table == other.table
+
+    def __hash__(self):
+        return hash(self.table)
+
+    def __repr__(self):
+        return '<{} {}>'.format(type(self).__name__, self.name)
+
+    def __call__(self, features: int) -> bool:
+        return bool(self.table >> features & 1)
+
+    def matches(self, args) -> bool:
+        return self(features_of(args))
+
+
+def Injected(value: bool = True) -> Filter:
+    """Events injected by software, such as ``SendInput``, or the opposite with ``Injected(False)``."""
+    return Filter.of(INJECTED, 'Injected', value)
+
+
+def LowerIntegrityInjected(value: bool = True) -> Filter:
+    """Events injected by a process running at a lower integrity level."""
+    return Filter.of(LOWER_IL_INJECTED, 'LowerIntegrityInjected', value)
+
+
+def Extended(value: bool = True) -> Filter:
+    """Keyboard events of extended keys, such as the right hand Alt and Ctrl keys and the arrow keys."""
+    return Filter.of(EXTENDED, 'Extended', value)
+
+
+def AltDown(value: bool = True) -> Filter:
+    """Keyboard events while Alt is held down."""
+    return Filter.of(ALTDOWN, 'AltDown', value)
+
+
+class Device(object):
+    Keyboard = Filter.of(KEYBOARD, 'Device.Keyboard')
+    Mouse = Filter.of(MOUSE, 'Device.Mouse')
+
+
+def keyboard_features(flags: int) -> int:
+    """The features of a keyboard event from the flags of its hook struct."""
+    return (KEYBOARD | (flags & 0x10) >> 2 | (flags & 0x02) << 2 | (flags & 0x01) << 4 | flags & 0x20)
+
+
+def mouse_features(flags: int) -> int:
+    """The features of a mouse event from the flags of its hook struct."""
+    return MOUSE | (flags & 0x03) << 2
+
+
+def features_of(args) -> int:
+    """The features of decoded event args, for events that didn't come through the hooks."""
+    if isinstance(args, LowLevelKeyboardArgs):
+        return keyboard_features(args.lparam[2] or 0)
+    if isinstance(args, LowLevelMouseArgs):
+        return mouse_features(args.lparam[3] or 0)
+    return 0
@@ -0,0 +1,309 @@
+import math
+import threading
+from array import array
+from operator import sub
+from time import perf_counter
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from hotikeys.enums import EventId, ExecutionMode, Key, KeyState
+from hotikeys.executor import HandlerThread
+from hotikeys.hotkey import Hotkey, EventArgs, _inspect_handler
+
+_Points = Sequence[Tuple[float, float]]
+
+
+class StrokeBuffer(object):
+    """A preallocated ring buffer of the positions of a stroke.
+
+    Samples closer than ``min_distance`` pixels to the previous one are skipped. Once ``capacity``
+    samples are recorded the oldest are overwritten, so a stroke never allocates while it's recorded.
+    """
+
+    def __init__(self, capacity: int = 2048, min_distance: int = 2):
+        self.capacity = capacity  # type: int
+        self.min_distance = min_distance  # type: int
+        self.xs = array('i', bytes(4 * capacity))  # type: array
+        self.ys = array('i', bytes(4 * capacity))  # type: array
+        self.start = 0  # type: int
+        self.count = 0  # type: int
+        self._min_distance2 = min_distance * min_distance  # type: int
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.start = self.count = 0
+
+    def add(self, x: int, y: int):
+        count, capacity = self.count, self.capacity
+        if count:
+            last = (self.start + count - 1) % capacity
+            dx, dy = x - self.xs[last], y - self.ys[last]
+            if dx * dx + dy * dy < self._min_distance2:
+                return
+        if count < capacity:
+            index = (self.start + count) % capacity
+            self.count = count + 1
+        else:
+            index = self.start
+            self.start = (self.start + 1) % capacity
+        self.xs[index] = x
+        self.ys[index] = y
+
+    def points(self) -> Tuple[array, array]:
+        """Return copies of the recorded x and y positions in order."""
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.xs[self.start:end], self.ys[self.start:end]
+        end -= self.capacity
+        return self.xs[self.start:] + self.xs[:end], self.ys[self.start:] + self.ys[:end]
+
+
+class GestureTemplate(object):
+    """A named stroke shape, normalized the same way as the strokes it's matched against."""
+
+    def __init__(self, name: str, points: _Points, samples: int = 32):
+        self.name = name  # type: str
+        self.samples = samples  # type: int
+        self.xs = array('d', bytes(8 * samples))  # type: array
+        self.ys = array('d', bytes(8 * samples))  # type: array
+        if not normalize(array('d', (x for x, _ in points)), array('d', (y for _, y in points)), self.xs, self.ys):
+            raise ValueError('expected a template with some extent for points, received: {0!r}'.format(points))
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(type(self).__name__, self.name)
+
+
+def line(dx: float, dy: float) -> _Points:
+    """The points of a straight stroke in the direction (dx, dy), in screen coordinates (y points down)."""
+    return [(dx * i / 8, dy * i / 8) for i in range(9)]
+
+
+def circle(clockwise: bool = True, start: float = -math.pi / 2) -> _Points:
+    """The points of a circle starting at the top, clockwise as seen on screen."""
+    step = (1 if clockwise else -1) * 2 * math.pi / 32
+    return [(math.cos(start + step * i), math.sin(start + step * i)) for i in range(33)]
+
+
+TEMPLATES = {
+    'left': line(-1, 0),
+    'right': line(1, 0),
+    'up': line(0, -1),
+    'down': line(0, 1),
+    'circle': circle(True),
+    'counter_circle': circle(False),
+}
+
+
+def normalize(xs: array, ys: array, out_xs: array, out_ys: array) -> bool:
+    """Resample a stroke into ``out_xs``/``out_ys`` at equal distances along its path, centered on its
+    centroid and uniformly scaled to a unit bounding box. Returns False for strokes without extent.
+
+    Strokes aren't rotated or stretched, so direction and aspect ratio tell gestures apart.
+    """
+    samples = len(out_xs)
+    count = len(xs)
+    if count < 2:
+        return False
+    length = sum(map(math.hypot, map(sub, xs[1:], xs[:-1]), map(sub, ys[1:], ys[:-1])))
+    size = max(max(xs) - min(xs), max(ys) - min(ys))
+    if not length or not size:
+        return False
+
+    step = length / (samples - 1)
+    out_xs[0], out_ys[0] = xs[0], ys[0]
+    filled = 1
+    travelled = 0.0
+    px, py = xs[0], ys[0]
+    i = 1
+    while i < count and filled < samples:
+        x, y = xs[i], ys[i]
+        segment = math.hypot(x - px, y - py)
+        if segment and travelled + segment >= step:
+            t = (step - travelled) / segment
+            px, py = px + t * (x - px), py + t * (y - py)
+            out_xs[filled], out_ys[filled] = px, py
+            filled += 1
+            travelled = 0.0
+        else:
+            travelled += segment
+            px, py = x, y
+            i += 1
+    while filled < samples:
+        out_xs[filled], out_ys[filled] = xs[-1], ys[-1]
+        filled += 1
+
+    cx, cy = sum(out_xs) / samples, sum(out_ys) / samples
+    for i in range(samples):
+        out_xs[i] = (out_xs[i] - cx) / size
+        out_ys[i] = (out_ys[i] - cy) / size
+    return True
+
+
+def distance(xs: array, ys: array, template: GestureTemplate) -> float:
+    """The mean distance between the points of a normalized stroke and a template."""
+    return sum(map(math.hypot, map(sub, xs, template.xs), map(sub, ys, template.ys))) / len(xs)
+
+
+class GestureMatch(object):
+    """The args passed to gesture handlers."""
+    __slots__ = ('gesture', 'distance', 'samples')
+
+    def __init__(self, gesture, distance, samples):
+        self.gesture = gesture  # type: Gesture
+        self.distance = distance  # type: float
+        self.samples = samples  # type: int
+
+    @property
+    def name(self) -> str:
+        return self.gesture.template.name
+
+
+class Gesture(object):
+    """Binds a handler to a stroke drawn while a mouse button is held, the way ``Hotkey`` binds keys.
+
+    ``template`` is a ``GestureTemplate``, the name of one of ``TEMPLATES`` or a list of points. The
+    handler fires when the template is the closest match of a stroke and its mean distance to the
+    normalized stroke is below ``threshold``.
+    """
+
+    def __init__(self,
+                 handler: Callable[[GestureMatch], None],
+                 template: Union[str, GestureTemplate, _Points],
+                 button: Union[int, Key] = Key.RButton,
+                 *,
+                 threshold: float = 0.2,
+                 recognizer: 'GestureRecognizer' = None):
+        self.handler = handler  # type: Callable[[GestureMatch], None]
+        self.threshold = threshold  # type: float
+        self.recognizer = recognizer or GestureRecognizer.for_class(Hotkey, button)  # type: GestureRecognizer
+        if isinstance(template, str):
+            template = GestureTemplate(template, TEMPLATES[template], self.recognizer.samples)
+        elif not isinstance(template, GestureTemplate):
+            template = GestureTemplate('custom', template, self.recognizer.samples)
+        if template.samples != self.recognizer.samples:
+            raise ValueError('expected a template with {0} samples, received: {1}'
+                             .format(self.recognizer.samples, template.samples))
+        self.template = template  # type: GestureTemplate
+        self._handler_takes_args = _inspect_handler(handler)[0]  # type: bool
+        self.recognizer.add(self)
+
+    def __call__(self, match: GestureMatch):
+        if self._handler_takes_args:
+            self.handler(match)
+        else:
+            self.handler()
+
+    def unregister(self):
+        self.recognizer.remove(self)
+
+
+class GestureRecognizer(object):
+    """Records the strokes drawn while ``button`` is held and matches them against the registered gestures.
+
+    Mouse moves are only subscribed to while the button is held, and recorded into a ``StrokeBuffer``.
+    When the button is released the stroke is copied out and matched, on a worker thread unless
+    ``execution`` is ``ExecutionMode.Inline``. Matching stops comparing templates once ``budget``
+    seconds have passed, going with the best match so far. Strokes shorter than ``min_length`` pixels
+    are clicks, not gestures.
+    """
+    _recognizers = {}  # type: Dict[Tuple[Type[Hotkey], int], GestureRecognizer]
+
+    def __init__(self,
+                 hotkey_class: Type[Hotkey] = Hotkey,
+                 button: Union[int, Key] = Key.RButton,
+                 *,
+                 samples: int = 32,
+                 capacity: int = 2048,
+                 min_length: float = 30.0,
+                 budget: float = 0.002,
+                 execution: ExecutionMode = ExecutionMode.DedicatedThread):
+        self.hotkey_class = hotkey_class  # type: Type[Hotkey]
+        self.button = int(button)  # type: int
+        self.samples = samples  # type: int
+        self.min_length = min_length  # type: float
+        self.budget = budget  # type: float
+        self.gestures = ()  # type: Tuple[Gesture, ...]
+        self.stroke = StrokeBuffer(capacity)  # type: StrokeBuffer
+        self.executor = HandlerThread(hotkey_class.max_queued) if execution is not ExecutionMode.Inline else None
+        self.button_hotkey = None  # type: Hotkey
+        self.move_hotkey = None  # type: Hotkey
+        self._xs = array('d', bytes(8 * samples))  # type: array
+        self._ys = array('d', bytes(8 * samples))  # type: array
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_class(cls, hotkey_class: Type[Hotkey], button: Union[int, Key] = Key.RButton) -> 'GestureRecognizer':
+        """Return the recognizer shared by the gestures of a hotkey class and trigger button."""
+        key = hotkey_class, int(button)
+        recognizer = cls._recognizers.get(key)
+        if recognizer is None:
+            recognizer = cls._recognizers[key] = cls(hotkey_class, button)
+        return recognizer
+
+    def add(self, gesture: Gesture):
+        self.gestures += (gesture,)
+        if self.button_hotkey is None:
+            self.move_hotkey = self.hotkey_class(self._on_move, events=EventId.WM_MOUSEMOVE,
+                                                 execution=ExecutionMode.Inline, register=False)
+            self.button_hotkey = self.hotkey_class(self._on_button, self.button, events=(KeyState.Down, KeyState.Up),
+                                                   execution=ExecutionMode.Inline)
+        else:
+            self.button_hotkey.register()
+
+    def remove(self, gesture: Gesture):
+        self.gestures = tuple(other for other in self.gestures if other is not gesture)
+        if not self.gestures and self.button_hotkey is not None:
+            self.button_hotkey.unregister()
+            self.move_hotkey.unregister()
+
+    def match(self, xs: Iterable[float], ys: Iterable[float]) -> Optional[GestureMatch]:
+        """Match a stroke against the gestures, returns the best match below its threshold if any."""
+        xs, ys = array('d', xs), array('d', ys)
+        length = sum(map(math.hypot, map(sub, xs[1:], xs[:-1]), map(sub, ys[1:], ys[:-1])))
+        if length < self.min_length:
+            return None
+        # The resample buffers are reused, matches on the worker thread and inline ones take turns.
+        with self._lock:
+            if not normalize(xs, ys, self._xs, self._ys):
+                return None
+            deadline = perf_counter() + self.budget
+            best, best_distance = None, math.inf
+            for gesture in self.gestures:
+                gesture_distance = distance(self._xs, self._ys, gesture.template)
+                if gesture_distance < best_distance and gesture_distance < gesture.threshold:
+                    best, best_distance = gesture, gesture_distance
+                if perf_counter() > deadline:
+                    break
+        if best is None:
+            return None
+        return GestureMatch(best, best_distance, len(xs))
+
+    def _on_button(self, args: EventArgs):
+        if args.event.state is KeyState.Down:
+            self.stroke.clear()
+            self.stroke.add(args.x, args.y)
+            self.move_hotkey.register()
+            return
+        self.stroke.add(args.x, args.y)
+        self.move_hotkey.unregister()
+        xs, ys = self.stroke.points()
+        if self.executor is None:
+            self._recognize(xs, ys)
+        else:
+            self.executor.submit(self, self._recognize, (xs, ys))
+
+    def _on_move(self, args: EventArgs):
+        self.stroke.add(args.x, args.y)
+
+    def _recognize(self, xs, ys):
+        match = self.match(xs, ys)
+        if match is not None:
+            match.gesture(match)
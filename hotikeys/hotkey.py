@@ -1,15 +1,24 @@
-from inspect import signature
+import weakref
+from types import FunctionType
 from typing import Callable, Iterable
 from typing import Union
 
+from hotikeys.coalesce import MouseCoalescer
 from hotikeys.core import HotkeyCore
-from hotikeys.enums import KeyState, Key, EventId
-from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
+from hotikeys.customtypes import KeyMask
+from hotikeys.dispatch import MOVE_EVENTS
+from hotikeys.enums import KeyState, Key, EventId, ExecutionMode, RepeatPolicy
+from hotikeys.executor import HandlerExecutor, HandlerThread
+from hotikeys.filters import Filter, ALL, features_of
+from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs, RawEvent
+from hotikeys.regions import Region
 
 EventArgs = Union[LowLevelKeyboardArgs, LowLevelMouseArgs]
 _HandlerArg = Callable[[EventArgs], None]
 _KeyArg = Union[int, Key]
 _EventArg = Union[int, EventId, KeyState]
+_ExecutionArg = Union[str, ExecutionMode]
+_RepeatArg = Union[str, RepeatPolicy, float]
 
 
 class Hotkey(HotkeyCore):
@@ -17,17 +26,45 @@ class Hotkey(HotkeyCore):
                  handler: _HandlerArg,
                  key: _KeyArg = None,
                  modifiers: Union[_KeyArg, Iterable[_KeyArg], None] = None,
-                 events: Union[_EventArg, Iterable[_EventArg], None] = KeyState.Down):
+                 events: Union[_EventArg, Iterable[_EventArg], None] = KeyState.Down,
+                 *,
+                 execution: _ExecutionArg = None,
+                 loop: 'asyncio.AbstractEventLoop' = None,
+                 coalesce: float = None,
+                 repeat: _RepeatArg = None,
+                 where: Filter = None,
+                 region: Region = None,
+                 raw: bool = False,
+                 weak: bool = False,
+                 register: bool = True):
         self._handler = None  # type: _HandlerArg
+        self._weak = weak  # type: bool
+        self._raw = raw  # type: bool
         self._key = None  # type:
         self._modifiers = ()  # type: Iterable[int]
+        self._modifier_mask = 0  # type: int
         self._events = ()  # type: Iterable[int]
         self._handler_takes_args = None  # type: bool
+        self._handler_is_async = False  # type: bool
+        self._execution = None  # type: ExecutionMode
+        self._pinned = False  # type: bool
+        self._executor = None  # type: HandlerExecutor
+        self._coalescer = None  # type: MouseCoalescer
+        self._repeat = None  # type: RepeatPolicy
+        self._repeat_interval = 0.0  # type: float
+        self._next_repeat = 0.0  # type: float
+        self._where = None  # type: Filter
 
-        self.handler = handler
+        self.loop = loop  # type: asyncio.AbstractEventLoop
+        self.execution = execution
+        self.coalesce = coalesce
+        self.repeat = repeat
+        self.where = where
+        self.region = region
         self.key = key
         self.modifiers = modifiers
         self.events = events
+        self.handler = handler
 
     def on_event(self, args):
         if not isinstance(args, (LowLevelKeyboardArgs, LowLevelMouseArgs)):
@@ -35,24 +72,104 @@ class Hotkey(HotkeyCore):
                             ' for args, got {0}'.format(type(args)))
 
         if not self._match_key(args): return
-        if not self._match_modifiers(): return
         if not self._match_events(args): return
-        if self._handler_takes_args:
-            self.handler(args)
+        if not self._filter >> features_of(args) & 1: return
+        if not self._match_region(args): return
+        self._dispatch(args)
+
+    def _dispatch(self, args, repeat=False):
+        if not self._match_modifiers(): return False
+        if repeat and not self._accept_repeat(): return False
+        self._invoke(_raw_event(args) if self._raw else args)
+        return True
+
+    def _dispatch_raw(self, vkey, code, lparam, mouse, repeat=False):
+        if not self._match_modifiers(): return False
+        if repeat and not self._accept_repeat(): return False
+        if mouse:
+            flags, time = lparam[3] or 0, lparam[4] or 0
         else:
-            self.handler()
+            flags, time = lparam[2] or 0, lparam[3] or 0
+        if (self._executor is None and self.instrumentation is None and self.watchdog is None
+                and not self._handler_is_async):
+            # Nothing needs the event as one object, pass the ints straight on.
+            handler = self.handler
+            if handler is not None:
+                handler(vkey, code, flags, time)
+        else:
+            self._invoke(RawEvent(vkey, code, flags, time))
+        return True
+
+    def _accept_repeat(self) -> bool:
+        policy = self._repeat
+        if policy is RepeatPolicy.Suppress:
+            return False
+        if policy is RepeatPolicy.Pass:
+            return True
+        now = type(self).clock()
+        if now < self._next_repeat:
+            return False
+        self._next_repeat = now + self._repeat_interval
+        return True
 
     def on_mouse(self, args):
         if not self._match_events(args, False): return
-        self.handler(args)
+        if self._coalescer is not None:
+            args = self._coalescer.add(args)
+            if args is None: return
+        self._invoke_mouse(args)
+
+    def _flush_mouse(self):
+        if self._coalescer is not None:
+            for args in self._coalescer.flush():
+                self._invoke_mouse(args)
+
+    def _invoke_mouse(self, args):
+        self._invoke(_raw_event(args) if self._raw else args)
+
+    def _invoke(self, args):
+        if self._executor is None:
+            self._call(args)
+        else:
+            self._executor.submit(self, self._call, (args,))
+
+    def _call(self, args):
+        run = self._run_handler if self.watchdog is None else self._run_watched
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            source = self.source
+            return instrumentation.time_handler(self, run, args,
+                                                source.time_ms() if source is not None else None)
+        run(args)
+
+    def _run_watched(self, args):
+        watchdog = self.watchdog
+        if watchdog is not None:
+            watchdog.run(self, self._run_handler, args)
+        else:
+            self._run_handler(args)
+
+    def _run_handler(self, args):
+        handler = self.handler
+        if handler is None:
+            return
+        if self._raw:
+            result = handler(*args)
+        else:
+            result = handler(args) if self._handler_takes_args else handler()
+        if self._handler_is_async:
+            self.loop.call_soon_threadsafe(self.loop.create_task, result)
 
     def _match_key(self, args, implicit=True) -> bool:
         if self.key is None and implicit: return True
         return self.key == args.vkey
 
     def _match_modifiers(self, implicit=True) -> bool:
-        if not self.modifiers and implicit: return True
-        return all(self.is_pressed(key) for key in self.modifiers)
+        return self._pressed.mask & self._modifier_mask == self._modifier_mask
+
+    def _match_region(self, args) -> bool:
+        if self._region is None or not isinstance(args, LowLevelMouseArgs): return True
+        return self._region.contains(args.x, args.y)
 
     def _match_events(self, args, implicit=True) -> bool:
         if not self.events and implicit: return True
@@ -62,16 +179,169 @@ class Hotkey(HotkeyCore):
         if int(args.event.state) in self.events: return True
         return False
 
+    def _dispatch_keys(self):
+        if getattr(self, '_handler', None) is None:
+            return ()
+        if not self._events:
+            return (self._key, None),
+        return tuple((None if event in MOVE_EVENTS else self._key, event) for event in self._events)
+
+    def _reindex(self):
+        self._table.update(self)
+
+    def _unregistered(self):
+        super()._unregistered()
+        if isinstance(self._executor, HandlerThread):
+            self._executor.close()
+
+    def _handler_collected(self, ref):
+        if self._handler is ref:
+            self.unregister()
+
     @property
     def handler(self) -> _HandlerArg:
+        """The handler, ``None`` once a weakly held handler was garbage collected."""
+        if self._weak:
+            return self._handler()
         return self._handler
 
     @handler.setter
     def handler(self, handler):
         if not callable(handler):
             raise TypeError('expected callable for handler, received: {0}'.format(type(handler)))
-        self._handler_takes_args = bool(len(signature(handler).parameters))
-        self._handler = handler
+        self._handler_takes_args, self._handler_is_async = _inspect_handler(handler)
+        if self._handler_is_async and self.loop is None:
+            self.loop = _default_loop()
+        if not self._weak:
+            self._handler = handler
+        elif hasattr(handler, '__self__') and hasattr(handler, '__func__'):
+            self._handler = weakref.WeakMethod(handler, self._handler_collected)
+        else:
+            self._handler = weakref.ref(handler, self._handler_collected)
+        self._reindex()
+
+    @property
+    def weak(self) -> bool:
+        """Whether the handler is held weakly, the hotkey unregisters itself when the handler is collected."""
+        return self._weak
+
+    @property
+    def raw(self) -> bool:
+        """Whether the handler is called with the plain ints ``(vkey, event, flags, time)`` instead of event args."""
+        return self._raw
+
+    @property
+    def execution(self) -> ExecutionMode:
+        return self._execution
+
+    @execution.setter
+    def execution(self, execution):
+        explicit = execution is not None
+        if execution is None:
+            execution = self.default_execution
+        if not isinstance(execution, ExecutionMode):
+            mode = ExecutionMode[execution]
+            if mode is None:
+                raise ValueError('expected ExecutionMode or one of {0}'
+                                 ' for execution, received: {1!r}'
+                                 .format([mode.value for mode in ExecutionMode], execution))
+            execution = mode
+        executor = self._executor
+        if execution is ExecutionMode.ThreadPool:
+            self._executor = self.handler_pool()
+        elif execution is ExecutionMode.DedicatedThread:
+            if not isinstance(executor, HandlerThread):
+                self._executor = HandlerThread(self.max_queued)
+        else:
+            self._executor = None
+        if isinstance(executor, HandlerThread) and executor is not self._executor:
+            executor.close()
+        self._execution = execution
+        self._pinned = explicit and execution is ExecutionMode.Inline
+
+    @property
+    def pinned(self) -> bool:
+        """Whether the handler was explicitly made inline, the watchdog doesn't move it off the hook thread."""
+        return self._pinned
+
+    @property
+    def executor(self) -> HandlerExecutor:
+        """The executor that runs the handler, ``None`` when it runs inline on the hook thread."""
+        return self._executor
+
+    @property
+    def coalesce(self) -> float:
+        """The interval in seconds over which mouse move and wheel events are merged, see ``MouseCoalescer``."""
+        return self._coalescer and self._coalescer.interval
+
+    @coalesce.setter
+    def coalesce(self, interval):
+        if interval:
+            self._coalescer = MouseCoalescer(interval, self._invoke_mouse)
+        else:
+            self._coalescer = None
+
+    @property
+    def repeat(self) -> RepeatPolicy:
+        """What happens to key down events of a held key, see ``RepeatPolicy`` and ``repeat_rate``."""
+        return self._repeat
+
+    @repeat.setter
+    def repeat(self, repeat):
+        if repeat is None:
+            repeat = RepeatPolicy.Suppress if self.no_repeat else RepeatPolicy.Pass
+        elif isinstance(repeat, (int, float)) and not isinstance(repeat, bool):
+            self.repeat_rate = repeat
+            repeat = RepeatPolicy.Throttle
+        elif not isinstance(repeat, RepeatPolicy):
+            policy = RepeatPolicy[repeat]
+            if policy is None:
+                raise ValueError('expected RepeatPolicy, one of {0} or a rate in Hz'
+                                 ' for repeat, received: {1!r}'
+                                 .format([policy.value for policy in RepeatPolicy], repeat))
+            repeat = policy
+        if repeat is RepeatPolicy.Throttle and not self._repeat_interval:
+            raise ValueError('expected a repeat rate for RepeatPolicy.Throttle, pass the rate in Hz as repeat')
+        self._repeat = repeat
+
+    @property
+    def repeat_rate(self) -> float:
+        """The rate in Hz that repeats are throttled to with ``RepeatPolicy.Throttle``."""
+        return 1 / self._repeat_interval if self._repeat_interval else 0.0
+
+    @repeat_rate.setter
+    def repeat_rate(self, rate):
+        if rate <= 0:
+            raise ValueError('expected a positive rate in Hz for repeat_rate, received: {0!r}'.format(rate))
+        self._repeat_interval = 1 / rate
+
+    @property
+    def where(self) -> Filter:
+        """The filter events have to pass to reach the hotkey, see ``hotikeys.filters``."""
+        return self._where
+
+    @where.setter
+    def where(self, where):
+        if where is not None and not isinstance(where, Filter):
+            raise TypeError('expected Filter for where, received: {0}'.format(type(where)))
+        table = ALL if where is None else where.table
+        self._where = where
+        if table != self._filter:
+            self._filter = table
+            if self.registered:
+                self._table.invalidate()
+
+    @property
+    def region(self) -> Region:
+        """The screen region mouse events have to be in to reach the hotkey, see ``hotikeys.regions``."""
+        return self._region
+
+    @region.setter
+    def region(self, region):
+        if region is not None and not isinstance(region, Region):
+            raise TypeError('expected Region for region, received: {0}'.format(type(region)))
+        self._region = region
+        self._file_region()
 
     @property
     def key(self) -> int:
@@ -83,6 +353,7 @@ class Hotkey(HotkeyCore):
             self._key = int(key)
         else:
             self._key = None
+        self._reindex()
 
     @property
     def modifiers(self) -> Iterable[int]:
@@ -99,6 +370,7 @@ class Hotkey(HotkeyCore):
             self._modifiers = tuple(int(modifier) for modifier in modifiers)
         else:
             self._modifiers = ()
+        self._modifier_mask = int(KeyMask.of(self._modifiers))
 
     @property
     def events(self) -> Iterable[int]:
@@ -115,6 +387,46 @@ class Hotkey(HotkeyCore):
             self._events = tuple(int(event) for event in events)
         else:
             self._events = ()
+        self._reindex()
+
+
+def _raw_event(args) -> RawEvent:
+    return RawEvent(args.vkey, args.wparam, int(args.flags), args.time)
+
+
+_inspected = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+
+
+def _inspect_handler(handler):
+    """Return whether the handler takes the event args and whether it's a coroutine function.
+
+    Results are kept per function, so binding the same function or method many times inspects it once.
+    """
+    function = getattr(handler, '__func__', None)
+    bound = function is not None
+    if not bound:
+        function = handler if isinstance(handler, FunctionType) else None
+    if function is not None:
+        try:
+            return _inspected[function][bound]
+        except KeyError:
+            pass
+    # inspect and asyncio are imported on first use, together they'd double the import time of hotikeys
+    from inspect import signature, iscoroutinefunction
+    result = bool(len(signature(handler).parameters)), iscoroutinefunction(handler)
+    if function is not None:
+        _inspected.setdefault(function, {})[bound] = result
+    return result
+
+
+def _default_loop():
+    """The running event loop, a loop that isn't running yet would never run the scheduled handlers."""
+    import asyncio
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError('no running event loop for async handlers, create the hotkey'
+                           ' from a coroutine or pass the loop as loop=') from None
 
 
 def newhotkey(key=None, modifiers=None, events=KeyState.Down):
@@ -5,9 +5,10 @@ from typing import Iterable
 from hotikeys import Hotkey
 from hotikeys import Key
 from hotikeys import KeyState
+from hotikeys.enums import ExecutionMode
+from hotikeys.exceptions import BlockNextHookException
 from hotikeys.hotkey import EventArgs
 from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
-from hotikeys.windowshook import BlockNextHookException
 
 log = logging.getLogger(__name__)
 EventHandler = Callable[[Union[LowLevelKeyboardArgs, LowLevelMouseArgs]], Optional[bool]]
@@ -44,11 +45,19 @@ class Keybind(object):
             raise BlockNextHookException
 
     def hook(self):
+        if self.hotkey is not None:
+            self.hotkey.register()
+            return
         self.hotkey = Hotkey(
             handler=self.on_event,
             key=self.key,
             modifiers=self.modifiers,
-            events=(KeyState.Down, KeyState.Up))
+            events=(KeyState.Down, KeyState.Up),
+            execution=ExecutionMode.Inline)
+
+    def unhook(self):
+        if self.hotkey is not None:
+            self.hotkey.unregister()
 
     @property
     def key(self) -> int:
@@ -5,6 +5,7 @@ from typing import Union
 
 from hotikeys import Hotkey
 from hotikeys import KeyState
+from hotikeys.enums import ExecutionMode
 from hotikeys.lleventargs import LowLevelKeyboardArgs
 from hotikeys.lleventargs import LowLevelMouseArgs
 
@@ -47,11 +48,19 @@ class KeybindProperty(property):
         self.value = press if value is None else value
 
     def hook(self):
+        if self.hotkey is not None:
+            self.hotkey.register()
+            return
         self.hotkey = Hotkey(
             handler=self.on_event,
             key=self.key,
             modifiers=self.modifiers,
-            events=(KeyState.Down, KeyState.Up))
+            events=(KeyState.Down, KeyState.Up),
+            execution=ExecutionMode.Inline)
+
+    def unhook(self):
+        if self.hotkey is not None:
+            self.hotkey.unregister()
 
     def presser(self, handler):
         self.on_press = handler
@@ -0,0 +1,82 @@
+import threading
+from array import array
+from heapq import heappop, heappush
+from typing import List
+from typing import Tuple
+
+from hotikeys.customtypes import KeyMask
+
+
+class KeyStateTable(object):
+    """Fixed-size table of pressed keys, kept as a bitmask plus an array of expiry times.
+
+    Expiry is tracked with a min-heap that holds at most one entry per key. Refreshing a held key only
+    updates the expiry array; a popped entry whose key was refreshed in the meantime is pushed back.
+
+    The keyboard and mouse hooks write from their own threads, so writes are serialized by a lock.
+    Readers use ``mask``, which is replaced as a whole and can be read without locking.
+
+    ``changed`` holds the time of the last accepted transition per key, for debouncing.
+    """
+    size = KeyMask.size
+
+    def __init__(self):
+        self.mask = 0  # type: int
+        self.expiry = array('d', bytes(8 * self.size))  # type: array
+        self.changed = array('d', [float('-inf')]) * self.size  # type: array
+        self._queued = bytearray(self.size)  # type: bytearray
+        self._heap = []  # type: List[Tuple[float, int]]
+        self._next = float('inf')  # type: float
+        self._lock = threading.Lock()
+
+    def __contains__(self, vkey):
+        return 0 <= vkey < self.size and bool(self.mask >> vkey & 1)
+
+    def __len__(self):
+        return len(KeyMask(self.mask))
+
+    def press(self, vkey, expiry):
+        if 0 <= vkey < self.size:
+            with self._lock:
+                self.expiry[vkey] = expiry
+                self.mask |= 1 << vkey
+                if not self._queued[vkey]:
+                    self._queued[vkey] = 1
+                    heappush(self._heap, (expiry, vkey))
+                    self._next = self._heap[0][0]
+
+    def bounced(self, vkey, now, window, press=True) -> bool:
+        """Whether a transition comes within ``window`` seconds of the key's last accepted one, records it if not.
+
+        The release of a pressed key is never bounced, dropping it would leave the key held down.
+        """
+        if not 0 <= vkey < self.size:
+            return False
+        if now - self.changed[vkey] < window and (press or not self.mask >> vkey & 1):
+            return True
+        self.changed[vkey] = now
+        return False
+
+    def release(self, vkey):
+        if 0 <= vkey < self.size:
+            with self._lock:
+                self.mask &= ~(1 << vkey)
+
+    def purge(self, now):
+        if self._next >= now:
+            return
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] < now:
+                _, vkey = heappop(heap)
+                if not self.mask >> vkey & 1:
+                    self._queued[vkey] = 0
+                elif self.expiry[vkey] >= now:
+                    heappush(heap, (self.expiry[vkey], vkey))
+                else:
+                    self._queued[vkey] = 0
+                    self.mask &= ~(1 << vkey)
+            self._next = heap[0][0] if heap else float('inf')
+
+    def snapshot(self) -> KeyMask:
+        return KeyMask(self.mask)
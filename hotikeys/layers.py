@@ -0,0 +1,230 @@
+import threading
+from typing import Dict
+from typing import Iterable
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from hotikeys.dispatch import DispatchTable, MOVE_EVENTS
+from hotikeys.enums import KeyState, ExecutionMode
+from hotikeys.filters import features_of
+from hotikeys.hotkey import Hotkey, EventArgs, _HandlerArg, _KeyArg, _EventArg
+from hotikeys.lleventargs import LowLevelMouseArgs
+
+_LayerArg = Union[str, 'Layer']
+
+
+class _LayerTable(DispatchTable):
+    def __init__(self, layer):
+        super().__init__()
+        self.layer = layer  # type: Layer
+
+    def _published(self):
+        if self.layer.keymap is not None:
+            self.layer.keymap._reindex()
+
+
+class Layer(object):
+    """A named set of bindings compiled into its own dispatch table.
+
+    The bindings of a layer only fire while the layer is active on a ``Keymap``. With ``fallthrough``
+    events that no binding of the layer matches continue to the layers below it, otherwise the layer
+    hides everything below it.
+    """
+
+    def __init__(self, name: str, *, fallthrough: bool = True, hotkey_class: Type[Hotkey] = Hotkey):
+        self.name = name  # type: str
+        self.fallthrough = fallthrough  # type: bool
+        self.hotkey_class = hotkey_class  # type: Type[Hotkey]
+        self.keymap = None  # type: Keymap
+        self.table = _LayerTable(self)  # type: DispatchTable
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(type(self).__name__, self.name)
+
+    def __contains__(self, hotkey):
+        return hotkey in self.table
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+    def bind(self,
+             handler: _HandlerArg,
+             key: _KeyArg = None,
+             modifiers: Union[_KeyArg, Iterable[_KeyArg], None] = None,
+             events: Union[_EventArg, Iterable[_EventArg], None] = KeyState.Down,
+             **kwargs) -> Hotkey:
+        """Make a hotkey in this layer, takes the same arguments as ``Hotkey``."""
+        hotkey = self.hotkey_class(handler, key, modifiers, events, register=False, **kwargs)
+        self.add(hotkey)
+        return hotkey
+
+    def add(self, *hotkeys: Hotkey):
+        """Move hotkeys into this layer, out of the class registry or another layer."""
+        with self.table.batch():
+            for hotkey in hotkeys:
+                if hotkey._table is not self.table:
+                    hotkey._table.remove(hotkey)
+                    hotkey._table = self.table
+            self.table.add_many(hotkeys)
+        for hotkey in hotkeys:
+            hotkey._file_region()
+
+    def remove(self, *hotkeys: Hotkey):
+        Hotkey.unregister_many(hotkey for hotkey in hotkeys if hotkey._table is self.table)
+
+    @property
+    def active(self) -> bool:
+        return self.keymap is not None and self in self.keymap.active
+
+
+class Keymap(object):
+    """A stack of layers, dispatched from the top down.
+
+    The keymap is a single entry in the dispatch index of its hotkey class, filed under the union of
+    its layers' dispatch keys. An event is looked up in the active layers from the top of the stack and
+    stops at the first layer where a binding matched, or that doesn't fall through. The ``base`` layer
+    is always active at the bottom.
+
+    The active stack is an immutable tuple that is swapped as a whole, so activating and deactivating
+    layers doesn't touch the dispatch tables and inactive layers cost nothing during dispatch.
+    """
+
+    _raw = False
+    _region = None
+
+    def __init__(self, hotkey_class: Type[Hotkey] = Hotkey, *, base: Layer = None):
+        self.hotkey_class = hotkey_class  # type: Type[Hotkey]
+        self.base = base or Layer('base', hotkey_class=hotkey_class)  # type: Layer
+        self.layers = {}  # type: Dict[str, Layer]
+        self._active = (self.base,)  # type: Tuple[Layer, ...]
+        self._lock = threading.Lock()
+        self.add_layer(self.base)
+        hotkey_class._registry.add(self)
+
+    def __getitem__(self, name: str) -> Layer:
+        return self.layers[name]
+
+    @property
+    def active(self) -> Tuple[Layer, ...]:
+        """The active layers, from the top of the stack to the base layer."""
+        return self._active
+
+    def layer(self, name: str, *, fallthrough: bool = True) -> Layer:
+        """Return the layer called ``name``, adding a new one if there is none."""
+        layer = self.layers.get(name)
+        if layer is None:
+            layer = self.add_layer(Layer(name, fallthrough=fallthrough, hotkey_class=self.hotkey_class))
+        return layer
+
+    def add_layer(self, layer: Layer) -> Layer:
+        if layer.keymap is not None and layer.keymap is not self:
+            raise ValueError('{!r} already belongs to another keymap'.format(layer))
+        layer.keymap = self
+        self.layers[layer.name] = layer
+        self._reindex()
+        return layer
+
+    def activate(self, layer: _LayerArg):
+        """Put a layer on top of the stack, does nothing if it's already active."""
+        layer = self._layer(layer)
+        with self._lock:
+            if layer not in self._active:
+                self._active = (layer,) + self._active
+
+    def deactivate(self, layer: _LayerArg):
+        layer = self._layer(layer)
+        if layer is self.base:
+            raise ValueError('the base layer is always active')
+        with self._lock:
+            self._active = tuple(active for active in self._active if active is not layer)
+
+    def toggle(self, layer: _LayerArg) -> bool:
+        """Activate or deactivate a layer, returns whether it's active now."""
+        layer = self._layer(layer)
+        with self._lock:
+            active = layer not in self._active
+            if active:
+                self._active = (layer,) + self._active
+            elif layer is not self.base:
+                self._active = tuple(other for other in self._active if other is not layer)
+        return active
+
+    def switch(self, layer: _LayerArg):
+        """Make a layer the only active layer above the base layer."""
+        layer = self._layer(layer)
+        with self._lock:
+            self._active = (layer, self.base) if layer is not self.base else (self.base,)
+
+    def momentary(self, layer: _LayerArg, key: _KeyArg) -> Hotkey:
+        """Bind ``key`` to activate a layer while it's held down, returns the hotkey of the binding."""
+        layer = self._layer(layer)
+
+        def on_key(args: EventArgs):
+            if args.event.state is KeyState.Down:
+                self.activate(layer)
+            else:
+                self.deactivate(layer)
+
+        return self.hotkey_class(on_key, key, events=(KeyState.Down, KeyState.Up), execution=ExecutionMode.Inline)
+
+    def close(self):
+        """Remove the keymap from the dispatcher."""
+        self.hotkey_class._registry.remove(self)
+
+    def _layer(self, layer: _LayerArg) -> Layer:
+        if isinstance(layer, Layer):
+            if layer.keymap is not self:
+                raise ValueError('{!r} does not belong to this keymap'.format(layer))
+            return layer
+        return self.layers[layer]
+
+    def _reindex(self):
+        self.hotkey_class._registry.update(self)
+
+    def _dispatch_keys(self):
+        keys = []
+        for layer in list(self.layers.values()):
+            keys.extend(layer.table.dispatch_keys())
+        return keys
+
+    def _dispatch(self, args, repeat=False) -> bool:
+        state = None if args.event is None or args.event.state is None else int(args.event.state)
+        features = features_of(args)
+        hits = self._hits(args)
+        matched = False
+        for layer in self._active:
+            for hotkey in layer.table.lookup(args.vkey, args.wparam, state, features):
+                if hits is not None and hotkey._region is not None and hotkey._region not in hits:
+                    continue
+                matched = hotkey._dispatch(args, repeat) or matched
+            if matched or not layer.fallthrough:
+                break
+        return matched
+
+    def on_mouse(self, args):
+        features = features_of(args)
+        hits = self._hits(args)
+        for layer in self._active:
+            hotkeys = layer.table.lookup(None, args.wparam, None, features)
+            for hotkey in hotkeys:
+                if hits is not None and hotkey._region is not None and hotkey._region not in hits:
+                    continue
+                hotkey.on_mouse(args)
+            if hotkeys or not layer.fallthrough:
+                break
+
+    def _hits(self, args):
+        regions = self.hotkey_class._regions
+        if not regions or not isinstance(args, LowLevelMouseArgs):
+            return None
+        return regions.at(args.x, args.y)
+
+    def _flush_mouse(self):
+        for layer in self._active:
+            for code in MOVE_EVENTS:
+                for hotkey in layer.table.lookup(None, code):
+                    hotkey._flush_mouse()
@@ -1,30 +1,60 @@
+from collections import namedtuple
 from typing import Any
 from typing import Tuple
 
 from hotikeys.customtypes import FlagsDword
 from hotikeys.enums import EventId
 
+_UNDECODED = object()
+
 
 class LowLevelEventArgs(object):
+    """Event args decoded lazily from the raw ``(ncode, wparam, lparam)`` of a hook callback.
+
+    The words of ``lparam`` are copied into a tuple when the args are made, as the memory a hook
+    passes is only valid during the callback and args are handed to other threads and kept. Fields
+    are decoded from the copy when accessed, so a handler that doesn't read a field doesn't pay for
+    it. Fields the dispatcher reads repeatedly are decoded once and kept.
+    """
+    __slots__ = ('ncode', 'wparam', 'lparam', '_event')
+
     def __init__(self, ncode, wparam, lparam):
         self.ncode = ncode  # type: int
         self.wparam = wparam  # type: int
-        self.lparam = lparam  # type: Tuple[Any]
+        self.lparam = tuple(lparam[:5])  # type: Tuple[Any]
+        self._event = _UNDECODED  # type: EventId
 
-        self.event = EventId[wparam]  # type: EventId
+    @property
+    def event(self) -> EventId:
+        event = self._event
+        if event is _UNDECODED:
+            event = self._event = EventId[self.wparam]
+        return event
 
 
 class LowLevelKeyboardArgs(LowLevelEventArgs):
+    __slots__ = ('vkey',)
+
     def __init__(self, ncode, wparam, lparam):
         super().__init__(ncode, wparam, lparam)
-
         self.vkey = 0xFFFF & lparam[0]  # type: int
-        self.scan_code = lparam[1]  # type: int
-        self.flags = LowLevelKeyboardFlags(lparam[2] or 0)  # type: LowLevelKeyboardFlags
-        self.time = lparam[3]  # type: int
+
+    @property
+    def scan_code(self) -> int:
+        return self.lparam[1]
+
+    @property
+    def flags(self) -> 'LowLevelKeyboardFlags':
+        return LowLevelKeyboardFlags.of(self.lparam[2] or 0)
+
+    @property
+    def time(self) -> int:
+        return self.lparam[3]
 
 
 class LowLevelKeyboardFlags(FlagsDword):
+    _interned = {}
+
     @property
     def extended(self):
         return self[0]
@@ -47,25 +77,58 @@ class LowLevelKeyboardFlags(FlagsDword):
 
 
 class LowLevelMouseArgs(LowLevelEventArgs):
+    __slots__ = ('_vkey',)
+
     def __init__(self, ncode, wparam, lparam):
         super().__init__(ncode, wparam, lparam)
-        self.x = lparam[0]  # type: int
-        self.y = lparam[1]  # type: int
-        self.mouse_data = lparam[2]  # type: int
-        self.flags = LowLevelMouseFlags(lparam[3] or 0)  # type: LowLevelMouseFlags
-        self.time = lparam[4]  # type: int
+        self._vkey = _UNDECODED  # type: int
+        lparam = self.lparam
+        if lparam[0] is None or lparam[1] is None:
+            # Hook data read through ctypes has None for words that are 0, like the screen's edges.
+            self.lparam = (lparam[0] or 0, lparam[1] or 0) + lparam[2:]
+
+    @property
+    def x(self) -> int:
+        return self.lparam[0]
+
+    @property
+    def y(self) -> int:
+        return self.lparam[1]
+
+    @property
+    def mouse_data(self) -> int:
+        return self.lparam[2]
+
+    @property
+    def flags(self) -> 'LowLevelMouseFlags':
+        return LowLevelMouseFlags.of(self.lparam[3] or 0)
+
+    @property
+    def time(self) -> int:
+        return self.lparam[4]
 
-        # Since it's constant, a property would be an unnecessary expense.
-        self.vkey = self.get_vkey(wparam, lparam)  # type: int
+    @property
+    def vkey(self) -> int:
+        """The virtual key of the mouse button, decoded once since the dispatcher reads it repeatedly."""
+        vkey = self._vkey
+        if vkey is _UNDECODED:
+            vkey = self._vkey = self.get_vkey(self.wparam, self.lparam)
+        return vkey
 
     @property
     def point(self):
-        return self.x, self.y
+        return self.lparam[0], self.lparam[1]
+
+    @property
+    def wheel_delta(self) -> int:
+        """The signed wheel delta of a WM_MOUSEWHEEL event, stored in the high word of mouse_data."""
+        delta = (self.lparam[2] or 0) >> 16 & 0xFFFF
+        return delta - 0x10000 if delta & 0x8000 else delta
 
     @classmethod
     def get_vkey(cls, wparam, lparam) -> int:
         vkey = cls.wparam_to_vkeys[wparam & 0xF]
-        if vkey is 0x0:
+        if vkey == 0x0:
             return 0x4 + (lparam[2] >> 16)
         return vkey
 
@@ -87,7 +150,29 @@ class LowLevelMouseArgs(LowLevelEventArgs):
     )
 
 
+class CoalescedMouseArgs(LowLevelMouseArgs):
+    """The latest of several merged mouse move or wheel events.
+
+    ``dx`` and ``dy`` hold the movement accumulated over the merged events, ``wheel_delta`` the summed
+    wheel deltas and ``samples`` the number of raw events that were merged.
+    """
+    __slots__ = ('dx', 'dy', 'samples', '_wheel_delta')
+
+    def __init__(self, ncode, wparam, lparam, dx=0, dy=0, wheel_delta=0, samples=1):
+        super().__init__(ncode, wparam, lparam)
+        self.dx = dx  # type: int
+        self.dy = dy  # type: int
+        self.samples = samples  # type: int
+        self._wheel_delta = wheel_delta  # type: int
+
+    @property
+    def wheel_delta(self) -> int:
+        return self._wheel_delta
+
+
 class LowLevelMouseFlags(FlagsDword):
+    _interned = {}
+
     @property
     def injected(self):
         return self[0]
@@ -95,3 +180,7 @@ class LowLevelMouseFlags(FlagsDword):
     @property
     def lower_il_injected(self):
         return self[1]
+
+
+RawEvent = namedtuple('RawEvent', ('vkey', 'event', 'flags', 'time'))
+RawEvent.__doc__ = """The plain ints passed to raw handlers, see ``Hotkey(raw=True)``."""
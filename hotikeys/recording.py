@@ -0,0 +1,178 @@
+import mmap
+import struct
+import sys
+import threading
+import time
+from queue import Queue
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from hotikeys.core import HotkeyCore
+from hotikeys.enums import InputDevice
+from hotikeys.errors import reporter
+from hotikeys.exceptions import BlockNextHookException
+
+MAGIC = b'HOTIKEY1'
+
+# device, ncode, wparam and five lparam fields, keyboard events leave the fifth field zero.
+RECORD = struct.Struct('<BxxxiI5q')
+
+_RawEvent = Tuple[int, int, int, Tuple[int, ...]]
+_MOUSE = int(InputDevice.Mouse)
+
+
+class Recorder(object):
+    """Records the raw hook events of a hotkey class into a file of fixed-width records.
+
+    Records are packed into a preallocated buffer. Once ``buffer_size`` records have been collected,
+    or when the recorder is flushed or closed, the buffer is handed to a writer thread and recording
+    goes on into a spare one, so the hook thread never waits for the disk. See ``RECORD`` for the
+    layout.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], buffer_size: int = 4096):
+        self._owns_file = isinstance(file, str)  # type: bool
+        self.file = open(file, 'wb') if self._owns_file else file  # type: BinaryIO
+        self.hotkey_class = None  # type: Type[HotkeyCore]
+        self.recorded = 0  # type: int
+        self._buffer = bytearray(RECORD.size * buffer_size)  # type: bytearray
+        self._spare = []  # type: List[bytearray]
+        self._offset = 0  # type: int
+        self._lock = threading.Lock()
+        self._full = Queue()  # type: Queue
+        self._writer = None  # type: threading.Thread
+        self.file.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def attach(self, hotkey_class: Type[HotkeyCore]):
+        self.detach()
+        self.hotkey_class = hotkey_class
+        hotkey_class.add_tap(self)
+
+    def detach(self):
+        if self.hotkey_class is not None:
+            self.hotkey_class.remove_tap(self)
+            self.hotkey_class = None
+
+    def on_raw(self, device, ncode, wparam, lparam):
+        last = (lparam[4] or 0) if device is InputDevice.Mouse else 0
+        with self._lock:
+            RECORD.pack_into(self._buffer, self._offset, int(device), ncode, wparam,
+                             lparam[0] or 0, lparam[1] or 0, lparam[2] or 0, lparam[3] or 0, last)
+            self._offset += RECORD.size
+            self.recorded += 1
+            if self._offset == len(self._buffer):
+                self._hand_off()
+
+    def flush(self):
+        """Write the records collected so far, waiting for the writer thread."""
+        with self._lock:
+            self._hand_off()
+        self._full.join()
+        self.file.flush()
+
+    def close(self):
+        self.detach()
+        self.flush()
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._full.put(None)
+            writer.join()
+        if self._owns_file:
+            self.file.close()
+
+    def _hand_off(self):
+        """Queue the current buffer for the writer thread and go on in a spare one, with the lock held."""
+        if not self._offset:
+            return
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write)
+            self._writer.daemon = True
+            self._writer.start()
+        self._full.put((self._buffer, self._offset))
+        # A new buffer is only made while the writer is behind on all the spare ones.
+        self._buffer = self._spare.pop() if self._spare else bytearray(len(self._buffer))
+        self._offset = 0
+
+    def _write(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                self._full.task_done()
+                return
+            buffer, length = item
+            # noinspection PyBroadException
+            try:
+                self.file.write(memoryview(buffer)[:length])
+            except:
+                reporter.report(sys.exc_info()[1], 'recorder')
+            with self._lock:
+                self._spare.append(buffer)
+            self._full.task_done()
+
+
+class Replayer(object):
+    """Replays a recording made by ``Recorder`` through a hotkey class' raw event path.
+
+    The recording is memory mapped and decoded one record at a time. Events are replayed as fast as
+    possible, or with their original timing when ``realtime`` is set.
+    """
+
+    def __init__(self, path: str):
+        self.path = path  # type: str
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError('{0} is not a hotikeys recording'.format(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return (len(self._mmap) - len(MAGIC)) // RECORD.size
+
+    def __iter__(self) -> Iterator[_RawEvent]:
+        view = memoryview(self._mmap)[len(MAGIC):len(MAGIC) + len(self) * RECORD.size]
+        try:
+            for device, ncode, wparam, *lparam in RECORD.iter_unpack(view):
+                if device == _MOUSE:
+                    yield device, ncode, wparam, tuple(lparam)
+                else:
+                    yield device, ncode, wparam, tuple(lparam[:4])
+        finally:
+            view.release()
+
+    def replay(self, hotkey_class: Type[HotkeyCore], realtime: bool = False, speed: float = 1.0) -> int:
+        """Feed every recorded event to ``hotkey_class``, returning the number of blocked events."""
+        blocked = 0
+        start = first = None
+        for device, ncode, wparam, lparam in self:
+            if realtime:
+                if first is None:
+                    start, first = time.perf_counter(), lparam[-1]
+                delay = ((lparam[-1] - first) & 0xFFFFFFFF) / 1000 / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            feed = hotkey_class.feed_mouse if device == _MOUSE else hotkey_class.feed_keyboard
+            try:
+                feed(ncode, wparam, lparam)
+            except BlockNextHookException:
+                blocked += 1
+        return blocked
+
+    def close(self):
+        self._mmap.close()
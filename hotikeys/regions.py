@@ -0,0 +1,141 @@
+import threading
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+_Cell = Tuple[int, int]
+
+
+class Region(object):
+    """A rectangle of screen coordinates, ``left``/``top`` inclusive and ``right``/``bottom`` exclusive.
+
+    ``move`` changes the rectangle in place and refiles it in the ``RegionMap``\\ s it's in.
+    """
+
+    def __init__(self, left: int, top: int, right: int, bottom: int, name: str = None):
+        self.name = name  # type: str
+        self.bounds = _bounds(left, top, right, bottom)  # type: Tuple[int, int, int, int]
+        self._maps = []  # type: List[RegionMap]
+
+    def __repr__(self):
+        return '<{} {}{}>'.format(type(self).__name__, '{!r} '.format(self.name) if self.name else '', self.bounds)
+
+    def contains(self, x: int, y: int) -> bool:
+        left, top, right, bottom = self.bounds
+        return left <= x < right and top <= y < bottom
+
+    def move(self, left: int, top: int, right: int, bottom: int):
+        """Change the rectangle, the maps holding the region only refile the cells it entered or left."""
+        self.bounds = _bounds(left, top, right, bottom)
+        for regions in list(self._maps):
+            regions.update(self)
+
+
+class RegionMap(object):
+    """A uniform grid index of regions, answering which regions contain a point.
+
+    Each cell of ``cell_size`` pixels holds the regions that cover it entirely, which contain every
+    point in it without a check, and those that overlap it partially. Cells are replaced as a whole
+    when a region is added, moved or removed, so ``at`` never takes a lock.
+    """
+
+    def __init__(self, cell_size: int = 256):
+        self.cell_size = cell_size  # type: int
+        self._cells = {}  # type: Dict[_Cell, Tuple[Tuple[Region, ...], Tuple[Region, ...]]]
+        self._filed = {}  # type: Dict[Region, Set[_Cell]]
+        self._counts = {}  # type: Dict[Region, int]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._filed)
+
+    def __contains__(self, region):
+        return region in self._filed
+
+    def __iter__(self):
+        return iter(list(self._filed))
+
+    def add(self, region: Region):
+        """Index a region, adding it more than once takes as many ``remove`` calls to drop it."""
+        with self._lock:
+            count = self._counts.get(region, 0)
+            self._counts[region] = count + 1
+            if count:
+                return
+            self._filed[region] = set()
+            region._maps.append(self)
+            self._refile(region)
+
+    def remove(self, region: Region):
+        with self._lock:
+            count = self._counts.get(region, 0)
+            if count > 1:
+                self._counts[region] = count - 1
+                return
+            if not count:
+                return
+            del self._counts[region]
+            region._maps.remove(self)
+            self._refile(region, removed=True)
+            del self._filed[region]
+
+    def update(self, region: Region):
+        """Refile a region after its bounds changed."""
+        with self._lock:
+            if region in self._filed:
+                self._refile(region)
+
+    def at(self, x: int, y: int) -> Tuple[Region, ...]:
+        """The regions containing a point."""
+        cell = self._cells.get((x // self.cell_size, y // self.cell_size))
+        if cell is None:
+            return ()
+        covering, partial = cell
+        if not partial:
+            return covering
+        return covering + tuple(region for region in partial if region.contains(x, y))
+
+    def _refile(self, region, removed=False):
+        old = self._filed[region]
+        new = set() if removed else set(self._cells_of(region.bounds))
+        for cell in old | new:
+            covering, partial = self._cells.get(cell, ((), ()))
+            members = [other for other in covering + partial if other is not region]
+            if cell in new:
+                members.append(region)
+            self._file_cell(cell, members)
+        self._filed[region] = new
+
+    def _file_cell(self, cell, members):
+        size = self.cell_size
+        cell_left, cell_top = cell[0] * size, cell[1] * size
+        covering, partial = [], []
+        for region in members:
+            left, top, right, bottom = region.bounds
+            if right <= cell_left or left >= cell_left + size or bottom <= cell_top or top >= cell_top + size:
+                continue
+            if left <= cell_left and top <= cell_top and right >= cell_left + size and bottom >= cell_top + size:
+                covering.append(region)
+            else:
+                partial.append(region)
+        if covering or partial:
+            self._cells[cell] = tuple(covering), tuple(partial)
+        else:
+            self._cells.pop(cell, None)
+
+    def _cells_of(self, bounds):
+        left, top, right, bottom = bounds
+        if right <= left or bottom <= top:
+            return
+        size = self.cell_size
+        for cx in range(left // size, (right - 1) // size + 1):
+            for cy in range(top // size, (bottom - 1) // size + 1):
+                yield cx, cy
+
+
+def _bounds(left, top, right, bottom) -> Tuple[int, int, int, int]:
+    if right < left or bottom < top:
+        raise ValueError('expected right >= left and bottom >= top for a region, received: {0!r}'
+                         .format((left, top, right, bottom)))
+    return int(left), int(top), int(right), int(bottom)
@@ -0,0 +1,189 @@
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from hotikeys.customtypes import KeyMask
+from hotikeys.enums import Key, KeyState, ExecutionMode
+from hotikeys.exceptions import BlockNextHookException
+from hotikeys.hotkey import Hotkey, EventArgs, _inspect_handler
+
+_StrokeArg = Union[int, Key, Tuple[Union[int, Key], Union[int, Key, Iterable[Union[int, Key]]]]]
+
+MODIFIER_KEYS = frozenset(int(key) for key in (
+    Key.LShift, Key.RShift, Key.LControl, Key.RControl, Key.LAlt, Key.RAlt, Key.LWin, Key.RWin,
+    Key.ShiftKey, Key.ControlKey, Key.AltKey))
+
+
+class Sequence(object):
+    """A binding that fires after a sequence of strokes, such as Ctrl+K followed by Ctrl+C.
+
+    Each stroke is a key or a ``(key, modifiers)`` tuple. The sequence fails when more than ``timeout``
+    seconds pass between two strokes. With ``block`` the strokes of a (partial) match are blocked from
+    reaching other applications, otherwise they're passed on.
+    """
+
+    def __init__(self,
+                 handler: Callable[[EventArgs], None],
+                 strokes: Iterable[_StrokeArg],
+                 *,
+                 timeout: float = 1.0,
+                 block: bool = False,
+                 automaton: 'SequenceAutomaton' = None):
+        self.handler = handler  # type: Callable[[EventArgs], None]
+        self.strokes = tuple(_compile_stroke(stroke) for stroke in strokes)  # type: Tuple[Tuple[int, int], ...]
+        self.timeout = timeout  # type: float
+        self.block = block  # type: bool
+        self.automaton = automaton or SequenceAutomaton.for_class(Hotkey)  # type: SequenceAutomaton
+        self._handler_takes_args = _inspect_handler(handler)[0]  # type: bool
+
+        if not self.strokes:
+            raise ValueError('expected at least one stroke for strokes')
+        self.automaton.add(self)
+
+    def __call__(self, args: EventArgs):
+        if self._handler_takes_args:
+            self.handler(args)
+        else:
+            self.handler()
+
+    def unregister(self):
+        self.automaton.remove(self)
+
+
+class _Node(object):
+    __slots__ = ('children', 'sequences', 'timeout', 'block')
+
+    def __init__(self):
+        self.children = {}  # type: Dict[int, List[Tuple[int, _Node]]]
+        self.sequences = []  # type: List[Sequence]
+        self.timeout = 0.0  # type: float
+        self.block = False  # type: bool
+
+    def match(self, vkey, pressed) -> Optional['_Node']:
+        for mask, child in self.children.get(vkey, ()):
+            if pressed & mask == mask:
+                return child
+        return None
+
+    def child(self, vkey, mask) -> '_Node':
+        children = self.children.setdefault(vkey, [])
+        for child_mask, child in children:
+            if child_mask == mask:
+                return child
+        child = _Node()
+        children.append((mask, child))
+        # Strokes with more modifiers are more specific and win over those they contain.
+        children.sort(key=lambda item: -len(KeyMask(item[0])))
+        return child
+
+
+class SequenceAutomaton(object):
+    """Matches all sequences of a hotkey class with one shared prefix trie.
+
+    The automaton is driven by a single inline hotkey. Each stroke advances the current trie node with
+    one lookup, regardless of how many sequences are registered. Every trie node knows the longest
+    timeout and whether any sequence passing through it blocks its strokes. A sequence that is a prefix
+    of another fires as soon as it completes, without waiting for the longer one.
+    """
+    _automatons = {}  # type: Dict[Type[Hotkey], SequenceAutomaton]
+
+    def __init__(self, hotkey_class: Type[Hotkey] = Hotkey):
+        self.hotkey_class = hotkey_class  # type: Type[Hotkey]
+        self.sequences = []  # type: List[Sequence]
+        self.hotkey = None  # type: Hotkey
+        self._root = _Node()  # type: _Node
+        self._node = self._root  # type: _Node
+        self._last = 0.0  # type: float
+        self._max_gap = 0.0  # type: float
+        self._blocked = set()  # type: set
+
+    @classmethod
+    def for_class(cls, hotkey_class: Type[Hotkey]) -> 'SequenceAutomaton':
+        """Return the automaton shared by the sequences of a hotkey class."""
+        automaton = cls._automatons.get(hotkey_class)
+        if automaton is None:
+            automaton = cls._automatons[hotkey_class] = cls(hotkey_class)
+        return automaton
+
+    def add(self, sequence: Sequence):
+        self.sequences.append(sequence)
+        self._insert(sequence)
+        if self.hotkey is None:
+            self.hotkey = self.hotkey_class(self.on_event, events=(KeyState.Down, KeyState.Up),
+                                            execution=ExecutionMode.Inline)
+
+    def remove(self, sequence: Sequence):
+        self.sequences.remove(sequence)
+        self._root = self._node = _Node()
+        for sequence in self.sequences:
+            self._insert(sequence)
+        if not self.sequences and self.hotkey is not None:
+            self.hotkey.unregister()
+            self.hotkey = None
+
+    def reset(self):
+        self._node = self._root
+        self._max_gap = 0.0
+
+    def on_event(self, args: EventArgs):
+        vkey = args.vkey
+        if args.event.state is KeyState.Up:
+            if vkey in self._blocked:
+                self._blocked.discard(vkey)
+                raise BlockNextHookException
+            return
+        if self._advance(vkey, args):
+            self._blocked.add(vkey)
+            raise BlockNextHookException
+
+    def _advance(self, vkey, args) -> bool:
+        now = self.hotkey_class.clock()
+        pressed = self.hotkey_class._pressed.mask
+        node = self._node
+        if node is not self._root:
+            gap = now - self._last
+            child = node.match(vkey, pressed)
+            if child is not None and gap <= child.timeout:
+                return self._enter(child, max(self._max_gap, gap), now, args)
+            if child is None and vkey in MODIFIER_KEYS:
+                return False
+            self.reset()
+        child = self._root.match(vkey, pressed)
+        if child is None:
+            return False
+        return self._enter(child, 0.0, now, args)
+
+    def _enter(self, node, max_gap, now, args) -> bool:
+        for sequence in node.sequences:
+            if sequence.timeout >= max_gap:
+                sequence(args)
+        if node.children:
+            self._node = node
+            self._last = now
+            self._max_gap = max_gap
+        else:
+            self.reset()
+        return node.block
+
+    def _insert(self, sequence):
+        node = self._root
+        for depth, (vkey, mask) in enumerate(sequence.strokes):
+            node = node.child(vkey, mask)
+            if depth:
+                node.timeout = max(node.timeout, sequence.timeout)
+            node.block = node.block or sequence.block
+        node.sequences.append(sequence)
+
+
+def _compile_stroke(stroke) -> Tuple[int, int]:
+    if isinstance(stroke, (int, Key)):
+        return int(stroke), 0
+    key, modifiers = stroke
+    if isinstance(modifiers, (int, Key)):
+        modifiers = (modifiers,)
+    return int(key), int(KeyMask.of(modifiers))
@@ -0,0 +1,125 @@
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any
+from typing import Dict
+from typing import Sequence
+
+# Upper bounds of the histogram buckets in microseconds, the last bucket counts everything above.
+DEFAULT_BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 200000, 300000)
+
+
+class Histogram(object):
+    """A histogram of durations in fixed buckets, cheap enough to record from the hook thread.
+
+    ``add`` takes no lock, so each histogram should have one writer: the keyboard and mouse hooks
+    record into histograms of their own, which are merged for snapshots. A handler's histograms are
+    written by the thread running it; an inline handler bound to both keyboard and mouse events can
+    run on both hook threads at once and may lose the odd count. A snapshot taken while recording may
+    be off by an event.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)  # type: Sequence[float]
+        self.counts = [0] * (len(self.bounds) + 1)  # type: list
+        self.count = 0  # type: int
+        self.total = 0.0  # type: float
+        self.max = 0.0  # type: float
+
+    def add(self, micros: float):
+        self.counts[bisect_left(self.bounds, micros)] += 1
+        self.count += 1
+        self.total += micros
+        if micros > self.max:
+            self.max = micros
+
+    @classmethod
+    def merge(cls, *histograms: 'Histogram') -> 'Histogram':
+        """Return a new histogram with the counts of histograms that share the same bounds."""
+        merged = cls(histograms[0].bounds)
+        for histogram in histograms:
+            merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+            merged.count += histogram.count
+            merged.total += histogram.total
+            merged.max = max(merged.max, histogram.max)
+        return merged
+
+    def percentile(self, q: float) -> float:
+        """The upper bound of the bucket holding the ``q`` (0-1) percentile, or ``max`` for the last bucket."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'bounds': self.bounds,
+            'counts': tuple(self.counts),
+        }
+
+
+class HandlerStats(object):
+    """The runtime of a hotkey's handler and the lag between the event's timestamp and the handler start."""
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.latency = Histogram(bounds)  # type: Histogram
+        self.lag = Histogram(bounds)  # type: Histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'latency': self.latency.snapshot(), 'lag': self.lag.snapshot()}
+
+
+class Instrumentation(object):
+    """Timings of a hotkey class, recorded while ``HotkeyCore.instrumentation`` is set.
+
+    ``hook`` holds the time spent in the raw hook handlers, which is what counts towards the
+    ``LowLevelHooksTimeout`` of Windows, and ``dispatch`` the part of it spent dispatching the event
+    args. Both are recorded per device, as the keyboard and mouse hooks run on threads of their own,
+    and merged in ``snapshot``. All durations are in microseconds.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)  # type: Sequence[float]
+        self.keyboard_hook = Histogram(bounds)  # type: Histogram
+        self.keyboard_dispatch = Histogram(bounds)  # type: Histogram
+        self.mouse_hook = Histogram(bounds)  # type: Histogram
+        self.mouse_dispatch = Histogram(bounds)  # type: Histogram
+        self.handlers = {}  # type: Dict[Any, HandlerStats]
+        self._lock = threading.Lock()
+
+    def handler(self, hotkey) -> HandlerStats:
+        stats = self.handlers.get(hotkey)
+        if stats is None:
+            with self._lock:
+                stats = self.handlers.setdefault(hotkey, HandlerStats(self.bounds))
+        return stats
+
+    def time_handler(self, hotkey, func, args, now_ms=None):
+        """Call ``func(args)`` and record its runtime, and its lag when ``now_ms`` and ``args.time`` are known."""
+        stats = self.handler(hotkey)
+        if now_ms is not None and args is not None and args.time is not None:
+            lag = (now_ms - args.time) & 0xFFFFFFFF
+            # A timestamp slightly ahead of the clock reads as a negative lag once it wraps.
+            stats.lag.add(lag * 1000.0 if lag < 0x80000000 else 0.0)
+        start = perf_counter()
+        try:
+            return func(args)
+        finally:
+            stats.latency.add((perf_counter() - start) * 1e6)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'hook': Histogram.merge(self.keyboard_hook, self.mouse_hook).snapshot(),
+            'dispatch': Histogram.merge(self.keyboard_dispatch, self.mouse_dispatch).snapshot(),
+            'keyboard': {'hook': self.keyboard_hook.snapshot(), 'dispatch': self.keyboard_dispatch.snapshot()},
+            'mouse': {'hook': self.mouse_hook.snapshot(), 'dispatch': self.mouse_dispatch.snapshot()},
+            'handlers': {hotkey: stats.snapshot() for hotkey, stats in list(self.handlers.items())},
+        }
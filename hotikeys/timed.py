@@ -0,0 +1,277 @@
+import heapq
+import itertools
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+
+from hotikeys.customtypes import KeyMask
+from hotikeys.enums import Key, KeyState, ExecutionMode, RepeatPolicy
+from hotikeys.errors import reporter
+from hotikeys.hotkey import Hotkey, EventArgs, _inspect_handler
+
+_KeyArg = Union[int, Key]
+
+
+class Timer(object):
+    """A call scheduled on a ``TimerScheduler``, ``cancel()`` keeps it from running."""
+    __slots__ = ('deadline', 'func', 'args', 'cancelled', 'scheduler')
+
+    def __init__(self, deadline, func, args, scheduler):
+        self.deadline = deadline  # type: float
+        self.func = func  # type: Callable[..., Any]
+        self.args = args  # type: Tuple[Any, ...]
+        self.cancelled = False  # type: bool
+        self.scheduler = scheduler  # type: TimerScheduler
+
+    def cancel(self):
+        self.scheduler.cancel(self)
+
+
+class TimerScheduler(object):
+    """Runs the deadlines of all timed bindings from one heap on one thread.
+
+    Timers are kept in a heap ordered by deadline and run on the scheduler's thread, which sleeps
+    until the earliest deadline and is woken when an earlier one is scheduled. Cancelled timers stay
+    in the heap until they come up, or until they make up most of it. However many bindings are
+    waiting, they cost one thread.
+
+    ``clock`` is the time source for the deadlines, and for the timed bindings using the scheduler.
+    With ``threaded=False`` no thread is started and due timers only run on ``run_due()``, which
+    together with a fake clock makes timing logic deterministic.
+    """
+    _default = None  # type: TimerScheduler
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, *, threaded: bool = True):
+        self.clock = clock  # type: Callable[[], float]
+        self.threaded = threaded  # type: bool
+        self._heap = []  # type: List[Tuple[float, int, Timer]]
+        self._cancelled = 0  # type: int
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None  # type: threading.Thread
+
+    def __len__(self):
+        return len(self._heap) - self._cancelled
+
+    @classmethod
+    def default(cls) -> 'TimerScheduler':
+        """Return the scheduler shared by timed bindings that aren't given one."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def call_at(self, deadline: float, func: Callable[..., Any], args: Tuple[Any, ...] = ()) -> Timer:
+        """Run ``func(*args)`` once the clock reaches ``deadline``."""
+        timer = Timer(deadline, func, args, self)
+        with self._lock:
+            heapq.heappush(self._heap, (deadline, next(self._counter), timer))
+            if self._heap[0][2] is timer:
+                self._wakeup.notify()
+        if self.threaded and self._thread is None:
+            self._start()
+        return timer
+
+    def call_later(self, delay: float, func: Callable[..., Any], args: Tuple[Any, ...] = ()) -> Timer:
+        return self.call_at(self.clock() + delay, func, args)
+
+    def cancel(self, timer: Timer):
+        with self._lock:
+            if timer.cancelled:
+                return
+            timer.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+
+    def run_due(self) -> int:
+        """Run the timers that are due by the clock on the calling thread, returns how many ran."""
+        ran = 0
+        while True:
+            with self._lock:
+                timer = self._pop_due(self.clock())
+            if timer is None:
+                return ran
+            self._run(timer)
+            ran += 1
+
+    def _pop_due(self, now) -> Optional[Timer]:
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if heap and heap[0][0] <= now:
+            # Popped timers can no longer be cancelled, mark them so a late cancel isn't counted.
+            timer = heapq.heappop(heap)[2]
+            timer.cancelled = True
+            return timer
+        return None
+
+    @staticmethod
+    def _run(timer):
+        # noinspection PyBroadException
+        try:
+            timer.func(*timer.args)
+        except Exception as e:
+            reporter.report(e, 'timer')
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._work)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                timer = self._pop_due(self.clock())
+                while timer is None:
+                    self._wakeup.wait(self._heap[0][0] - self.clock() if self._heap else None)
+                    timer = self._pop_due(self.clock())
+            self._run(timer)
+
+
+class TimedBinding(object):
+    """Base class of the bindings that fire on the timing of a key's presses and releases.
+
+    A binding is driven by an inline hotkey on its key, which only records the time of the event and
+    schedules the handler. Handlers run on the thread of the ``scheduler``, so they shouldn't block
+    for long, and receive the args of the key event that completed the binding if they take an
+    argument. ``modifiers`` are checked when the key is pressed; releasing them before the key
+    doesn't matter.
+    """
+
+    def __init__(self,
+                 handler: Callable[[EventArgs], None],
+                 key: _KeyArg,
+                 modifiers: Union[_KeyArg, Iterable[_KeyArg], None] = None,
+                 *,
+                 scheduler: TimerScheduler = None,
+                 hotkey_class: Type[Hotkey] = Hotkey):
+        if isinstance(modifiers, (int, Key)):
+            modifiers = (modifiers,)
+        self.handler = handler  # type: Callable[[EventArgs], None]
+        self.key = int(key)  # type: int
+        self.modifiers = tuple(int(modifier) for modifier in modifiers or ())  # type: Tuple[int, ...]
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler.default()  # type: TimerScheduler
+        self._modifier_mask = int(KeyMask.of(self.modifiers))  # type: int
+        self._handler_takes_args = _inspect_handler(handler)[0]  # type: bool
+        self._timer = None  # type: Timer
+        self.hotkey = hotkey_class(self.on_event, key, events=(KeyState.Down, KeyState.Up),
+                                   execution=ExecutionMode.Inline, repeat=RepeatPolicy.Suppress)  # type: Hotkey
+
+    def __call__(self, args: EventArgs):
+        if self._handler_takes_args:
+            self.handler(args)
+        else:
+            self.handler()
+
+    def on_event(self, args: EventArgs):
+        now = self.scheduler.clock()
+        if args.event.state is KeyState.Down:
+            if self.hotkey._pressed.mask & self._modifier_mask == self._modifier_mask:
+                self._on_press(args, now)
+        else:
+            self._on_release(args, now)
+
+    def unregister(self):
+        self.hotkey.unregister()
+        self._cancel()
+
+    def _on_press(self, args, now):
+        pass
+
+    def _on_release(self, args, now):
+        pass
+
+    def _schedule(self, deadline, args):
+        # The args hold their own copy of the hook data, so they can be read once the deadline comes.
+        self._cancel()
+        self._timer = self.scheduler.call_at(deadline, self, (args,))
+
+    def _cancel(self):
+        timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+
+class LongPress(TimedBinding):
+    """Fires once a key has been held down for ``duration`` seconds, without waiting for its release."""
+
+    def __init__(self, handler, key, duration: float = 0.5, modifiers=None, **kwargs):
+        self.duration = duration  # type: float
+        super().__init__(handler, key, modifiers, **kwargs)
+
+    def _on_press(self, args, now):
+        self._schedule(now + self.duration, args)
+
+    def _on_release(self, args, now):
+        self._cancel()
+
+
+class DoubleTap(TimedBinding):
+    """Fires when a key is pressed twice within ``window`` seconds.
+
+    ``on_single`` optionally fires for a press that wasn't followed by a second one within the
+    window, which delays it by the window.
+    """
+
+    def __init__(self, handler, key, window: float = 0.3, modifiers=None, *,
+                 on_single: Callable[[EventArgs], None] = None, **kwargs):
+        self.window = window  # type: float
+        self.on_single = on_single  # type: Callable[[EventArgs], None]
+        self._first = None  # type: float
+        self._single_takes_args = on_single is not None and _inspect_handler(on_single)[0]  # type: bool
+        super().__init__(handler, key, modifiers, **kwargs)
+
+    def _on_press(self, args, now):
+        if self._first is not None and now - self._first <= self.window:
+            self._first = None
+            self._schedule(now, args)
+            return
+        self._first = now
+        self._cancel()
+        if self.on_single is not None:
+            self._timer = self.scheduler.call_at(now + self.window, self._single, (args,))
+
+    def _single(self, args):
+        if self._single_takes_args:
+            self.on_single(args)
+        else:
+            self.on_single()
+
+
+class HoldRelease(TimedBinding):
+    """Fires when a key is released after it was held for at least ``min_duration`` seconds.
+
+    With ``max_duration`` longer holds don't fire. ``held`` is the duration of the last hold.
+    """
+
+    def __init__(self, handler, key, min_duration: float = 0.5, max_duration: float = None, modifiers=None,
+                 **kwargs):
+        self.min_duration = min_duration  # type: float
+        self.max_duration = max_duration  # type: float
+        self.held = 0.0  # type: float
+        self._pressed_at = None  # type: float
+        super().__init__(handler, key, modifiers, **kwargs)
+
+    def _on_press(self, args, now):
+        self._pressed_at = now
+
+    def _on_release(self, args, now):
+        if self._pressed_at is None:
+            return
+        self.held = held = now - self._pressed_at
+        self._pressed_at = None
+        if held >= self.min_duration and (self.max_duration is None or held <= self.max_duration):
+            self._schedule(now, args)
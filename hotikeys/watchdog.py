@@ -0,0 +1,186 @@
+import logging
+import sys
+import threading
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Union
+
+from hotikeys.enums import ExecutionMode, WatchdogAction
+from hotikeys.errors import ErrorReporter, reporter
+from hotikeys.exceptions import BlockNextHookException
+
+log = logging.getLogger(__name__)
+
+_ActionArg = Union[str, WatchdogAction]
+
+
+class HandlerWindow(object):
+    """Counts the calls, slow calls and errors of a handler over a sliding window.
+
+    The window is a ring of ``buckets`` counters of ``window / buckets`` seconds each, a bucket is
+    cleared when the ring comes around to it again.
+    """
+    __slots__ = ('calls', 'slow', 'errors', 'runtime', '_bucket', '_span')
+
+    def __init__(self, buckets: int):
+        self.calls = [0] * buckets  # type: List[int]
+        self.slow = [0] * buckets  # type: List[int]
+        self.errors = [0] * buckets  # type: List[int]
+        self.runtime = [0.0] * buckets  # type: List[float]
+        self._bucket = 0  # type: int
+        self._span = None  # type: int
+
+    def add(self, span: int, runtime: float, slow: bool, failed: bool):
+        """Count a call in the bucket of ``span``, the index of the bucket length since the clock's epoch."""
+        buckets = len(self.calls)
+        if span != self._span:
+            # Clear the buckets skipped since the last call, the whole ring after a long pause.
+            last = self._span if self._span is not None else span - buckets
+            for skipped in range(max(last + 1, span - buckets + 1), span + 1):
+                bucket = skipped % buckets
+                self.calls[bucket] = self.slow[bucket] = self.errors[bucket] = 0
+                self.runtime[bucket] = 0.0
+            self._span = span
+            self._bucket = span % buckets
+        bucket = self._bucket
+        self.calls[bucket] += 1
+        self.runtime[bucket] += runtime
+        if slow:
+            self.slow[bucket] += 1
+        if failed:
+            self.errors[bucket] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = sum(self.calls)
+        return {
+            'calls': calls,
+            'slow': sum(self.slow),
+            'errors': sum(self.errors),
+            'mean_runtime': sum(self.runtime) / calls if calls else 0.0,
+        }
+
+
+class Watchdog(object):
+    """Watches the runtime and errors of the handlers of a hotkey class, set with ``HotkeyCore.watch()``.
+
+    A call that takes longer than ``max_runtime`` seconds is slow. When a handler has more than
+    ``max_slow`` slow calls within ``window`` seconds, ``on_slow`` is applied to its hotkey; when at
+    least ``min_calls`` calls were made in the window and the share of them that raised reaches
+    ``max_error_rate``, ``on_errors`` is applied:
+
+    - ``WatchdogAction.Offload`` moves an inline handler to the thread pool of its hotkey class. Hotkeys
+      made with an explicit ``execution=ExecutionMode.Inline`` have to stay on the hook thread, to block
+      events or keep their state there, so for them the warning is only logged.
+    - ``WatchdogAction.Quarantine`` unregisters the hotkey until it's ``release``\\ d.
+    - ``WatchdogAction.Ignore`` only logs a warning.
+
+    Exceptions raised by handlers are counted and reported to ``errors``, an ``ErrorReporter``, instead
+    of propagating to the hook.
+    """
+
+    def __init__(self,
+                 max_runtime: float = 0.050,
+                 max_slow: int = 3,
+                 max_error_rate: float = 0.5,
+                 min_calls: int = 10,
+                 window: float = 10.0,
+                 buckets: int = 10,
+                 *,
+                 on_slow: _ActionArg = WatchdogAction.Offload,
+                 on_errors: _ActionArg = WatchdogAction.Quarantine,
+                 errors: ErrorReporter = None):
+        self.max_runtime = max_runtime  # type: float
+        self.max_slow = max_slow  # type: int
+        self.max_error_rate = max_error_rate  # type: float
+        self.min_calls = min_calls  # type: int
+        self.window = window  # type: float
+        self.buckets = buckets  # type: int
+        self.on_slow = _action(on_slow, 'on_slow')  # type: WatchdogAction
+        self.on_errors = _action(on_errors, 'on_errors')  # type: WatchdogAction
+        self.errors = errors or reporter  # type: ErrorReporter
+        self.clock = perf_counter  # type: Callable[[], float]
+        self.handlers = {}  # type: Dict[Any, HandlerWindow]
+        self.quarantined = {}  # type: Dict[Any, str]
+        self._bucket_length = window / buckets  # type: float
+        self._lock = threading.Lock()
+
+    def run(self, hotkey, func, args):
+        """Call ``func(args)`` for ``hotkey``, counting its runtime and whether it raised."""
+        clock = self.clock
+        start = clock()
+        failed = False
+        # noinspection PyBroadException
+        try:
+            func(args)
+        except BlockNextHookException:
+            raise
+        except Exception:
+            failed = True
+            self.errors.report(sys.exc_info()[1], 'handler of {!r}'.format(hotkey))
+        finally:
+            end = clock()
+            runtime = end - start
+            slow = runtime > self.max_runtime
+            window = self.handlers.get(hotkey)
+            if window is None:
+                with self._lock:
+                    window = self.handlers.setdefault(hotkey, HandlerWindow(self.buckets))
+            window.add(int(end / self._bucket_length), runtime, slow, failed)
+            if slow or failed:
+                self._check(hotkey, window)
+
+    def release(self, hotkey):
+        """Register a quarantined hotkey again, with a clean slate."""
+        if self.quarantined.pop(hotkey, None) is not None:
+            self.handlers.pop(hotkey, None)
+            hotkey.register()
+
+    def forget(self, hotkey):
+        """Drop what's tracked of a hotkey, called when it's unregistered."""
+        self.handlers.pop(hotkey, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'handlers': {hotkey: window.snapshot() for hotkey, window in list(self.handlers.items())},
+            'quarantined': dict(self.quarantined),
+        }
+
+    def _check(self, hotkey, window: HandlerWindow):
+        slow = sum(window.slow)
+        if slow > self.max_slow:
+            self._apply(hotkey, self.on_slow, '{} calls slower than {:.0f} ms in {:.0f} s'
+                        .format(slow, self.max_runtime * 1000, self.window))
+            return
+        calls = sum(window.calls)
+        errors = sum(window.errors)
+        if calls >= self.min_calls and errors >= calls * self.max_error_rate:
+            self._apply(hotkey, self.on_errors, '{} of {} calls raised in {:.0f} s'
+                        .format(errors, calls, self.window))
+
+    def _apply(self, hotkey, action, reason):
+        if action is WatchdogAction.Offload and hotkey.pinned:
+            action = WatchdogAction.Ignore
+        if action is WatchdogAction.Offload and hotkey.execution is ExecutionMode.Inline:
+            log.warning('%r: %s, moving its handler to the thread pool', hotkey, reason)
+            hotkey.execution = ExecutionMode.ThreadPool
+            self.handlers.pop(hotkey, None)
+        elif action is WatchdogAction.Quarantine and hotkey not in self.quarantined:
+            log.warning('%r: %s, unregistering it', hotkey, reason)
+            hotkey.unregister()
+            self.quarantined[hotkey] = reason
+        elif action is WatchdogAction.Ignore:
+            log.warning('%r: %s', hotkey, reason)
+            self.handlers.pop(hotkey, None)
+
+
+def _action(action, name) -> WatchdogAction:
+    if isinstance(action, WatchdogAction):
+        return action
+    member = WatchdogAction[action]
+    if member is None:
+        raise ValueError('expected WatchdogAction or one of {0} for {1}, received: {2!r}'
+                         .format([member.value for member in WatchdogAction], name, action))
+    return member
@@ -5,11 +5,14 @@ import sys
 import threading
 from _ctypes import byref
 from ctypes import wintypes
-from traceback import print_exception
 from typing import Any
 from typing import Callable
 from typing import List
 
+from hotikeys.errors import reporter
+from hotikeys.eventsource import EventSource
+from hotikeys.exceptions import BlockNextHookException
+
 log = logging.getLogger(__name__)
 
 _win32_GetModuleHandleA = ctypes.windll.kernel32.GetModuleHandleA
@@ -20,6 +23,11 @@ _win32_PeekMessageW = ctypes.windll.user32.PeekMessageW
 _win32_GetMessageW = ctypes.windll.user32.GetMessageW
 _win32_TranslateMessage = ctypes.windll.user32.TranslateMessage
 _win32_DispatchMessageW = ctypes.windll.user32.DispatchMessageW
+_win32_GetTickCount = ctypes.windll.kernel32.GetTickCount
+
+_WH_KEYBOARD_LL = 0x0D
+_WH_MOUSE_LL = 0x0E
+_HOOK_SIGNATURE = ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_void_p)
 
 
 class WindowsHook(object):
@@ -39,7 +47,7 @@ class WindowsHook(object):
             except BlockNextHookException:
                 call_next = False
             except:
-                print_exception(*sys.exc_info())
+                reporter.report(sys.exc_info()[1], 'hook')
             finally:
                 if not call_next:
                     return 1
@@ -82,5 +90,28 @@ def windowshookmethod(event, signature, threaded=True):
     return decorator
 
 
-class BlockNextHookException(Exception):
-    """Block CallNextHookEx from being called during an event"""
+class WindowsHookSource(EventSource):
+    """Receives events from low level Windows keyboard and mouse hooks."""
+
+    def __init__(self):
+        self.hooks = []  # type: List[WindowsHook]
+
+    def install(self, on_keyboard, on_mouse, threaded=True):
+        if on_keyboard is not None:
+            keyboard_hook = WindowsHook(_WH_KEYBOARD_LL, _HOOK_SIGNATURE, on_keyboard)
+            self.hooks.append(keyboard_hook)
+            keyboard_hook.register(threaded)
+
+        if on_mouse is not None:
+            mouse_hook = WindowsHook(_WH_MOUSE_LL, _HOOK_SIGNATURE, on_mouse)
+            self.hooks.append(mouse_hook)
+            mouse_hook.register(threaded)
+
+    def uninstall(self):
+        for hook in self.hooks:
+            hook.unhook()
+        self.hooks = []
+
+    def time_ms(self):
+        # The hook event timestamps are in GetTickCount milliseconds.
+        return _win32_GetTickCount() & 0xFFFFFFFF
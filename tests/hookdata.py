@@ -0,0 +1,18 @@
+"""Hook data backed by ctypes memory, like the ``lparam`` the Windows hooks pass.
+
+Unlike tuples, words that are 0 read as ``None``, and the memory can be overwritten after the event
+to check that nothing reads it once the callback returned.
+"""
+import ctypes
+
+
+def lparam(*words):
+    """Return a ``POINTER(c_void_p)`` to ``words`` and the buffer behind it."""
+    buffer = (ctypes.c_void_p * len(words))(*words)
+    return ctypes.cast(buffer, ctypes.POINTER(ctypes.c_void_p)), buffer
+
+
+def overwrite(buffer, value=0xDEAD):
+    """Reuse the memory of an event, as the OS does once the hook callback returned."""
+    for i in range(len(buffer)):
+        buffer[i] = value
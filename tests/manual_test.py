@@ -1,5 +1,6 @@
 import asyncio
 
+import hotikeys
 from hotikeys import Hotkey, Key
 from hotikeys.hotkey import EventArgs
 
@@ -10,14 +11,15 @@ def automated_test(loop):
     def key_handler(args: EventArgs):
         print(args.vkey, Key[args.vkey], args.event, args.flags)
 
-    def stop_loop():
+    async def stop_loop():
         print('stopping')
         loop.stop()
 
     Hotkey(key_handler, events=())
-    Hotkey(stop_loop, Key.C, Key.LControl)
+    Hotkey(stop_loop, Key.C, Key.LControl, loop=loop)
 
     loop.create_task(heartbeat(loop, 0))
+    loop.create_task(print_events(hotikeys.events(Key.A, loop=loop)))
     loop.run_forever()
 
 
@@ -28,6 +30,11 @@ async def heartbeat(loop, count):
     loop.create_task(heartbeat(loop, count + 1))
 
 
+async def print_events(stream):
+    async for args in stream:
+        print('streamed', Key[args.vkey], args.event)
+
+
 # Super automated test. Just eh... hit a few keys and observe console.
 # Ctrl-C to stop, if it works.
 if __name__ == '__main__':
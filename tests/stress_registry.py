@@ -0,0 +1,131 @@
+"""Stress test for concurrent registration and dispatch.
+
+A keyboard and a mouse thread feed numbered synthetic events, like the two hook threads do, while
+other threads keep registering, changing and unregistering hotkeys. Every event id must reach each
+hotkey that stays registered exactly once, and no hotkey may receive an event id twice.
+
+    python -m tests.stress_registry [seconds]
+
+``tests/test_stress.py`` runs it for a second with the other tests.
+"""
+import random
+import sys
+import threading
+import time
+import traceback
+
+from hotikeys import Hotkey, Key, KeyState, NullSource
+
+KEYS = tuple(range(0x41, 0x41 + 16))
+CHURN_THREADS = 3
+
+
+class StressHotkey(Hotkey):
+    source = NullSource()
+    no_repeat = False
+
+
+class Recorder(object):
+    """A handler that records the event ids it received."""
+
+    def __init__(self):
+        self.ids = []
+
+    def __call__(self, args):
+        self.ids.append(args.time)
+
+
+def feed_keyboard(stop, fed):
+    rng = random.Random(1)
+    event_id = 0
+    while not stop.is_set():
+        key = rng.choice(KEYS)
+        StressHotkey.feed_keyboard(0, 0x100, (key, 0, 0, event_id))
+        StressHotkey.feed_keyboard(0, 0x101, (key, 0, 0x80, event_id + 1))
+        fed[key].append(event_id)
+        event_id += 2
+
+
+def feed_mouse(stop, fed):
+    event_id = 1 << 40
+    while not stop.is_set():
+        StressHotkey.feed_mouse(0, 0x200, (event_id % 1920, 0, 0, 0, event_id))
+        StressHotkey.feed_mouse(0, 0x201, (0, 0, 0, 0, event_id + 1))
+        StressHotkey.feed_mouse(0, 0x202, (0, 0, 0, 0, event_id + 2))
+        fed[int(Key.LButton)].append(event_id + 1)
+        event_id += 3
+
+
+def churn(stop, seed, transient):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        batch = []
+        for _ in range(rng.randint(1, 50)):
+            recorder = Recorder()
+            transient.append(recorder)
+            batch.append(StressHotkey(recorder, rng.choice(KEYS), register=False))
+        StressHotkey.register_many(batch)
+        with StressHotkey.batch():
+            for hotkey in rng.sample(batch, len(batch) // 2):
+                hotkey.key = rng.choice(KEYS)
+        recorder = Recorder()
+        transient.append(recorder)
+        with StressHotkey(recorder, rng.choice(KEYS), events=(KeyState.Down, KeyState.Up)):
+            time.sleep(0.0001)
+        StressHotkey.unregister_many(batch)
+
+
+def guarded(target, stop, errors, *args):
+    try:
+        target(stop, *args)
+    except Exception:
+        traceback.print_exc()
+        errors.append(target.__name__)
+        stop.set()
+
+
+def main(duration=5.0):
+    fed = {key: [] for key in KEYS + (int(Key.LButton),)}
+    permanent = {key: Recorder() for key in fed}
+    for key, recorder in permanent.items():
+        StressHotkey(recorder, key)
+    transient = []
+
+    # Switch threads as often as possible to shake out races.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    stop = threading.Event()
+    errors = []
+    threads = [threading.Thread(target=guarded, args=(feed_keyboard, stop, errors, fed)),
+               threading.Thread(target=guarded, args=(feed_mouse, stop, errors, fed))]
+    threads += [threading.Thread(target=guarded, args=(churn, stop, errors, seed, transient))
+                for seed in range(CHURN_THREADS)]
+    for thread in threads:
+        thread.start()
+    try:
+        time.sleep(duration)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        sys.setswitchinterval(interval)
+
+    failures = len(errors)
+    for key, ids in fed.items():
+        if permanent[key].ids != ids:
+            failures += 1
+            print('{}: fed {} events, received {} ({} unique)'.format(
+                Key[key], len(ids), len(permanent[key].ids), len(set(permanent[key].ids))))
+    duplicated = sum(len(recorder.ids) != len(set(recorder.ids)) for recorder in transient)
+    if duplicated:
+        failures += 1
+        print('{} transient hotkeys received an event twice'.format(duplicated))
+
+    print('{} events, {} transient hotkeys, {} still registered, {}'.format(
+        sum(map(len, fed.values())), len(transient), len(StressHotkey._registry),
+        'FAILED' if failures else 'ok'))
+    return 1 if failures or len(StressHotkey._registry) != len(permanent) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0))
@@ -0,0 +1,55 @@
+"""asyncio integration tests."""
+import asyncio
+
+import pytest
+
+from hotikeys import EventId, Hotkey, Key, NullSource, events
+from tests.hookdata import lparam, overwrite
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def test_stream_events_outlive_hook_data():
+    cls = hotkey_class()
+
+    async def main():
+        stream = events(Key.A, hotkey_class=cls)
+        for time in (10, 20):
+            data, buffer = lparam(int(Key.A), 0, 0, time, 0)
+            cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), data)
+            cls.feed_keyboard(0, int(EventId.WM_KEYUP), (int(Key.A), 0, 0x80, time))
+            overwrite(buffer)
+        stream.close()
+        return [(args.vkey, args.time, args.event) async for args in stream]
+
+    received = asyncio.run(main())
+    down = [event for event in received if event[2] is EventId.WM_KEYDOWN]
+    assert down == [(int(Key.A), 10, EventId.WM_KEYDOWN), (int(Key.A), 20, EventId.WM_KEYDOWN)]
+
+
+def test_async_handler_runs_on_running_loop():
+    cls = hotkey_class()
+    received = []
+
+    async def handler(args):
+        received.append(args.vkey)
+
+    async def main():
+        cls(handler, Key.B)
+        cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), (int(Key.B), 0, 0, 0))
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert received == [int(Key.B)]
+
+
+def test_async_handler_without_running_loop():
+    async def handler():
+        pass
+
+    with pytest.raises(RuntimeError):
+        hotkey_class()(handler, Key.C)
+    with pytest.raises(RuntimeError):
+        events(Key.C, hotkey_class=hotkey_class())
@@ -0,0 +1,132 @@
+"""Bindings file tests, with handlers resolved from this module."""
+import json
+
+import pytest
+
+from hotikeys import EventId, Hotkey, Key, KeyState, Keymap, NullSource, bindings
+from hotikeys.bindings import BindingError, CACHE_SUFFIX, compile_bindings, load, parse_keys, read_bindings
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+
+fired = []
+
+
+def on_save():
+    fired.append('save')
+
+
+def on_cut():
+    fired.append('cut')
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def press(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+
+
+def tap(cls, vkey):
+    press(cls, vkey)
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def write(tmp_path, data, name='bindings.json'):
+    path = tmp_path / name
+    path.write_text(data if isinstance(data, str) else json.dumps(data))
+    return str(path)
+
+
+def test_parse_keys():
+    assert parse_keys('Ctrl+Shift+A') == (int(Key.A), (int(Key.LControl), int(Key.LShift)))
+    assert parse_keys('f5') == (int(Key.F5), ())
+    assert parse_keys('Alt+1') == (int(Key.D1), (int(Key.LAlt),))
+    with pytest.raises(BindingError):
+        parse_keys('Ctrl+')
+    with pytest.raises(BindingError):
+        parse_keys('Ctrl+Nope')
+
+
+def test_compile_table_and_list():
+    table = compile_bindings({'bindings': {
+        'Ctrl+S': 'tests.test_bindings:on_save',
+        'X': {'handler': 'tests.test_bindings:on_cut', 'events': ['Down', 'Up'], 'layer': 'edit'},
+    }})
+    assert table == [
+        (int(Key.S), (int(Key.LControl),), (int(KeyState.Down),), 'tests.test_bindings:on_save', ()),
+        (int(Key.X), (), (int(KeyState.Down), int(KeyState.Up)), 'tests.test_bindings:on_cut',
+         (('layer', 'edit'),)),
+    ]
+    listed = compile_bindings({'bindings': [{'keys': 'Ctrl+S', 'handler': 'tests.test_bindings:on_save'}]})
+    assert listed == table[:1]
+
+
+@pytest.mark.parametrize('data', [
+    {},
+    {'bindings': {'A': 'no_module_separator'}},
+    {'bindings': {'A': {'handler': 'tests.test_bindings:on_save', 'repeat': 1}}},
+    {'bindings': {'A': {'handler': 'tests.test_bindings:on_save', 'events': 'Sideways'}}},
+    {'bindings': {'A': {'handler': 'tests.test_bindings:on_save', 'execution': 'nowhere'}}},
+])
+def test_compile_errors(data):
+    with pytest.raises(BindingError):
+        compile_bindings(data)
+
+
+def test_load_registers_hotkeys_and_layers(tmp_path):
+    del fired[:]
+    cls = hotkey_class()
+    keymap = Keymap(cls)
+    path = write(tmp_path, {'bindings': {
+        'Ctrl+S': 'tests.test_bindings:on_save',
+        'X': {'handler': 'tests.test_bindings.on_cut', 'layer': 'edit'},
+    }})
+    hotkeys = load(path, hotkey_class=cls, keymap=keymap)
+    assert len(hotkeys) == 2
+    press(cls, Key.LControl)
+    tap(cls, Key.S)
+    tap(cls, Key.X)
+    keymap.activate('edit')
+    tap(cls, Key.X)
+    assert fired == ['save', 'cut']
+
+
+def test_layer_needs_keymap(tmp_path):
+    path = write(tmp_path, {'bindings': {'X': {'handler': 'tests.test_bindings:on_cut', 'layer': 'edit'}}})
+    with pytest.raises(BindingError):
+        load(path, hotkey_class=hotkey_class())
+
+
+def test_unresolvable_handler(tmp_path):
+    path = write(tmp_path, {'bindings': {'X': 'tests.test_bindings:missing'}})
+    with pytest.raises(BindingError):
+        load(path, hotkey_class=hotkey_class())
+
+
+def test_cache_is_used_until_the_file_changes(tmp_path, monkeypatch):
+    path = write(tmp_path, {'bindings': {'F5': 'tests.test_bindings:on_save'}})
+    records = read_bindings(path)
+    assert (tmp_path / ('bindings.json' + CACHE_SUFFIX)).exists()
+
+    def fail(data):
+        raise AssertionError('compiled again')
+
+    monkeypatch.setattr(bindings, 'compile_bindings', fail)
+    assert read_bindings(path) == records
+    monkeypatch.undo()
+    write(tmp_path, {'bindings': {'F6': 'tests.test_bindings:on_save'}})
+    assert read_bindings(path)[0][0] == int(Key.F6)
+
+
+def test_invalid_file_names_the_path(tmp_path):
+    path = write(tmp_path, '{"bindings": ')
+    with pytest.raises(BindingError, match='bindings.json'):
+        read_bindings(path)
+
+
+def test_toml(tmp_path):
+    pytest.importorskip('tomllib')
+    path = write(tmp_path, '[[bindings]]\nkeys = "Ctrl+K"\nhandler = "tests.test_bindings:on_cut"\n',
+                 'bindings.toml')
+    assert read_bindings(path) == [(int(Key.K), (int(Key.LControl),), (int(KeyState.Down),),
+                                    'tests.test_bindings:on_cut', ())]
@@ -0,0 +1,88 @@
+"""Mouse coalescing tests, on a ``TimerScheduler`` without a thread and a fake clock."""
+from hotikeys import EventId, Hotkey, NullSource
+from hotikeys.coalesce import MouseCoalescer
+from hotikeys.lleventargs import LowLevelMouseArgs
+from hotikeys.timed import TimerScheduler
+from tests.hookdata import lparam, overwrite
+
+MOVE = int(EventId.WM_MOUSEMOVE)
+WHEEL = int(EventId.WM_MOUSEWHEEL)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def coalescer(interval=0.016):
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock, threaded=False)
+    delivered = []
+    return clock, scheduler, delivered, MouseCoalescer(interval, delivered.append, scheduler)
+
+
+def move(coalescer, x, y, time):
+    return coalescer.add(LowLevelMouseArgs(0, MOVE, (x, y, 0, 0, time)))
+
+
+def test_first_event_delivered_right_away():
+    _, _, _, merged = coalescer()
+    args = move(merged, 5, 5, 0)
+    assert (args.x, args.samples, args.dx) == (5, 1, 0)
+
+
+def test_moves_within_interval_are_merged():
+    _, _, _, merged = coalescer()
+    move(merged, 0, 0, 0)
+    assert move(merged, 3, 4, 5) is None
+    assert move(merged, 6, 8, 10) is None
+    args = move(merged, 10, 10, 20)
+    assert (args.x, args.y, args.dx, args.dy, args.samples) == (10, 10, 10, 10, 3)
+
+
+def test_trailing_event_delivered_at_end_of_interval():
+    clock, scheduler, delivered, merged = coalescer()
+    move(merged, 0, 0, 0)
+    move(merged, 28, 28, 5)
+    clock.now = 0.010
+    scheduler.run_due()
+    assert delivered == []
+    clock.now = 0.016
+    scheduler.run_due()
+    assert [(args.x, args.y, args.samples) for args in delivered] == [(28, 28, 1)]
+    clock.now = 0.1
+    scheduler.run_due()
+    assert len(delivered) == 1
+
+
+def test_trailing_event_outlives_hook_data():
+    clock, scheduler, delivered, merged = coalescer()
+    move(merged, 0, 0, 0)
+    data, buffer = lparam(40, 50, 0, 0, 5)
+    merged.add(LowLevelMouseArgs(0, MOVE, data))
+    overwrite(buffer)
+    clock.now = 0.016
+    scheduler.run_due()
+    assert [(args.x, args.y, args.time) for args in delivered] == [(40, 50, 5)]
+
+
+def test_wheel_deltas_are_summed():
+    _, _, _, merged = coalescer()
+    merged.add(LowLevelMouseArgs(0, WHEEL, (0, 0, 120 << 16, 0, 0)))
+    merged.add(LowLevelMouseArgs(0, WHEEL, (0, 0, 120 << 16, 0, 5)))
+    merged.add(LowLevelMouseArgs(0, WHEEL, (0, 0, 120 << 16, 0, 8)))
+    (args,) = merged.flush()
+    assert (args.wheel_delta, args.samples) == (240, 2)
+
+
+def test_button_event_flushes_hotkey():
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    received = []
+    cls(lambda args: received.append(args.x), events=EventId.WM_MOUSEMOVE, coalesce=10.0)
+    for x in range(5):
+        cls.feed_mouse(0, MOVE, (x, 0, 0, 0, x))
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), (4, 0, 0, 0, 5))
+    assert received == [0, 4]
@@ -0,0 +1,111 @@
+"""Dispatch index tests, run with ``python -m pytest tests`` from the repository root.
+
+Synthetic event args are fed straight into ``Hotkey.dispatch`` of hotkey classes with a ``NullSource``.
+"""
+from hotikeys import EventId, Hotkey, Key, KeyState, NullSource
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def tap(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def test_key_change_reindexes():
+    cls = hotkey_class()
+    received = []
+    hotkey = cls(lambda args: received.append(args.vkey), Key.A)
+    tap(cls, Key.A)
+    hotkey.key = Key.B
+    tap(cls, Key.A)
+    tap(cls, Key.B)
+    assert received == [int(Key.A), int(Key.B)]
+
+
+def test_events_change_reindexes():
+    cls = hotkey_class()
+    received = []
+    hotkey = cls(lambda args: received.append(args.event.state), Key.A)
+    hotkey.events = KeyState.Up
+    tap(cls, Key.A)
+    hotkey.events = (KeyState.Down, KeyState.Up)
+    tap(cls, Key.A)
+    assert received == [KeyState.Up, KeyState.Down, KeyState.Up]
+
+
+def test_modifiers_change():
+    cls = hotkey_class()
+    received = []
+    hotkey = cls(lambda: received.append(1), Key.A, Key.LControl)
+    tap(cls, Key.A)
+    hotkey.modifiers = None
+    tap(cls, Key.A)
+    hotkey.modifiers = (Key.LShift,)
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(Key.LShift), 0, 0, 0)))
+    tap(cls, Key.A)
+    assert received == [1, 1]
+
+
+def test_wildcard_and_unregister():
+    cls = hotkey_class()
+    received = []
+    wildcard = cls(lambda args: received.append(args.vkey))
+    tap(cls, Key.A)
+    tap(cls, Key.B)
+    wildcard.unregister()
+    tap(cls, Key.C)
+    wildcard.register()
+    tap(cls, Key.D)
+    assert received == [int(Key.A), int(Key.B), int(Key.D)]
+
+
+def test_key_change_while_unregistered():
+    cls = hotkey_class()
+    received = []
+    hotkey = cls(lambda args: received.append(args.vkey), Key.A, register=False)
+    hotkey.key = Key.B
+    tap(cls, Key.B)
+    hotkey.register()
+    tap(cls, Key.A)
+    tap(cls, Key.B)
+    assert received == [int(Key.B)]
+
+
+def test_removed_hotkeys_are_skipped_and_compacted():
+    cls = hotkey_class()
+    received = []
+    hotkeys = [cls(lambda args, i=i: received.append(i)) for i in range(200)]
+    table = cls._registry
+    for hotkey in hotkeys[:100]:
+        hotkey.unregister()
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(Key.A), 0, 0, 0)))
+    assert received == list(range(100, 200))
+    assert len(table._dead) == 100 and len(table) == 100
+    hotkeys[150].unregister()
+    assert not table._dead
+    assert all(len(bucket) == 99 for bucket in table._snapshot.buckets.values())
+
+
+def test_reregister_removed_hotkey():
+    cls = hotkey_class()
+    received = []
+    first = cls(lambda: received.append('first'), Key.A, events=KeyState.Down)
+    cls(lambda: received.append('second'), Key.A, events=KeyState.Down)
+    first.unregister()
+    first.key = Key.B
+    first.register()
+    tap(cls, Key.A)
+    tap(cls, Key.B)
+    assert received == ['second', 'first']
+
+
+def test_dispatch_keys_leave_out_removed_hotkeys():
+    cls = hotkey_class()
+    hotkey = cls(lambda: None, Key.A, events=KeyState.Down)
+    assert cls._registry.dispatch_keys() == ((int(Key.A), int(KeyState.Down)),)
+    hotkey.unregister()
+    assert cls._registry.dispatch_keys() == ()
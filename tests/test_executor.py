@@ -0,0 +1,77 @@
+"""Handler executor tests, with calls gated by events so the workers' timing doesn't matter."""
+import threading
+import time
+
+from hotikeys.executor import HandlerPool, HandlerThread
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_thread_keeps_order_across_close():
+    executor = HandlerThread()
+    gate = threading.Event()
+    ran = []
+    executor.submit(None, gate.wait)
+    for i in range(5):
+        executor.submit(None, ran.append, (i,))
+    executor.close()
+    for i in range(5, 10):
+        executor.submit(None, ran.append, (i,))
+    time.sleep(0.05)
+    assert ran == []
+    gate.set()
+    wait_for(lambda: executor.completed == 11)
+    assert ran == list(range(10))
+    executor.close()
+
+
+def test_thread_close_from_worker_with_full_queue():
+    executor = HandlerThread(max_queued=2)
+    gate = threading.Event()
+    closed = threading.Event()
+    ran = []
+
+    def close():
+        gate.wait()
+        executor.close()
+        closed.set()
+
+    executor.submit(None, close)
+    wait_for(lambda: executor.queued == 0)
+    executor.submit(None, ran.append, (1,))
+    executor.submit(None, ran.append, (2,))
+    assert not executor.submit(None, ran.append, (3,))
+    gate.set()
+    assert closed.wait(5.0)
+    wait_for(lambda: executor.completed == 3)
+    executor.submit(None, ran.append, (4,))
+    wait_for(lambda: executor.completed == 4)
+    assert ran == [1, 2, 4]
+    assert executor.stats() == dict(queued=0, submitted=4, completed=4, dropped=1)
+    executor.close()
+
+
+def test_pool_keeps_order_per_key():
+    pool = HandlerPool(workers=4)
+    ran = {key: [] for key in 'abcd'}
+    for i in range(200):
+        for key in 'abcd':
+            pool.submit(key, ran[key].append, (i,))
+    wait_for(lambda: pool.completed == 800)
+    assert all(calls == list(range(200)) for calls in ran.values())
+
+
+def test_pool_drops_when_full():
+    pool = HandlerPool(workers=1, max_queued=2)
+    gate = threading.Event()
+    pool.submit('a', gate.wait)
+    pool.submit('a', lambda: None)
+    assert not pool.submit('b', lambda: None)
+    gate.set()
+    wait_for(lambda: pool.completed == 2)
+    assert pool.stats() == dict(queued=0, submitted=2, completed=2, dropped=1)
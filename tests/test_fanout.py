@@ -0,0 +1,78 @@
+"""Shared memory fan-out tests, with a publisher and subscribers in this and a child process."""
+import subprocess
+import sys
+
+import pytest
+
+from hotikeys import EventId, Hotkey, NullSource
+from hotikeys.enums import InputDevice
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+from hotikeys.fanout import Publisher, Subscriber  # noqa: E402
+
+KEYBOARD = int(InputDevice.Keyboard)
+KEY_DOWN = int(EventId.WM_KEYDOWN)
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def feed(cls, count, start=0):
+    for i in range(start, start + count):
+        cls.feed_keyboard(0, KEY_DOWN, (0x41, i, 0, 1000 + i))
+
+
+def test_subscriber_reads_published_events():
+    cls = hotkey_class()
+    with Publisher(capacity=16) as publisher:
+        publisher.attach(cls)
+        feed(cls, 2)
+        with Subscriber(publisher.name) as subscriber:
+            assert subscriber.read() == []
+            feed(cls, 3, 2)
+            assert subscriber.pending == 3
+            assert subscriber.read(max_records=2) == [(KEYBOARD, 0, KEY_DOWN, (0x41, 2, 0, 1002)),
+                                                      (KEYBOARD, 0, KEY_DOWN, (0x41, 3, 0, 1003))]
+            assert subscriber.wait(timeout=0)
+            assert [event[3][1] for event in subscriber.read()] == [4]
+            assert not subscriber.wait(timeout=0.01)
+        with Subscriber(publisher.name, from_start=True) as subscriber:
+            assert [event[3][1] for event in subscriber.read()] == [0, 1, 2, 3, 4]
+
+
+def test_subscriber_that_falls_behind_skips_overwritten_records():
+    cls = hotkey_class()
+    with Publisher(capacity=4) as publisher:
+        publisher.attach(cls)
+        with Subscriber(publisher.name) as subscriber:
+            feed(cls, 10)
+            assert [event[3][1] for event in subscriber.read()] == [6, 7, 8, 9]
+            assert subscriber.lost == 6
+
+
+def test_attach_to_a_block_that_isnt_a_ring():
+    from multiprocessing import shared_memory
+    memory = shared_memory.SharedMemory(create=True, size=128)
+    try:
+        with pytest.raises(ValueError):
+            Subscriber(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_subscriber_in_another_process():
+    cls = hotkey_class()
+    with Publisher(capacity=16) as publisher:
+        publisher.attach(cls)
+        feed(cls, 3)
+        code = ('from hotikeys.fanout import Subscriber\n'
+                'with Subscriber({!r}, from_start=True) as subscriber:\n'
+                '    print([event[3][1] for event in subscriber.read()])\n').format(publisher.name)
+        output = subprocess.check_output([sys.executable, '-c', code], timeout=60, universal_newlines=True)
+        assert output.strip() == '[0, 1, 2]'
+        feed(cls, 1, 3)
+        with Subscriber(publisher.name, from_start=True) as subscriber:
+            assert len(subscriber.read()) == 4
@@ -0,0 +1,60 @@
+"""Event filter tests, for the truth tables and for ``Hotkey(where=...)`` during dispatch."""
+import pytest
+
+from hotikeys import Device, EventId, Extended, Hotkey, Injected, Key, NullSource
+from hotikeys.filters import ALTDOWN, AltDown, EXTENDED, INJECTED, KEYBOARD, MOUSE, keyboard_features, mouse_features
+from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def tap(cls, vkey, flags=0):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, flags, 0)))
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, flags | 0x80, 0)))
+
+
+def test_features_from_hook_flags():
+    assert keyboard_features(0) == KEYBOARD
+    assert keyboard_features(0x01 | 0x10 | 0x20) == KEYBOARD | EXTENDED | INJECTED | ALTDOWN
+    assert mouse_features(0x01) == MOUSE | INJECTED
+
+
+def test_combined_filters():
+    where = Injected(False) & Device.Keyboard
+    assert where(KEYBOARD)
+    assert not where(KEYBOARD | INJECTED)
+    assert not where(MOUSE)
+    assert (Extended() | AltDown())(KEYBOARD | ALTDOWN)
+    assert (~Device.Mouse)(KEYBOARD) and not (~Device.Mouse)(MOUSE)
+    assert ~~Device.Mouse == Device.Mouse
+    assert repr(where) == '<Filter (Injected(False) & Device.Keyboard)>'
+
+
+def test_matches_args():
+    assert Device.Mouse.matches(LowLevelMouseArgs(0, int(EventId.WM_LBUTTONDOWN), (0, 0, 0, 0, 0)))
+    assert Injected().matches(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (0x41, 0, 0x10, 0)))
+
+
+def test_where_drops_rejected_events():
+    cls = hotkey_class()
+    received = []
+    cls(lambda args: received.append(args.flags.injected), Key.A, where=Injected(False))
+    tap(cls, Key.A, 0x10)
+    tap(cls, Key.A)
+    assert received == [False]
+
+
+def test_changing_where_takes_effect():
+    cls = hotkey_class()
+    received = []
+    hotkey = cls(lambda: received.append(1), Key.A, where=Injected())
+    tap(cls, Key.A)
+    hotkey.where = None
+    tap(cls, Key.A)
+    hotkey.where = Extended()
+    tap(cls, Key.A)
+    assert received == [1]
+    with pytest.raises(TypeError):
+        hotkey.where = 'injected'
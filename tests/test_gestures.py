@@ -0,0 +1,55 @@
+"""Gesture recognizer tests, with strokes fed as mouse events."""
+from hotikeys import EventId, Gesture, Hotkey, Key, NullSource
+from hotikeys.enums import ExecutionMode
+from hotikeys.gestures import GestureRecognizer
+from tests.hookdata import lparam
+
+
+def recognizer():
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    return cls, GestureRecognizer(cls, Key.RButton, execution=ExecutionMode.Inline)
+
+
+def draw(cls, points, hook_data=False):
+    """Press the right button at the first point, move through the rest and release at the last."""
+    def feed(code, x, y):
+        cls.feed_mouse(0, int(code), lparam(x, y, 0, 0, 0)[0] if hook_data else (x, y, 0, 0, 0))
+
+    feed(EventId.WM_RBUTTONDOWN, *points[0])
+    for x, y in points[1:]:
+        feed(EventId.WM_MOUSEMOVE, x, y)
+    feed(EventId.WM_RBUTTONUP, *points[-1])
+
+
+def test_swipes_match_their_template():
+    cls, shared = recognizer()
+    matched = []
+    for name in ('left', 'right', 'up', 'down'):
+        Gesture(lambda match: matched.append(match.name), name, recognizer=shared)
+    draw(cls, [(500 + 10 * i, 500) for i in range(20)])
+    draw(cls, [(500, 500 - 10 * i) for i in range(20)])
+    assert matched == ['right', 'up']
+
+
+def test_click_is_not_a_gesture():
+    cls, shared = recognizer()
+    matched = []
+    Gesture(lambda: matched.append(1), 'left', recognizer=shared)
+    draw(cls, [(100, 100), (102, 101)])
+    assert matched == []
+
+
+def test_left_swipe_to_screen_edge():
+    cls, shared = recognizer()
+    matched = []
+    Gesture(lambda match: matched.append(match.name), 'left', recognizer=shared)
+    draw(cls, [(200 - 10 * i, 0) for i in range(21)], hook_data=True)
+    assert matched == ['left']
+
+
+def test_moves_only_recorded_while_button_held():
+    cls, shared = recognizer()
+    Gesture(print, 'left', recognizer=shared)
+    cls.feed_mouse(0, int(EventId.WM_MOUSEMOVE), (5, 5, 0, 0, 0))
+    assert shared.stroke.count == 0
+    assert not shared.move_hotkey.registered
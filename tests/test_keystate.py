@@ -0,0 +1,68 @@
+"""Pressed key expiry tests, driven by a fake clock on the hotkey class."""
+from hotikeys import EventId, Hotkey, Key, NullSource
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def hotkey_class(clock, **options):
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource(), clock=clock, purge_delay=10.0, **options))
+
+
+def feed(cls, vkey, code=EventId.WM_KEYDOWN):
+    flags = 0x80 if code == EventId.WM_KEYUP else 0
+    cls.dispatch(LowLevelKeyboardArgs(0, int(code), (int(vkey), 0, flags, 0)))
+
+
+def test_held_key_expires_after_purge_delay():
+    clock = FakeClock()
+    cls = hotkey_class(clock)
+    feed(cls, Key.LControl)
+    clock.now = 9.0
+    feed(cls, Key.A)
+    assert cls.is_pressed(Key.LControl)
+    clock.now = 10.5
+    feed(cls, Key.B)
+    assert not cls.is_pressed(Key.LControl)
+    assert cls.is_pressed(Key.A)
+
+
+def test_repeat_refreshes_expiry():
+    clock = FakeClock()
+    cls = hotkey_class(clock)
+    feed(cls, Key.LShift)
+    clock.now = 8.0
+    feed(cls, Key.LShift)
+    clock.now = 15.0
+    feed(cls, Key.A)
+    assert cls.is_pressed(Key.LShift)
+    clock.now = 18.5
+    feed(cls, Key.A)
+    assert not cls.is_pressed(Key.LShift)
+
+
+def test_expired_modifier_stops_matching():
+    clock = FakeClock()
+    cls = hotkey_class(clock)
+    received = []
+    cls(lambda: received.append(clock.now), Key.A, Key.LControl)
+    feed(cls, Key.LControl)
+    feed(cls, Key.A)
+    feed(cls, Key.A, EventId.WM_KEYUP)
+    clock.now = 11.0
+    feed(cls, Key.A)
+    assert received == [0.0]
+
+
+def test_release_removes_key():
+    clock = FakeClock()
+    cls = hotkey_class(clock)
+    feed(cls, Key.A)
+    feed(cls, Key.A, EventId.WM_KEYUP)
+    assert not cls.is_pressed(Key.A)
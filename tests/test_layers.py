@@ -0,0 +1,113 @@
+"""Keymap and layer tests, with events dispatched to a hotkey class with a ``NullSource``."""
+import pytest
+
+from hotikeys import EventId, Hotkey, Key, Keymap, NullSource
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+
+
+def keymap_setup():
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    return cls, Keymap(cls)
+
+
+def press(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+
+
+def release(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def tap(cls, vkey):
+    press(cls, vkey)
+    release(cls, vkey)
+
+
+def test_layer_only_fires_while_active():
+    cls, keymap = keymap_setup()
+    fired = []
+    keymap.layer('edit').bind(lambda: fired.append('edit'), Key.X)
+    tap(cls, Key.X)
+    keymap.activate('edit')
+    tap(cls, Key.X)
+    keymap.deactivate('edit')
+    tap(cls, Key.X)
+    assert fired == ['edit']
+
+
+def test_top_layer_wins_and_falls_through():
+    cls, keymap = keymap_setup()
+    fired = []
+    keymap.base.bind(lambda: fired.append('base x'), Key.X)
+    keymap.base.bind(lambda: fired.append('base y'), Key.Y)
+    keymap.layer('edit').bind(lambda: fired.append('edit x'), Key.X)
+    keymap.activate('edit')
+    tap(cls, Key.X)
+    tap(cls, Key.Y)
+    assert fired == ['edit x', 'base y']
+
+
+def test_layer_without_fallthrough_hides_layers_below():
+    cls, keymap = keymap_setup()
+    fired = []
+    keymap.base.bind(lambda: fired.append('base'), Key.Y)
+    keymap.layer('game', fallthrough=False).bind(lambda: fired.append('game'), Key.W)
+    keymap.switch('game')
+    tap(cls, Key.Y)
+    tap(cls, Key.W)
+    keymap.switch(keymap.base)
+    tap(cls, Key.Y)
+    assert fired == ['game', 'base']
+
+
+def test_momentary_layer():
+    cls, keymap = keymap_setup()
+    fired = []
+    game = keymap.layer('game')
+    game.bind(lambda: fired.append('game'), Key.W)
+    keymap.momentary(game, Key.F13)
+    tap(cls, Key.W)
+    press(cls, Key.F13)
+    tap(cls, Key.W)
+    release(cls, Key.F13)
+    tap(cls, Key.W)
+    assert fired == ['game']
+    assert keymap.active == (keymap.base,)
+
+
+def test_toggle_and_base_layer():
+    _, keymap = keymap_setup()
+    edit = keymap.layer('edit')
+    assert keymap.toggle(edit)
+    assert keymap.active == (edit, keymap.base)
+    assert not keymap.toggle('edit')
+    with pytest.raises(ValueError):
+        keymap.deactivate('base')
+    assert not keymap.toggle(keymap.base)
+    assert keymap.active == (keymap.base,)
+
+
+def test_unregister_and_move_between_layers():
+    cls, keymap = keymap_setup()
+    fired = []
+    hotkey = keymap.base.bind(lambda: fired.append(1), Key.X)
+    tap(cls, Key.X)
+    hotkey.unregister()
+    tap(cls, Key.X)
+    edit = keymap.layer('edit')
+    edit.add(hotkey)
+    tap(cls, Key.X)
+    keymap.activate(edit)
+    tap(cls, Key.X)
+    assert fired == [1, 1]
+    assert hotkey in edit and hotkey not in keymap.base
+
+
+def test_keymap_files_only_keys_with_bindings():
+    cls, keymap = keymap_setup()
+    hotkey = keymap.base.bind(lambda: None, Key.X)
+    assert len(cls._registry.dispatch_keys()) == 1
+    hotkey.unregister()
+    assert cls._registry.dispatch_keys() == ()
+    keymap.close()
+    assert keymap not in cls._registry
@@ -0,0 +1,48 @@
+"""Event args tests, with hook data backed by ctypes memory."""
+import threading
+
+from hotikeys import EventId, Hotkey, Key, NullSource
+from hotikeys.lleventargs import LowLevelKeyboardArgs, LowLevelMouseArgs
+from tests.hookdata import lparam, overwrite
+
+
+def test_keyboard_args_outlive_hook_data():
+    data, buffer = lparam(int(Key.A), 30, 0x10, 1234, 0)
+    args = LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), data)
+    overwrite(buffer)
+    assert (args.vkey, args.scan_code, args.time) == (int(Key.A), 30, 1234)
+    assert args.flags.injected
+
+
+def test_mouse_args_outlive_hook_data():
+    data, buffer = lparam(10, 20, 0x780000, 0, 99)
+    args = LowLevelMouseArgs(0, int(EventId.WM_MOUSEWHEEL), data)
+    overwrite(buffer)
+    assert (args.x, args.y, args.time, args.wheel_delta) == (10, 20, 99, 0x78)
+    assert not args.flags.injected
+
+
+def test_handler_on_thread_reads_copied_fields():
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    received = []
+    done = threading.Event()
+    gate = threading.Event()
+
+    def handler(args):
+        gate.wait(1)
+        received.append((args.vkey, args.time))
+        done.set()
+
+    cls(handler, Key.A, execution='dedicated_thread')
+    data, buffer = lparam(int(Key.A), 0, 0, 777, 0)
+    cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), data)
+    overwrite(buffer)
+    gate.set()
+    assert done.wait(1)
+    assert received == [(int(Key.A), 777)]
+
+
+def test_lazy_fields_decode_once():
+    args = LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(Key.B), 0, 0, 5))
+    assert args.event is EventId.WM_KEYDOWN
+    assert args.event is args.event
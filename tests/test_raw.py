@@ -0,0 +1,66 @@
+"""Raw handler tests, with events fed through the hook path as ctypes hook data."""
+import threading
+
+from hotikeys import EventId, ExecutionMode, Hotkey, Key, NullSource
+from hotikeys import core
+from hotikeys.lleventargs import RawEvent
+from tests.hookdata import lparam
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def key_down(cls, vkey, flags=0, time=0):
+    data, _ = lparam(int(vkey), 0, flags, time, 0)
+    cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), data)
+
+
+def test_raw_handler_gets_ints_without_args(monkeypatch):
+    cls = hotkey_class()
+    received = []
+    cls(lambda *event: received.append(event), Key.A, raw=True)
+
+    def no_args(*_):
+        raise AssertionError('event args were built')
+
+    monkeypatch.setattr(core, 'LowLevelKeyboardArgs', no_args)
+    key_down(cls, Key.A, 0x10, 1234)
+    key_down(cls, Key.B)
+    cls.feed_keyboard(0, int(EventId.WM_KEYUP), lparam(int(Key.A), 0, 0x80, 0, 0)[0])
+    key_down(cls, Key.A)
+    assert received == [(int(Key.A), int(EventId.WM_KEYDOWN), 0x10, 1234),
+                        (int(Key.A), int(EventId.WM_KEYDOWN), 0, 0)]
+
+
+def test_raw_and_regular_hotkeys_on_one_event():
+    cls = hotkey_class()
+    received = []
+    cls(lambda *event: received.append(event), Key.A, raw=True)
+    cls(lambda args: received.append(args.vkey), Key.A)
+    key_down(cls, Key.A, time=7)
+    assert received == [(int(Key.A), int(EventId.WM_KEYDOWN), 0, 7), int(Key.A)]
+
+
+def test_raw_handler_on_executor_gets_raw_event():
+    cls = hotkey_class()
+    received = []
+    done = threading.Event()
+
+    def handler(*event):
+        received.append(event)
+        done.set()
+
+    cls(handler, Key.A, raw=True, execution=ExecutionMode.DedicatedThread)
+    key_down(cls, Key.A, time=99)
+    assert done.wait(5.0)
+    assert received == [RawEvent(int(Key.A), int(EventId.WM_KEYDOWN), 0, 99)]
+
+
+def test_raw_mouse_handler():
+    cls = hotkey_class()
+    received = []
+    cls(lambda *event: received.append(event), Key.LButton, raw=True)
+    data, _ = lparam(10, 20, 0, 0x01, 555)
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), data)
+    assert received == [(int(Key.LButton), int(EventId.WM_LBUTTONDOWN), 0x01, 555)]
@@ -0,0 +1,73 @@
+"""Recording tests, recording raw events fed to a hotkey class and replaying them into another."""
+import io
+import threading
+
+from hotikeys import EventId, Hotkey, NullSource
+from hotikeys.enums import InputDevice
+from hotikeys.recording import MAGIC, RECORD, Recorder, Replayer
+from tests.hookdata import lparam, overwrite
+
+
+class Tap(object):
+    def __init__(self):
+        self.events = []
+
+    def on_raw(self, device, ncode, wparam, lparam):
+        words = 5 if device is InputDevice.Mouse else 4
+        self.events.append((int(device), ncode, wparam, tuple(lparam[i] or 0 for i in range(words))))
+
+
+class ThreadFile(io.BytesIO):
+    """A file that remembers the threads it was written from."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def write(self, data):
+        self.threads.add(threading.current_thread())
+        return super().write(data)
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def feed_events(cls, count):
+    for i in range(count):
+        cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), (0x41 + i % 26, i, 0, 1000 + i))
+        data, buffer = lparam(i, 2 * i, 0, 0, 1000 + i)
+        cls.feed_mouse(0, int(EventId.WM_MOUSEMOVE), data)
+        overwrite(buffer)
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / 'events.rec')
+    recorded = hotkey_class()
+    with Recorder(path, buffer_size=16) as recorder:
+        recorder.attach(recorded)
+        feed_events(recorded, 50)
+        assert recorder.recorded == 100
+
+    replayed = hotkey_class()
+    tap = Tap()
+    replayed.add_tap(tap)
+    with Replayer(path) as replayer:
+        assert len(replayer) == 100
+        assert replayer.replay(replayed) == 0
+    assert tap.events[:2] == [(int(InputDevice.Keyboard), 0, int(EventId.WM_KEYDOWN), (0x41, 0, 0, 1000)),
+                              (int(InputDevice.Mouse), 0, int(EventId.WM_MOUSEMOVE), (0, 0, 0, 0, 1000))]
+    assert tap.events[-1] == (int(InputDevice.Mouse), 0, int(EventId.WM_MOUSEMOVE), (49, 98, 0, 0, 1049))
+
+
+def test_full_buffers_are_written_off_the_hook_thread():
+    file = ThreadFile()
+    recorder = Recorder(file, buffer_size=4)
+    cls = hotkey_class()
+    recorder.attach(cls)
+    file.threads.clear()
+    feed_events(cls, 10)
+    recorder.flush()
+    assert threading.current_thread() not in file.threads
+    assert len(file.getvalue()) == len(MAGIC) + 20 * RECORD.size
+    recorder.close()
@@ -0,0 +1,89 @@
+"""Region binding tests."""
+import random
+
+from hotikeys import EventId, Hotkey, Key, Keymap, NullSource, Region, RegionMap
+from tests.hookdata import lparam
+
+
+def hotkey_class():
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+
+
+def click(cls, x, y):
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), (x, y, 0, 0, 0))
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONUP), (x, y, 0, 0, 0))
+
+
+def test_clicks_inside_and_outside():
+    cls = hotkey_class()
+    received = []
+    region = Region(100, 100, 300, 200)
+    cls(lambda args: received.append(('region', args.x)), Key.LButton, region=region)
+    cls(lambda args: received.append(('any', args.x)), Key.LButton)
+    click(cls, 10, 10)
+    click(cls, 150, 150)
+    click(cls, 300, 150)
+    assert received == [('any', 10), ('region', 150), ('any', 150), ('any', 300)]
+
+
+def test_move_refiles_region():
+    cls = hotkey_class()
+    received = []
+    region = Region(0, 0, 10, 10)
+    cls(lambda args: received.append(args.point), Key.LButton, region=region)
+    region.move(1000, 1000, 1100, 1100)
+    click(cls, 5, 5)
+    click(cls, 1050, 1099)
+    assert received == [(1050, 1099)]
+
+
+def test_zero_coordinates_from_ctypes():
+    cls = hotkey_class()
+    received = []
+    keymap = Keymap(cls)
+    cls(lambda args: received.append(('hotkey', args.point)), Key.LButton, region=Region(0, 0, 10, 10))
+    keymap.base.bind(lambda args: received.append(('layer', args.point)), Key.LButton, region=Region(0, 0, 5, 5))
+    data, _ = lparam(0, 0, 0, 0, 0)
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), data)
+    assert sorted(received) == [('hotkey', (0, 0)), ('layer', (0, 0))]
+
+
+def test_keyboard_events_ignore_region():
+    cls = hotkey_class()
+    received = []
+    cls(lambda: received.append(1), Key.A, region=Region(0, 0, 1, 1))
+    cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), (int(Key.A), 0, 0, 0))
+    assert received == [1]
+
+
+def test_region_only_indexed_while_registered():
+    cls = hotkey_class()
+    region = Region(0, 0, 10, 10)
+    hotkey = cls(print, Key.LButton, region=region)
+    assert len(cls._regions) == 1
+    hotkey.unregister()
+    hotkey.unregister()
+    assert not cls._regions
+    hotkey.register()
+    hotkey.region = None
+    assert not cls._regions
+
+
+def test_region_map_matches_brute_force():
+    rng = random.Random(0)
+    regions = RegionMap(cell_size=64)
+    live = []
+    for _ in range(200):
+        x, y = rng.randrange(2000), rng.randrange(2000)
+        region = Region(x, y, x + rng.randrange(400), y + rng.randrange(400))
+        regions.add(region)
+        live.append(region)
+    for region in live[:50]:
+        x, y = rng.randrange(2000), rng.randrange(2000)
+        region.move(x, y, x + rng.randrange(300), y + rng.randrange(300))
+    for region in live[150:]:
+        regions.remove(region)
+    live = live[:150]
+    for _ in range(2000):
+        x, y = rng.randrange(-50, 2500), rng.randrange(-50, 2500)
+        assert set(regions.at(x, y)) == {region for region in live if region.contains(x, y)}
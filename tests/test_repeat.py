@@ -0,0 +1,62 @@
+"""Auto-repeat and debounce tests, with plain functions as the class clock."""
+from hotikeys import EventId, Hotkey, Key, KeyState, NullSource, RepeatPolicy
+
+now = [0.0]
+
+
+def clock():
+    return now[0]
+
+
+def hotkey_class(**options):
+    now[0] = 0.0
+    return type('TestHotkey', (Hotkey,), dict(source=NullSource(), clock=clock, **options))
+
+
+def down(cls, vkey=Key.A):
+    cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0))
+
+
+def test_repeats_suppressed_by_default():
+    cls = hotkey_class()
+    received = []
+    cls(lambda: received.append(1), Key.A)
+    for _ in range(3):
+        down(cls)
+    assert received == [1]
+
+
+def test_repeats_passed():
+    cls = hotkey_class()
+    received = []
+    cls(lambda: received.append(1), Key.A, repeat=RepeatPolicy.Pass)
+    for _ in range(3):
+        down(cls)
+    assert received == [1, 1, 1]
+
+
+def test_repeats_throttled_with_function_clock():
+    cls = hotkey_class()
+    received = []
+    cls(lambda: received.append(now[0]), Key.A, repeat=10)
+    down(cls)
+    for step in range(1, 11):
+        now[0] = step * 0.03
+        down(cls)
+    assert [round(t, 2) for t in received] == [0.0, 0.03, 0.15, 0.27]
+
+
+def test_debounced_click_keeps_release():
+    cls = hotkey_class(mouse_debounce=0.05)
+    received = []
+    cls(lambda: received.append('down'), Key.LButton)
+    cls(lambda: received.append('up'), Key.LButton, events=KeyState.Up)
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), (0, 0, 0, 0, 0))
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONUP), (0, 0, 0, 0, 0))
+    assert received == ['down', 'up']
+    assert not cls.is_pressed(Key.LButton)
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), (0, 0, 0, 0, 0))
+    assert received == ['down', 'up']
+    now[0] = 0.1
+    cls.feed_mouse(0, int(EventId.WM_LBUTTONDOWN), (0, 0, 0, 0, 0))
+    assert received == ['down', 'up', 'down']
@@ -0,0 +1,114 @@
+"""Sequence tests, with strokes dispatched to a hotkey class with a fake clock."""
+import pytest
+
+from hotikeys import EventId, Hotkey, Key, NullSource, Sequence
+from hotikeys.exceptions import BlockNextHookException
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+from hotikeys.sequence import SequenceAutomaton
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def sequence_setup():
+    clock = FakeClock()
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource(), clock=clock))
+    return clock, SequenceAutomaton(cls)
+
+
+def press(automaton, vkey):
+    automaton.hotkey_class.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+
+
+def release(automaton, vkey):
+    automaton.hotkey_class.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def tap(automaton, vkey):
+    press(automaton, vkey)
+    release(automaton, vkey)
+
+
+def test_sequence_fires_once_complete():
+    _, automaton = sequence_setup()
+    fired = []
+    Sequence(lambda: fired.append(1), [Key.Space, Key.F, Key.F], automaton=automaton)
+    for key in (Key.Space, Key.F):
+        tap(automaton, key)
+    assert fired == []
+    tap(automaton, Key.F)
+    assert fired == [1]
+    tap(automaton, Key.F)
+    assert fired == [1]
+
+
+def test_wrong_stroke_restarts():
+    _, automaton = sequence_setup()
+    fired = []
+    Sequence(lambda: fired.append(1), [Key.A, Key.B], automaton=automaton)
+    for key in (Key.A, Key.C, Key.B, Key.A, Key.A, Key.B):
+        tap(automaton, key)
+    assert fired == [1]
+
+
+def test_timeout_between_strokes():
+    clock, automaton = sequence_setup()
+    fired = []
+    Sequence(lambda: fired.append(clock.now), [Key.A, Key.B], timeout=0.5, automaton=automaton)
+    tap(automaton, Key.A)
+    clock.now = 0.6
+    tap(automaton, Key.B)
+    clock.now = 1.0
+    tap(automaton, Key.A)
+    clock.now = 1.5
+    tap(automaton, Key.B)
+    assert fired == [1.5]
+
+
+def test_modifier_strokes():
+    _, automaton = sequence_setup()
+    fired = []
+    Sequence(lambda: fired.append(1), [(Key.K, Key.LControl), (Key.C, Key.LControl)], automaton=automaton)
+    tap(automaton, Key.K)
+    tap(automaton, Key.C)
+    press(automaton, Key.LControl)
+    tap(automaton, Key.K)
+    tap(automaton, Key.C)
+    release(automaton, Key.LControl)
+    assert fired == [1]
+
+
+def test_prefix_sequence_fires_first():
+    _, automaton = sequence_setup()
+    fired = []
+    Sequence(lambda: fired.append('short'), [Key.A, Key.B], automaton=automaton)
+    Sequence(lambda: fired.append('long'), [Key.A, Key.B, Key.C], automaton=automaton)
+    for key in (Key.A, Key.B, Key.C):
+        tap(automaton, key)
+    assert fired == ['short', 'long']
+
+
+def test_block_strokes_and_their_key_ups():
+    _, automaton = sequence_setup()
+    Sequence(lambda: None, [Key.A, Key.B], block=True, automaton=automaton)
+    with pytest.raises(BlockNextHookException):
+        press(automaton, Key.A)
+    with pytest.raises(BlockNextHookException):
+        release(automaton, Key.A)
+    tap(automaton, Key.C)
+
+
+def test_unregister_removes_hotkey():
+    _, automaton = sequence_setup()
+    fired = []
+    sequence = Sequence(lambda: fired.append(1), [Key.A, Key.B], automaton=automaton)
+    sequence.unregister()
+    tap(automaton, Key.A)
+    tap(automaton, Key.B)
+    assert fired == []
+    assert automaton.hotkey is None
@@ -0,0 +1,6 @@
+"""Runs the concurrent registration and dispatch stress test briefly, see ``tests.stress_registry``."""
+from tests import stress_registry
+
+
+def test_stress_registry():
+    assert stress_registry.main(1.0) == 0
@@ -0,0 +1,138 @@
+"""Timed binding tests, on a ``TimerScheduler`` without a thread that is run with ``run_due()``."""
+from hotikeys import DoubleTap, EventId, HoldRelease, Hotkey, Key, LongPress, NullSource
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+from hotikeys.timed import TimerScheduler
+from tests.hookdata import lparam, overwrite
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def timed_setup():
+    clock = FakeClock()
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    return clock, cls, TimerScheduler(clock, threaded=False)
+
+
+def press(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+
+
+def release(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def test_scheduler_order_and_cancel():
+    clock, _, scheduler = timed_setup()
+    ran = []
+    scheduler.call_at(2.0, ran.append, ('b',))
+    scheduler.call_at(1.0, ran.append, ('a',))
+    scheduler.call_at(1.5, ran.append, ('x',)).cancel()
+    clock.now = 1.9
+    assert scheduler.run_due() == 1
+    clock.now = 2.0
+    assert scheduler.run_due() == 1
+    assert ran == ['a', 'b']
+    assert len(scheduler) == 0
+
+
+def test_long_press():
+    clock, cls, scheduler = timed_setup()
+    fired = []
+    LongPress(lambda: fired.append(clock.now), Key.A, 0.5, scheduler=scheduler, hotkey_class=cls)
+    press(cls, Key.A)
+    clock.now = 0.4
+    scheduler.run_due()
+    assert fired == []
+    clock.now = 0.5
+    scheduler.run_due()
+    assert fired == [0.5]
+
+
+def test_long_press_released_early():
+    clock, cls, scheduler = timed_setup()
+    fired = []
+    LongPress(lambda: fired.append(1), Key.A, 0.5, scheduler=scheduler, hotkey_class=cls)
+    press(cls, Key.A)
+    clock.now = 0.3
+    release(cls, Key.A)
+    clock.now = 1.0
+    scheduler.run_due()
+    assert fired == []
+
+
+def test_long_press_modifiers():
+    clock, cls, scheduler = timed_setup()
+    fired = []
+    LongPress(lambda: fired.append(1), Key.A, 0.5, Key.LControl, scheduler=scheduler, hotkey_class=cls)
+    press(cls, Key.A)
+    clock.now = 1.0
+    scheduler.run_due()
+    release(cls, Key.A)
+    press(cls, Key.LControl)
+    press(cls, Key.A)
+    clock.now = 2.0
+    scheduler.run_due()
+    assert fired == [1]
+
+
+def test_double_tap():
+    clock, cls, scheduler = timed_setup()
+    taps, singles = [], []
+    DoubleTap(lambda: taps.append(clock.now), Key.A, 0.3, on_single=lambda: singles.append(clock.now),
+              scheduler=scheduler, hotkey_class=cls)
+    press(cls, Key.A)
+    release(cls, Key.A)
+    clock.now = 0.2
+    press(cls, Key.A)
+    release(cls, Key.A)
+    scheduler.run_due()
+    assert taps == [0.2]
+
+    clock.now = 1.0
+    press(cls, Key.A)
+    release(cls, Key.A)
+    clock.now = 1.2
+    scheduler.run_due()
+    assert singles == []
+    clock.now = 1.3
+    scheduler.run_due()
+    assert singles == [1.3]
+    assert taps == [0.2]
+
+
+def test_hold_release():
+    clock, cls, scheduler = timed_setup()
+    fired = []
+    binding = HoldRelease(lambda: fired.append(clock.now), Key.A, 0.5, 1.0, scheduler=scheduler, hotkey_class=cls)
+    press(cls, Key.A)
+    clock.now = 0.2
+    release(cls, Key.A)
+    scheduler.run_due()
+    press(cls, Key.A)
+    clock.now = 0.9
+    release(cls, Key.A)
+    scheduler.run_due()
+    press(cls, Key.A)
+    clock.now = 2.0
+    release(cls, Key.A)
+    scheduler.run_due()
+    assert fired == [0.9]
+    assert abs(binding.held - 1.1) < 1e-9
+
+
+def test_long_press_args_outlive_hook_data():
+    clock, cls, scheduler = timed_setup()
+    fired = []
+    LongPress(lambda args: fired.append((args.vkey, args.time)), Key.A, 0.5, scheduler=scheduler, hotkey_class=cls)
+    data, buffer = lparam(int(Key.A), 0, 0, 4321, 0)
+    cls.feed_keyboard(0, int(EventId.WM_KEYDOWN), data)
+    overwrite(buffer)
+    clock.now = 0.5
+    scheduler.run_due()
+    assert fired == [(int(Key.A), 4321)]
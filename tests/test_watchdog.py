@@ -0,0 +1,103 @@
+"""Watchdog tests, with handlers that advance a fake clock to look slow."""
+import logging
+
+import pytest
+
+from hotikeys import EventId, ExecutionMode, Hotkey, Key, NullSource, WatchdogAction
+from hotikeys.errors import ErrorReporter
+from hotikeys.lleventargs import LowLevelKeyboardArgs
+from hotikeys.watchdog import HandlerWindow
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def watched_class(**options):
+    clock = FakeClock()
+    cls = type('TestHotkey', (Hotkey,), dict(source=NullSource()))
+    watchdog = cls.watch(errors=ErrorReporter(logger=logging.getLogger('test_watchdog')), **options)
+    watchdog.clock = clock
+    return clock, cls, watchdog
+
+
+def tap(cls, vkey):
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYDOWN), (int(vkey), 0, 0, 0)))
+    cls.dispatch(LowLevelKeyboardArgs(0, int(EventId.WM_KEYUP), (int(vkey), 0, 0x80, 0)))
+
+
+def slow_handler(clock, calls):
+    def handler():
+        calls.append(clock.now)
+        clock.now += 0.1
+    return handler
+
+
+def failing_handler(calls):
+    def handler():
+        calls.append(1)
+        raise RuntimeError('failed')
+    return handler
+
+
+def test_window_drops_old_buckets():
+    window = HandlerWindow(4)
+    window.add(0, 0.5, True, False)
+    window.add(1, 0.5, False, True)
+    assert window.snapshot() == dict(calls=2, slow=1, errors=1, mean_runtime=0.5)
+    window.add(4, 1.0, False, False)
+    assert window.snapshot() == dict(calls=2, slow=0, errors=1, mean_runtime=0.75)
+    window.add(100, 1.0, False, False)
+    assert window.snapshot()['calls'] == 1
+
+
+def test_slow_inline_handler_is_offloaded():
+    clock, cls, watchdog = watched_class(max_slow=2)
+    hotkey = cls(slow_handler(clock, []), Key.A)
+    for _ in range(3):
+        tap(cls, Key.A)
+    assert hotkey.execution is ExecutionMode.ThreadPool
+    assert hotkey not in watchdog.handlers
+
+
+def test_pinned_handler_stays_inline():
+    clock, cls, watchdog = watched_class(max_slow=2)
+    hotkey = cls(slow_handler(clock, []), Key.A, execution=ExecutionMode.Inline)
+    for _ in range(3):
+        tap(cls, Key.A)
+    assert hotkey.execution is ExecutionMode.Inline
+
+
+def test_failing_handler_is_quarantined_and_released():
+    _, cls, watchdog = watched_class(min_calls=4)
+    calls = []
+    hotkey = cls(failing_handler(calls), Key.A)
+    for _ in range(6):
+        tap(cls, Key.A)
+    assert len(calls) == 4
+    assert not hotkey.registered
+    assert hotkey in watchdog.snapshot()['quarantined']
+    watchdog.release(hotkey)
+    assert hotkey.registered
+    tap(cls, Key.A)
+    assert len(calls) == 5
+
+
+def test_ignore_only_logs(caplog):
+    clock, cls, watchdog = watched_class(max_slow=1, on_slow=WatchdogAction.Ignore)
+    hotkey = cls(slow_handler(clock, []), Key.A)
+    with caplog.at_level(logging.WARNING, 'hotikeys.watchdog'):
+        tap(cls, Key.A)
+        tap(cls, Key.A)
+    assert hotkey.execution is ExecutionMode.Inline
+    assert hotkey.registered
+    assert 'slower than' in caplog.text
+
+
+def test_invalid_action():
+    with pytest.raises(ValueError):
+        watched_class(on_slow='explode')